@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+"""
+wave_check.py
+2026-10-18
+Public Domain
+
+http://abyz.me.uk/lg/py_rgpio.html
+
+./wave_check.py
+
+Checks the pulse timings of the waves compiled by rgpio_wave.
+No daemon is needed.
+"""
+
+import rgpio_wave
+
+def check(func, exp, got):
+   if exp != got:
+      print("FAIL: {} (expected {}, got {})".format(func, exp, got))
+   else:
+      print("PASS: {}".format(func))
+
+def check_raises(func, exc, call):
+   try:
+      call()
+   except exc:
+      print("PASS: {}".format(func))
+   else:
+      print("FAIL: {} (expected {})".format(func, exc.__name__))
+
+def pulses(w):
+   """
+   Returns the (group_bits, group_mask, pulse_delay) of each pulse.
+   """
+   d = w.data
+   return [(d[i], d[i+1], d[i+2]) for i in range(0, len(d), 3)]
+
+def levels(w):
+   """
+   Returns the (group_bits, pulse_delay) of each pulse.
+   """
+   return [(bits, delay) for bits, mask, delay in pulses(w)]
+
+# 0x55 at 10000 baud, start bit, alternating data bits, stop bit
+
+check("uart 8 bit", [(i & 1, 100) for i in range(10)],
+   levels(rgpio_wave.uart(b"\x55", 10000)))
+
+check("uart 9 bit", [(0, 100), (1, 1000)],
+   levels(rgpio_wave.uart([0x1ff], 10000, bits=9)))
+
+check("uart 9 bit low", [(0, 100), (1, 800), (0, 100), (1, 100)],
+   levels(rgpio_wave.uart([0xff], 10000, bits=9)))
+
+check("uart even parity", [(0, 100), (1, 100), (0, 700), (1, 200)],
+   levels(rgpio_wave.uart(b"\x01", 10000, parity="even")))
+
+check("uart inverted", [(1, 100), (0, 100), (1, 700), (0, 100)],
+   levels(rgpio_wave.uart(b"\x01", 10000, invert=True)))
+
+# 33.3 us bits, each edge rounded from the start of the wave
+
+w = rgpio_wave.uart(b"\x55", 30000)
+check("uart rounding",
+   [33, 34, 33, 33, 34, 33, 33, 34, 33, 33],
+   [delay for bits, delay in levels(w)])
+
+check("uart mask", {1 << 3}, {mask for b, mask, d in pulses(
+   rgpio_wave.uart(b"\x55", 10000, bit=3))})
+
+check("shift_out mode 0",
+   [(2, 2), (3, 2), (0, 2), (1, 2), (0, 2)],
+   levels(rgpio_wave.shift_out(0b10, 250000, bits=2)))
+
+check("shift_out mode 1",
+   [(3, 2), (2, 2), (1, 2), (0, 4)],
+   levels(rgpio_wave.shift_out(0b10, 250000, bits=2, cpha=1)))
+
+check("shift_out select", [(2, 4), (3, 4), (4, 4)],
+   levels(rgpio_wave.shift_out(0b1, 125000, bits=1, select_bit=2)))
+
+check("ir_raw", [(1, 500), (0, 1000), (1, 500), (0, 500)],
+   levels(rgpio_wave.ir_raw([1000, 500, 1000], carrier=1000, duty=0.5)))
+
+# a 342 cycle leader and 33 bursts of 21 cycles at 38 kHz
+
+w = rgpio_wave.ir_nec(0x04, 0x08)
+check("ir_nec carrier cycles", 342 + 33 * 21,
+   len([bits for bits, delay in levels(w) if bits]))
+
+check("servo", [(3, 1000), (2, 1000), (0, 18000)],
+   levels(rgpio_wave.servo([1000, 2000])))
+
+check("servo unchanged GPIO", {0b101}, {mask for b, mask, d in pulses(
+   rgpio_wave.servo([1500, None, 1000]))})
+
+check("servo cycles", [(1, 1500), (0, 8500)] * 3,
+   levels(rgpio_wave.servo([1500], frequency=100, cycles=3)))
+
+check("steps", [(1, 10), (0, 990)] * 3,
+   levels(rgpio_wave.steps(3, 1000)))
+
+check("steps ramp",
+   [(1, 10), (0, 1990), (1, 10), (0, 990), (1, 10), (0, 1990)],
+   levels(rgpio_wave.steps(3, 1000, start_rate=500, ramp=1)))
+
+check("steps direction", [(2, 10), (3, 10), (2, 90)],
+   levels(rgpio_wave.steps(1, 10000, dir_bit=1, direction=1)))
+
+check_raises("steps rate 0", ValueError,
+   lambda: rgpio_wave.steps(10, 0))
+
+check_raises("steps start_rate 0", ValueError,
+   lambda: rgpio_wave.steps(10, 1000, start_rate=0, ramp=5))
+
+w = rgpio_wave.steps(3, 1000)
+w.data[2] = 1
+check("cached wave unchanged", [(1, 10), (0, 990)] * 3,
+   levels(rgpio_wave.steps(3, 1000)))
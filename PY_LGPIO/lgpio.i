@@ -96,11 +96,16 @@ tx_servo                  Starts servo pulses on a GPIO
 tx_wave                   Starts a wave on a group of GPIO
 tx_busy                   See if tx is active on a GPIO or group
 tx_room                   See if more room for tx on a GPIO or group
+tx_jitter                 Get the tx timing statistics of a GPIO or group
 
 gpio_set_debounce_micros  Sets the debounce time for a GPIO
 gpio_set_watchdog_micros  Sets the watchdog time for a GPIO
+gpio_set_event_buffer     Sets the kernel event buffer size for a GPIO
+gpio_get_edge_stats       Gets the edge counts and timings of a GPIO
 
 callback                  Starts a GPIO callback
+callback_batch            Starts a GPIO callback receiving blocks of edges
+callback_overflows        Number of alerts dropped before the callbacks
 
 I2C
 
@@ -122,9 +127,11 @@ i2c_read_block_data       SMBus read block data
 i2c_write_block_data      SMBus write block data
 
 i2c_read_i2c_block_data   SMBus read I2C block data
+i2c_read_i2c_block_data_into SMBus read I2C block data into a buffer
 i2c_write_i2c_block_data  SMBus write I2C block data
 
 i2c_read_device           Reads the raw I2C device
+i2c_read_device_into      Reads the raw I2C device into a buffer
 i2c_write_device          Writes the raw I2C device
 
 i2c_process_call          SMBus process call
@@ -135,9 +142,12 @@ i2c_zip                   Performs multiple I2C transactions
 NOTIFICATIONS
 
 notify_open               Request a notification handle
+notify_open_ring          Request a shared memory notification handle
+notify_ring               Read a shared memory notification
 notify_close              Close a notification
 notify_pause              Pause notifications
 notify_resume             Resume notifications
+notify_stats              Get the delivery statistics of a notification
 
 SERIAL
 
@@ -148,6 +158,7 @@ serial_read_byte          Reads a byte from a serial device
 serial_write_byte         Writes a byte to a serial device
 
 serial_read               Reads bytes from a serial device
+serial_read_into          Reads bytes from a serial device into a buffer
 serial_write              Writes bytes to a serial device
 
 serial_data_available     Returns number of bytes ready to be read
@@ -158,8 +169,10 @@ spi_open                  Opens a SPI device
 spi_close                 Closes a SPI device
 
 spi_read                  Reads bytes from a SPI device
+spi_read_into             Reads bytes from a SPI device into a buffer
 spi_write                 Writes bytes to a SPI device
 spi_xfer                  Transfers bytes with a SPI device
+spi_xfer_into             Transfers bytes with a SPI device into a buffer
 
 UTILITIES
 
@@ -171,10 +184,154 @@ error_text                Get the error text for an error code
 "
 %enddef
 
-%module (docstring = lgpio_docstr) lgpio
+%module (docstring = lgpio_docstr, threads = "1") lgpio
 
 %{
+#include <unistd.h>
+#include <sys/eventfd.h>
+
 #include "lgpio.h"
+
+/*
+Alerts for GPIO claimed without a notification handle are passed to
+Python in-process.  The library calls xAlertsSamples on its alert
+thread with each block of alerts in time order.  They are copied to a
+single producer, single consumer ring and the Python dispatcher is
+woken by an eventfd, one write per block.
+*/
+
+#define LG_PY_ALERTS 16384 /* ring size, a power of 2 */
+
+static lgGpioReport_t xAlerts[LG_PY_ALERTS];
+static uint32_t xAlertsHead;      /* only written by the alert thread */
+static uint32_t xAlertsTail;      /* only written by the dispatcher */
+static uint32_t xAlertsOverflows;
+static int xAlertsActive;
+static int xAlertsFd = -1;
+
+static void xAlertsSamples(int e, lgGpioAlert_p evt, void *userdata)
+{
+   uint32_t head, tail;
+   uint64_t one = 1;
+   int i, added;
+
+   if (!__atomic_load_n(&xAlertsActive, __ATOMIC_ACQUIRE)) return;
+
+   head = xAlertsHead;
+   tail = __atomic_load_n(&xAlertsTail, __ATOMIC_ACQUIRE);
+
+   added = 0;
+
+   for (i=0; i<e; i++)
+   {
+      if (evt[i].nfyHandle >= 0) continue; /* for a notification */
+
+      if ((head - tail) == LG_PY_ALERTS)
+      {
+         xAlertsOverflows++;
+         continue;
+      }
+
+      xAlerts[head & (LG_PY_ALERTS-1)] = evt[i].report;
+      head++;
+      added++;
+   }
+
+   if (added)
+   {
+      __atomic_store_n(&xAlertsHead, head, __ATOMIC_RELEASE);
+
+      if (write(xAlertsFd, &one, sizeof(one))) ; /* ignore errors */
+   }
+}
+
+int lgPyAlertsStart(void)
+{
+   if (xAlertsFd < 0)
+   {
+      xAlertsFd = eventfd(0, EFD_CLOEXEC);
+
+      if (xAlertsFd < 0) return LG_NOT_ENOUGH_MEMORY;
+
+      lgGpioSetSamplesFunc(xAlertsSamples, NULL);
+   }
+
+   __atomic_store_n(&xAlertsActive, 1, __ATOMIC_RELEASE);
+
+   return xAlertsFd;
+}
+
+void lgPyAlertsStop(void)
+{
+   uint64_t one = 1;
+
+   __atomic_store_n(&xAlertsActive, 0, __ATOMIC_RELEASE);
+
+   /* wake the dispatcher */
+
+   if (xAlertsFd >= 0)
+      if (write(xAlertsFd, &one, sizeof(one))) ; /* ignore errors */
+}
+
+int lgPyAlertsRead(char *alertBuf, size_t alertLen)
+{
+   uint32_t head, tail, count, i;
+   lgGpioReport_t *rpt = (lgGpioReport_t *)alertBuf;
+
+   head = __atomic_load_n(&xAlertsHead, __ATOMIC_ACQUIRE);
+   tail = xAlertsTail;
+
+   count = head - tail;
+
+   if (count > (alertLen / sizeof(lgGpioReport_t)))
+      count = alertLen / sizeof(lgGpioReport_t);
+
+   for (i=0; i<count; i++) rpt[i] = xAlerts[(tail + i) & (LG_PY_ALERTS-1)];
+
+   __atomic_store_n(&xAlertsTail, tail + count, __ATOMIC_RELEASE);
+
+   return count * sizeof(lgGpioReport_t);
+}
+
+unsigned lgPyAlertsOverflows(void)
+{
+   return xAlertsOverflows;
+}
+
+/*
+The _into variants read into a caller supplied writable buffer
+rather than allocating a bytearray per call.  The buffer length
+sets the number of bytes to read.
+*/
+
+int lgPyI2cReadI2CBlockDataInto(
+   int handle, int i2cReg, char *rxInto, int rxCount)
+{
+   return lgI2cReadI2CBlockData(handle, i2cReg, rxInto, rxCount);
+}
+
+int lgPyI2cReadDeviceInto(int handle, char *rxInto, int rxCount)
+{
+   return lgI2cReadDevice(handle, rxInto, rxCount);
+}
+
+int lgPySerialReadInto(int handle, char *rxInto, int rxCount)
+{
+   return lgSerialRead(handle, rxInto, rxCount);
+}
+
+int lgPySpiReadInto(int handle, char *rxInto, int rxCount)
+{
+   return lgSpiRead(handle, rxInto, rxCount);
+}
+
+int lgPySpiXferInto(
+   int handle, const char *txBuf, int count, char *rxInto, int rxCount)
+{
+   if (rxCount < count) return LG_BAD_SPI_COUNT;
+
+   return lgSpiXfer(handle, txBuf, rxInto, count);
+}
 %}
 
 %include "typemaps.i"
@@ -183,30 +340,39 @@ error_text                Get the error text for an error code
 
 %pythoncode "lgpio_extra.py"
 
+// The GIL is released around each library call so that a slow bus
+// transfer, serial read, or wave transmission does not stall other
+// Python threads.  Arguments are converted, and results returned,
+// with the GIL held.  Calls which only touch local state keep it.
+
+%nothread lguVersion;
+%nothread lguErrorText;
+%nothread lguGetInternal;
+%nothread lguSetInternal;
+%nothread lgPyAlertsStop;
+%nothread lgPyAlertsRead;
+%nothread lgPyAlertsOverflows;
+
 // lgGroupClaimInput
 // lgGroupClaimOutput
-%typemap(in) (int count, const int *gpios)
+%typemap(in) (int count, const int *gpios) (Py_buffer view, int viewHeld = 0)
 {
-   int res;
-   Py_buffer view;
-
    if (!PyObject_CheckBuffer($input))
    {
       PyErr_SetString(PyExc_ValueError, "Expecting a buffer object");
       SWIG_fail;
    }
 
-   res = PyObject_GetBuffer($input, &view, PyBUF_CONTIG_RO);
-   $1 = view.len/4;
-   $2 = view.buf;
-   PyBuffer_Release(&view);
-
-   if (res < 0)
+   if (PyObject_GetBuffer($input, &view, PyBUF_CONTIG_RO) < 0)
    {
       PyErr_SetString(PyExc_ValueError, "Odd buffer object");
       SWIG_fail;
    }
 
+   viewHeld = 1;
+   $1 = view.len/4;
+   $2 = view.buf;
+
    if (($1 < 1) || ($1 > 64))
    {
       PyErr_SetString(PyExc_ValueError,"Expecting 1-64 GPIO");
@@ -214,52 +380,63 @@ error_text                Get the error text for an error code
    }
 }
 
+// lgGroupClaimInput
 // lgGroupClaimOutput
-%typemap(in) (const int *levels)
+%typemap(freearg) (int count, const int *gpios)
 {
-   int res;
-   Py_buffer view;
+   if (viewHeld$argnum) PyBuffer_Release(&view$argnum);
+}
 
+// lgGroupClaimOutput
+%typemap(in) (const int *levels) (Py_buffer view, int viewHeld = 0)
+{
    if (!PyObject_CheckBuffer($input))
    {
       PyErr_SetString(PyExc_ValueError, "Expecting a buffer object");
       SWIG_fail;
    }
 
-   res = PyObject_GetBuffer($input, &view, PyBUF_CONTIG_RO);
-   $1 = view.buf;
-   PyBuffer_Release(&view);
-
-   if (res < 0)
+   if (PyObject_GetBuffer($input, &view, PyBUF_CONTIG_RO) < 0)
    {
       PyErr_SetString(PyExc_ValueError, "Odd buffer object");
       SWIG_fail;
    }
+
+   viewHeld = 1;
+   $1 = view.buf;
+}
+
+// lgGroupClaimOutput
+%typemap(freearg) (const int *levels)
+{
+   if (viewHeld$argnum) PyBuffer_Release(&view$argnum);
 }
 
 
 // lgTxWave
-%typemap(in) (int count, lgPulse_p pulses)
+%typemap(in) (int count, lgPulse_p pulses) (Py_buffer view, int viewHeld = 0)
 {
-   int res;
-   Py_buffer view;
-
    if (!PyObject_CheckBuffer($input))
    {
       PyErr_SetString(PyExc_ValueError, "Expecting a buffer object");
       SWIG_fail;
    }
 
-   res = PyObject_GetBuffer($input, &view, PyBUF_CONTIG_RO);
-   $1 = view.len/24;
-   $2 = view.buf;
-   PyBuffer_Release(&view);
-
-   if (res <0)
+   if (PyObject_GetBuffer($input, &view, PyBUF_CONTIG_RO) < 0)
    {
       PyErr_SetString(PyExc_ValueError, "Odd buffer object");
       SWIG_fail;
    }
+
+   viewHeld = 1;
+   $1 = view.len/24;
+   $2 = view.buf;
+}
+
+// lgTxWave
+%typemap(freearg) (int count, lgPulse_p pulses)
+{
+   if (viewHeld$argnum) PyBuffer_Release(&view$argnum);
 }
 
 // lgI2cWriteBlockData
@@ -267,27 +444,35 @@ error_text                Get the error text for an error code
 // lgI2cWriteDevice
 // lgSerialWrite
 // lgSpiWrite
-%typemap(in) (const char *txBuf, int count)
+// lgPySpiXferInto
+%typemap(in) (const char *txBuf, int count) (Py_buffer view, int viewHeld = 0)
 {
-   int res;
-   Py_buffer view;
-
    if (!PyObject_CheckBuffer($input))
    {
       PyErr_SetString(PyExc_ValueError, "Expecting a buffer object");
       SWIG_fail;
    }
 
-   res = PyObject_GetBuffer($input, &view, PyBUF_CONTIG_RO);
-   $1 = view.buf;
-   $2 = view.len;
-   PyBuffer_Release(&view);
-
-   if (res <0)
+   if (PyObject_GetBuffer($input, &view, PyBUF_CONTIG_RO) < 0)
    {
       PyErr_SetString(PyExc_ValueError, "Odd buffer object");
       SWIG_fail;
    }
+
+   viewHeld = 1;
+   $1 = view.buf;
+   $2 = view.len;
+}
+
+// lgI2cWriteBlockData
+// lgI2cWriteI2CBlockData
+// lgI2cWriteDevice
+// lgSerialWrite
+// lgSpiWrite
+// lgPySpiXferInto
+%typemap(freearg) (const char *txBuf, int count)
+{
+   if (viewHeld$argnum) PyBuffer_Release(&view$argnum);
 }
 
 // lgI2cReadI2CBlockData
@@ -327,32 +512,68 @@ error_text                Get the error text for an error code
    free($1);
 }
 
-// lgSpiXfer
-%typemap(in) (const char *txBuf, char *rxBuf, int count)
+// lgPyI2cReadI2CBlockDataInto
+// lgPyI2cReadDeviceInto
+// lgPySerialReadInto
+// lgPySpiReadInto
+// lgPySpiXferInto
+%typemap(in) (char *rxInto, int rxCount) (Py_buffer view, int viewHeld = 0)
 {
-   int res;
-   Py_buffer view;
-
    if (!PyObject_CheckBuffer($input))
    {
       PyErr_SetString(PyExc_ValueError, "Expecting a buffer object");
       SWIG_fail;
    }
 
-   res = PyObject_GetBuffer($input, &view, PyBUF_CONTIG_RO);
+   if (PyObject_GetBuffer($input, &view, PyBUF_CONTIG) < 0)
+   {
+      PyErr_SetString(PyExc_ValueError, "Expecting a writable buffer");
+      SWIG_fail;
+   }
+
+   viewHeld = 1;
    $1 = view.buf;
-   $3 = view.len;
-   PyBuffer_Release(&view);
+   $2 = view.len;
+}
+
+// lgPyI2cReadI2CBlockDataInto
+// lgPyI2cReadDeviceInto
+// lgPySerialReadInto
+// lgPySpiReadInto
+// lgPySpiXferInto
+%typemap(freearg) (char *rxInto, int rxCount)
+{
+   if (viewHeld$argnum) PyBuffer_Release(&view$argnum);
+}
+
+// lgSpiXfer
+%typemap(in) (const char *txBuf, char *rxBuf, int count) (Py_buffer view, int viewHeld = 0)
+{
+   if (!PyObject_CheckBuffer($input))
+   {
+      PyErr_SetString(PyExc_ValueError, "Expecting a buffer object");
+      SWIG_fail;
+   }
 
-   if (res <0)
+   if (PyObject_GetBuffer($input, &view, PyBUF_CONTIG_RO) < 0)
    {
       PyErr_SetString(PyExc_ValueError, "Odd buffer object");
       SWIG_fail;
    }
 
+   viewHeld = 1;
+   $1 = view.buf;
+   $3 = view.len;
+
    $2 = (void *) malloc($3);
 }
 
+// lgSpiXfer
+%typemap(freearg) (const char *txBuf, char *rxBuf, int count)
+{
+   if (viewHeld$argnum) PyBuffer_Release(&view$argnum);
+}
+
 // lgSpiXfer
 %typemap(argout) (const char *txBuf, char *rxBuf, int count)
 {
@@ -437,32 +658,34 @@ error_text                Get the error text for an error code
 }
 
 // lgI2cZip
-%typemap(in) (const char *txBuf, int txCount, char *rxBuf, int rxCount)
+%typemap(in) (const char *txBuf, int txCount, char *rxBuf, int rxCount) (Py_buffer view, int viewHeld = 0)
 {
-   int res;
-   Py_buffer view;
-
    if (!PyObject_CheckBuffer($input))
    {
       PyErr_SetString(PyExc_ValueError, "Expecting a buffer object");
       SWIG_fail;
    }
 
-   res = PyObject_GetBuffer($input, &view, PyBUF_CONTIG_RO);
-   $1 = view.buf;
-   $2 = view.len;
-   PyBuffer_Release(&view);
-
-   if (res < 0)
+   if (PyObject_GetBuffer($input, &view, PyBUF_CONTIG_RO) < 0)
    {
       PyErr_SetString(PyExc_ValueError, "Odd buffer object");
       SWIG_fail;
    }
 
+   viewHeld = 1;
+   $1 = view.buf;
+   $2 = view.len;
+
    $3 = (void *) malloc(1000);
    $4 = 1000;
 }
 
+// lgI2cZip
+%typemap(freearg) (const char *txBuf, int txCount, char *rxBuf, int rxCount)
+{
+   if (viewHeld$argnum) PyBuffer_Release(&view$argnum);
+}
+
 // lgI2cZip
 %typemap(argout) (const char *txBuf, int txCount, char *rxBuf, int rxCount)
 {
@@ -552,6 +775,138 @@ error_text                Get the error text for an error code
    PyList_SetItem($result, 4, o5);
 }
 
+// lgTxJitter
+%typemap(in, numinputs=0) (lgTxStats_p txStats) (lgTxStats_t txStats)
+{
+   $1 = &txStats;
+}
+
+// lgTxJitter
+%typemap(argout) (lgTxStats_p txStats)
+{
+   PyObject *o1, *o2, *o3, *o4, *o5;
+   Py_XDECREF($result);   /* Blow away any previous result */
+   $result = PyList_New(5);
+
+   if (result >= 0)
+   {
+      result = 0;
+
+      o2 = PyLong_FromUnsignedLongLong(txStats4.edges);
+      o3 = PyLong_FromUnsignedLongLong(txStats4.lateSum);
+      o4 = PyLong_FromUnsignedLongLong(txStats4.lateMax);
+      o5 = PyLong_FromUnsignedLongLong(txStats4.lateLast);
+   }
+   else
+   {
+      o2 = PyInt_FromLong(0);
+      o3 = PyInt_FromLong(0);
+      o4 = PyInt_FromLong(0);
+      o5 = PyInt_FromLong(0);
+   }
+
+   o1 = PyInt_FromLong(result);
+
+   PyList_SetItem($result, 0, o1);
+   PyList_SetItem($result, 1, o2);
+   PyList_SetItem($result, 2, o3);
+   PyList_SetItem($result, 3, o4);
+   PyList_SetItem($result, 4, o5);
+}
+
+// lgNotifyStats
+%typemap(in, numinputs=0) (lgNotifyStats_p nfyStats) (lgNotifyStats_t nfyStats)
+{
+   $1 = &nfyStats;
+}
+
+// lgNotifyStats
+%typemap(argout) (lgNotifyStats_p nfyStats)
+{
+   PyObject *o1, *o2, *o3, *o4, *o5, *o6;
+   Py_XDECREF($result);   /* Blow away any previous result */
+   $result = PyList_New(6);
+
+   if (result >= 0)
+   {
+      result = 0;
+
+      o2 = PyLong_FromUnsignedLongLong(nfyStats2.reports);
+      o3 = PyLong_FromUnsignedLongLong(nfyStats2.dropped);
+      o4 = PyLong_FromUnsignedLongLong(nfyStats2.writes);
+      o5 = PyLong_FromUnsignedLongLong(nfyStats2.shortWrites);
+      o6 = PyLong_FromUnsignedLongLong(nfyStats2.fullWrites);
+   }
+   else
+   {
+      o2 = PyInt_FromLong(0);
+      o3 = PyInt_FromLong(0);
+      o4 = PyInt_FromLong(0);
+      o5 = PyInt_FromLong(0);
+      o6 = PyInt_FromLong(0);
+   }
+
+   o1 = PyInt_FromLong(result);
+
+   PyList_SetItem($result, 0, o1);
+   PyList_SetItem($result, 1, o2);
+   PyList_SetItem($result, 2, o3);
+   PyList_SetItem($result, 3, o4);
+   PyList_SetItem($result, 4, o5);
+   PyList_SetItem($result, 5, o6);
+}
+
+// lgGpioGetEdgeStats
+%typemap(in, numinputs=0) (lgEdgeStats_p edgeStats) (lgEdgeStats_t edgeStats)
+{
+   $1 = &edgeStats;
+}
+
+// lgGpioGetEdgeStats
+%typemap(argout) (lgEdgeStats_p edgeStats)
+{
+   PyObject *o1, *o2, *o3, *o4, *o5, *o6, *o7, *o8, *o9;
+   Py_XDECREF($result);   /* Blow away any previous result */
+   $result = PyList_New(9);
+
+   if (result >= 0)
+   {
+      result = 0;
+
+      o2 = PyLong_FromUnsignedLongLong(edgeStats3.rising);
+      o3 = PyLong_FromUnsignedLongLong(edgeStats3.falling);
+      o4 = PyLong_FromUnsignedLongLong(edgeStats3.lost);
+      o5 = PyLong_FromUnsignedLongLong(edgeStats3.period);
+      o6 = PyLong_FromUnsignedLongLong(edgeStats3.high);
+      o7 = PyLong_FromUnsignedLongLong(edgeStats3.periodAvg);
+      o8 = PyLong_FromUnsignedLongLong(edgeStats3.highAvg);
+      o9 = PyLong_FromUnsignedLongLong(edgeStats3.timestamp);
+   }
+   else
+   {
+      o2 = PyInt_FromLong(0);
+      o3 = PyInt_FromLong(0);
+      o4 = PyInt_FromLong(0);
+      o5 = PyInt_FromLong(0);
+      o6 = PyInt_FromLong(0);
+      o7 = PyInt_FromLong(0);
+      o8 = PyInt_FromLong(0);
+      o9 = PyInt_FromLong(0);
+   }
+
+   o1 = PyInt_FromLong(result);
+
+   PyList_SetItem($result, 0, o1);
+   PyList_SetItem($result, 1, o2);
+   PyList_SetItem($result, 2, o3);
+   PyList_SetItem($result, 3, o4);
+   PyList_SetItem($result, 4, o5);
+   PyList_SetItem($result, 5, o6);
+   PyList_SetItem($result, 6, o7);
+   PyList_SetItem($result, 7, o8);
+   PyList_SetItem($result, 8, o9);
+}
+
 #else
   #warning no typemaps defined
 #endif
@@ -623,15 +978,27 @@ extern int lgTxBusy(int handle, int gpio, int kind);
 %rename(_tx_room) lgTxRoom;
 extern int lgTxRoom(int handle, int gpio, int kind);
 
+%rename(_tx_jitter) lgTxJitter;
+extern int lgTxJitter(int handle, int gpio, int kind, lgTxStats_p txStats);
+
 %rename(_gpio_set_debounce_micros) lgGpioSetDebounce;
 extern int lgGpioSetDebounce(int handle, int gpio, int debounce_us);
 
 %rename(_gpio_set_watchdog_micros) lgGpioSetWatchdog;
 extern int lgGpioSetWatchdog(int handle, int gpio, int watchdog_us);
 
+%rename(_gpio_set_event_buffer) lgGpioSetEventBuffer;
+extern int lgGpioSetEventBuffer(int handle, int gpio, int eventBuffer);
+
+%rename(_gpio_get_edge_stats) lgGpioGetEdgeStats;
+extern int lgGpioGetEdgeStats(int handle, int gpio, lgEdgeStats_p edgeStats);
+
 %rename(_notify_open) lgNotifyOpen;
 extern int lgNotifyOpen(void);
 
+%rename(_notify_open_ring) lgNotifyOpenRing;
+extern int lgNotifyOpenRing(int records);
+
 %rename(_notify_resume) lgNotifyResume;
 extern int lgNotifyResume(int handle);
 
@@ -641,6 +1008,9 @@ extern int lgNotifyPause(int handle);
 %rename(_notify_close) lgNotifyClose;
 extern int lgNotifyClose(int handle);
 
+%rename(_notify_stats) lgNotifyStats;
+extern int lgNotifyStats(int handle, lgNotifyStats_p nfyStats);
+
 %rename(_i2c_open) lgI2cOpen;
 extern int lgI2cOpen(int i2cDev, int i2cAddr, int i2cFlags);
 
@@ -684,12 +1054,18 @@ extern int lgI2cBlockProcessCall(int handle, int i2cReg, char *ioBuf, int count)
 %rename(_i2c_read_i2c_block_data) lgI2cReadI2CBlockData;
 extern int lgI2cReadI2CBlockData(int handle, int i2cReg, char *rxBuf, int count);
 
+%rename(_i2c_read_i2c_block_data_into) lgPyI2cReadI2CBlockDataInto;
+extern int lgPyI2cReadI2CBlockDataInto(int handle, int i2cReg, char *rxInto, int rxCount);
+
 %rename(_i2c_write_i2c_block_data) lgI2cWriteI2CBlockData;
 extern int lgI2cWriteI2CBlockData(int handle, int i2cReg, const char *txBuf, int count);
 
 %rename(_i2c_read_device) lgI2cReadDevice;
 extern int lgI2cReadDevice(int handle, char *rxBuf, int count);
 
+%rename(_i2c_read_device_into) lgPyI2cReadDeviceInto;
+extern int lgPyI2cReadDeviceInto(int handle, char *rxInto, int rxCount);
+
 %rename(_i2c_write_device) lgI2cWriteDevice;
 extern int lgI2cWriteDevice(int handle, const char *txBuf, int count);
 
@@ -717,6 +1093,9 @@ extern int lgSerialWrite(int handle, const char *txBuf, int count);
 %rename(_serial_read) lgSerialRead;
 extern int lgSerialRead(int handle, char *rxBuf, int count);
 
+%rename(_serial_read_into) lgPySerialReadInto;
+extern int lgPySerialReadInto(int handle, char *rxInto, int rxCount);
+
 %rename(_serial_data_available) lgSerialDataAvailable;
 extern int lgSerialDataAvailable(int handle);
 
@@ -729,12 +1108,18 @@ extern int lgSpiClose(int handle);
 %rename(_spi_read) lgSpiRead;
 extern int lgSpiRead(int handle, char *rxBuf, int count);
 
+%rename(_spi_read_into) lgPySpiReadInto;
+extern int lgPySpiReadInto(int handle, char *rxInto, int rxCount);
+
 %rename(_spi_write) lgSpiWrite;
 extern int lgSpiWrite(int handle, const char *txBuf, int count);
 
 %rename(_spi_xfer) lgSpiXfer;
 extern int lgSpiXfer(int handle, const char *txBuf, char *rxBuf, int count);
 
+%rename(_spi_xfer_into) lgPySpiXferInto;
+extern int lgPySpiXferInto(int handle, const char *txBuf, int count, char *rxInto, int rxCount);
+
 %rename(_get_lg_version) lguVersion;
 extern int lguVersion(void);
 
@@ -747,3 +1132,18 @@ extern int lguSetInternal(int cfgId, uint64_t cfgVal);
 %rename(_error_text) lguErrorText;
 extern const char *lguErrorText(int error);
 
+// in-process alerts
+
+%rename(_alerts_start) lgPyAlertsStart;
+extern int lgPyAlertsStart(void);
+
+%rename(_alerts_stop) lgPyAlertsStop;
+extern void lgPyAlertsStop(void);
+
+%pybuffer_mutable_binary(char *alertBuf, size_t alertLen);
+%rename(_alerts_read) lgPyAlertsRead;
+extern int lgPyAlertsRead(char *alertBuf, size_t alertLen);
+
+%rename(_alerts_overflows) lgPyAlertsOverflows;
+extern unsigned lgPyAlertsOverflows(void);
+
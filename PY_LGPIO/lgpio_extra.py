@@ -1,4 +1,7 @@
+import array
+import mmap
 import os
+import select
 import socket
 import struct
 import sys
@@ -48,6 +51,21 @@ SPI_MODE_1 = 1
 SPI_MODE_2 = 2
 SPI_MODE_3 = 3
 
+# alert report: tick, chip, gpio, level, flags, pad
+
+_ALERT = struct.Struct('QBBBBI')
+
+# callback tables indexed by alert level for an unmonitored GPIO
+
+_NO_CALLBACKS = ((), (), ())
+
+# the shared memory notification ring header
+
+_RING_MAGIC = 0x474e5252
+_RING_HEAD = 8
+_RING_RESERVE = 16
+_RING_HDR_LEN = 64
+
 # lgpio error numbers
 
 OKAY = 0
@@ -156,6 +174,8 @@ BAD_PWM_FREQ = -102
 BAD_PWM_DUTY = -103
 GPIO_NOT_AN_OUTPUT = -104
 INVALID_GROUP_ALERT = -105
+BAD_RING_SIZE = -106
+BAD_EVENT_BUFFER = -107
 
 class error(Exception):
    """
@@ -171,6 +191,8 @@ class pulse:
    A class to store pulse information.
    """
 
+   __slots__ = ('group_bits', 'group_mask', 'pulse_delay')
+
    def __init__(self, group_bits, group_mask, pulse_delay):
       """
       Initialises a pulse.
@@ -184,15 +206,157 @@ class pulse:
       self.group_mask = group_mask
       self.pulse_delay = pulse_delay
 
+def _qarray(x):
+   """
+   Returns a sequence as an array of unsigned 64 bit integers.
+   Contiguous buffers of 64 bit integers, such as NumPy uint64
+   arrays, are copied as raw bytes.
+   """
+   if isinstance(x, array.array) and x.typecode == 'Q':
+      return x
+   try:
+      m = memoryview(x)
+   except TypeError:
+      return array.array('Q', x)
+   a = array.array('Q')
+   if (m.itemsize == 8 and m.c_contiguous and
+       m.format.lstrip('@=<') in ('Q', 'q', 'L', 'l')):
+      a.frombytes(m.cast('B'))
+   else:
+      a.extend(m.tolist())
+   return a
+
+class wave:
+   """
+   A class to store a wave as packed pulses.
+
+   The pulses are held in an array of unsigned 64 bit integers,
+   three per pulse (group_bits, group_mask, pulse_delay), which
+   is passed to [*tx_wave*] as is.
+   """
+
+   __slots__ = ('data',)
+
+   def __init__(self, pulses=()):
+      """
+      Initialises a wave.
+
+      pulses:= an optional list of [*pulse*] or another wave.
+      """
+      self.data = array.array('Q')
+      self.extend(pulses)
+
+   @classmethod
+   def from_arrays(cls, group_bits, group_mask, pulse_delay):
+      """
+      Returns a wave built from per pulse sequences.
+
+       group_bits:= the levels for each pulse.
+       group_mask:= the mask for each pulse, or a single mask
+                    used for every pulse.
+      pulse_delay:= the delay in microseconds after each pulse.
+
+      The sequences may be lists, arrays, or NumPy arrays and
+      must be the same length.
+
+      ...
+      # 1000 cycles of a 50 us square wave on group bit 0
+      w = wave.from_arrays([1, 0] * 1000, 1, [25] * 2000)
+      ...
+      """
+      bits = _qarray(group_bits)
+      delay = _qarray(pulse_delay)
+      if not hasattr(group_mask, '__len__'):
+         mask = array.array('Q', [int(group_mask)]) * len(bits)
+      else:
+         mask = _qarray(group_mask)
+      if len(bits) != len(mask) or len(bits) != len(delay):
+         raise ValueError("sequences differ in length")
+      w = cls()
+      w.data = array.array('Q', bytes(24 * len(bits)))
+      with memoryview(w.data) as m:
+         m[0::3] = bits
+         m[1::3] = mask
+         m[2::3] = delay
+      return w
+
+   @classmethod
+   def from_levels(cls, levels, group_mask=1):
+      """
+      Returns a wave built from level and duration pairs.
+
+          levels:= a sequence of (group_bits, pulse_delay) pairs.
+      group_mask:= the group GPIO updated by every pulse.
+
+      ...
+      # a 1 ms low then a 2 ms high on group bit 0
+      w = wave.from_levels([(0, 1000), (1, 2000)])
+      ...
+      """
+      levels = tuple(levels)
+      if not levels:
+         return cls()
+      bits, delay = zip(*levels)
+      return cls.from_arrays(bits, group_mask, delay)
+
+   def append(self, group_bits, group_mask, pulse_delay):
+      """
+      Adds a pulse to the end of the wave.
+      """
+      self.data.extend((group_bits, group_mask, pulse_delay))
+
+   def extend(self, pulses):
+      """
+      Adds a list of [*pulse*], or another wave, to the end
+      of the wave.
+      """
+      if isinstance(pulses, wave):
+         self.data.extend(pulses.data)
+      else:
+         for p in pulses:
+            self.data.extend((p.group_bits, p.group_mask, p.pulse_delay))
+
+   def duration(self):
+      """
+      Returns the total delay of the wave in microseconds.
+      """
+      return sum(self.data[2::3])
+
+   def __len__(self):
+      return len(self.data) // 3
+
+   def __getitem__(self, index):
+      i = range(len(self))[index] * 3
+      return pulse(self.data[i], self.data[i+1], self.data[i+2])
+
+def _wavebuf(pulses):
+   """
+   Returns a [*wave*], a buffer of packed pulses, or a list of
+   [*pulse*] as a buffer of packed pulses.
+   """
+   if isinstance(pulses, wave):
+      return pulses.data
+   try:
+      return memoryview(pulses).cast('B')
+   except TypeError:
+      buf = bytearray()
+      for p in pulses:
+         buf.extend(struct.pack(
+            "QQQ", p.group_bits, p.group_mask, p.pulse_delay))
+      return buf
+
 def _tobuf(x):
-   if isinstance(x, (bytes, bytearray)):
+   if isinstance(x, (bytes, bytearray, memoryview)):
       return x
    elif isinstance(x, (str)):
       return x.encode('latin-1')
    elif isinstance(x, (list, tuple)):
       return bytearray(x)
    else:
-      raise error("can't convert to bytes")
+      try:
+         return memoryview(x) # any buffer, passed without a copy
+      except TypeError:
+         raise error("can't convert to bytes")
 
 def u2i(uint32):
    """
@@ -261,74 +425,219 @@ class _callback_ADT:
 
 class _callback_thread(threading.Thread):
    """
-   A class to encapsulate lgpio notification callbacks.
+   A class to encapsulate lgpio alert callbacks.
+
+   Alerts are passed in-process from the library alert thread
+   through a ring, the thread is woken by an eventfd.
    """
 
-   def __init__(self):
+   def __init__(self, fd, previous=None):
       """
-      Initialises notifications.
+      Initialises in-process alert delivery on the eventfd
+      returned by _alerts_start.
+
+      If previous is set it is a stopping thread which must exit
+      before this thread reads the ring.
       """
       threading.Thread.__init__(self)
-      self._notify = _lgpio._notify_open()
-      self._file = open('.lgd-nfy{}'.format(self._notify), 'rb')
+      self._fd = fd
+      self._previous = previous
       self.go = False
       self.daemon = True
-      self.callbacks = []
+      self.callbacks = {}
+      self.cb_lock = threading.Lock()
+      self.batches = ()
       self.go = True
       self.start()
 
    def stop(self):
       """
-      Stops notifications.
+      Stops alert delivery and wakes the thread.
       """
       if self.go:
          self.go = False
+         _lgpio._alerts_stop()
+
+   def idle(self):
+      """
+      Returns True if the thread has no callbacks.
+      """
+      return not self.callbacks and not self.batches
 
    def append(self, callb):
       """
       Adds a callback to the notification thread.
+
+      The callbacks for a GPIO are held in tables which are
+      replaced, never modified, so the thread may dispatch
+      without taking a lock.
       """
-      self.callbacks.append(callb)
+      key = (callb.chip, callb.gpio)
+      with self.cb_lock:
+         cbs = self.callbacks.get(key, _NO_CALLBACKS)[TIMEOUT]
+         self.callbacks[key] = self._tables(cbs + (callb,))
 
    def remove(self, callb):
       """
       Removes a callback from the notification thread.
       """
-      if callb in self.callbacks:
-         self.callbacks.remove(callb)
+      key = (callb.chip, callb.gpio)
+      with self.cb_lock:
+         cbs = self.callbacks.get(key, _NO_CALLBACKS)[TIMEOUT]
+         if callb in cbs:
+            cbs = tuple(cb for cb in cbs if cb is not callb)
+            if cbs:
+               self.callbacks[key] = self._tables(cbs)
+            else:
+               del self.callbacks[key]
+
+   def _tables(self, cbs):
+      """
+      Returns the callback tables for a GPIO indexed by the
+      reported level.  A falling edge (0) is passed to the
+      FALLING_EDGE and BOTH_EDGES callbacks, a rising edge (1)
+      to the RISING_EDGE and BOTH_EDGES callbacks, and a watchdog
+      timeout (2) to all callbacks.
+      """
+      return (tuple(cb for cb in cbs if cb.edge & FALLING_EDGE),
+              tuple(cb for cb in cbs if cb.edge & RISING_EDGE),
+              cbs)
+
+   def append_batch(self, batch):
+      """
+      Adds a batched callback whose pending events must be
+      delivered within its latency limit.
+      """
+      with self.cb_lock:
+         self.batches = self.batches + (batch,)
+
+   def remove_batch(self, batch):
+      """
+      Removes a batched callback.
+      """
+      with self.cb_lock:
+         self.batches = tuple(b for b in self.batches if b is not batch)
+
+   def _batch_timeout(self):
+      """
+      Returns the seconds until the earliest batch deadline or
+      None if no batch has pending events.
+      """
+      deadline = None
+      for b in self.batches:
+         if b.events and (deadline is None or b.deadline < deadline):
+            deadline = b.deadline
+      if deadline is None:
+         return None
+      return max(0.0, deadline - time.time())
+
+   def _flush_batches(self):
+      """
+      Delivers the events of batches whose deadline has passed.
+      """
+      now = time.time()
+      for b in self.batches:
+         if b.events and b.deadline <= now:
+            b.flush()
 
    def run(self):
       """
       Runs the notification thread.
       """
 
-      RECV_SIZ = 16
-      MSG_SIZ = 16 # 4 bytes of padding in each message
+      RECV_SIZ = 4096 # a multiple of the 16 byte message size
+
+      if self._previous is not None:
+         if self._previous is not threading.current_thread():
+            self._previous.join()
+         self._previous = None
 
-      buf = bytes()
+      # The ring only ever yields whole alerts.  Each wake-up
+      # drains it so a single eventfd read covers any number of
+      # blocks written by the library.
+
+      buf = bytearray(RECV_SIZ)
+      view = memoryview(buf)
       while self.go:
 
-         buf += self._file.read(RECV_SIZ)
-         offset = 0
+         timeout = self._batch_timeout()
+         if timeout is not None:
+            r, w, e = select.select([self._fd], [], [], timeout)
+            if not r:
+               self._flush_batches()
+               continue
+
+         try:
+            os.read(self._fd, 8)
+         except InterruptedError:
+            continue
+
+         n = _lgpio._alerts_read(buf)
+         while n and self.go:
+
+            # Alerts taken from the ring are dispatched even if the
+            # thread is being stopped as no other thread will see
+            # them, those left in the ring go to the next thread.
 
-         while self.go and (len(buf) - offset) >= MSG_SIZ:
-            msgbuf = buf[offset:offset + MSG_SIZ]
-            offset += MSG_SIZ
-            tick, chip, gpio, level, flags, pad = (
-               struct.unpack('QBBBBI', msgbuf))
+            for tick, chip, gpio, level, flags, pad in (
+               _ALERT.iter_unpack(view[:n])):
 
-            if flags == 0:
-               for cb in self.callbacks:
-                  if cb.chip == chip and cb.gpio == gpio:
+               if flags == 0:
+                  for cb in self.callbacks.get(
+                     (chip, gpio), _NO_CALLBACKS)[level]:
                      cb.func(chip, gpio, level, tick)
-            else: # no flags currently defined, ignore.
-               pass
+               else: # no flags currently defined, ignore.
+                  pass
 
-         buf = buf[offset:]
+            n = _lgpio._alerts_read(buf)
 
-      self._file.close()
+         if self.batches:
+            self._flush_batches()
 
-_notify_thread = _callback_thread()
+      view.release()
+
+# The alert thread is started when the first callback is added
+# and stopped when the last is cancelled.  GPIO claimed for alerts
+# without a notification handle always report in-process, the
+# alerts are simply discarded while there is no thread.
+
+_notify_lock = threading.Lock()
+_notify_thread = None
+
+def _notify_append(callb, batch=None):
+   """
+   Adds a callback, and a batch if set, to the notification
+   thread, starting the thread if needed.
+
+   Returns 0 if OK, otherwise the error code from starting the
+   thread.
+   """
+   global _notify_thread
+   with _notify_lock:
+      if _notify_thread is None or not _notify_thread.go:
+         fd = _u2i(_lgpio._alerts_start())
+         if fd < 0:
+            return fd
+         _notify_thread = _callback_thread(fd, _notify_thread)
+      if batch is not None:
+         _notify_thread.append_batch(batch)
+      _notify_thread.append(callb)
+   return 0
+
+def _notify_remove(callb, batch=None):
+   """
+   Removes a callback, and a batch if set, from the notification
+   thread, stopping the thread if it has no callbacks left.
+   """
+   with _notify_lock:
+      t = _notify_thread
+      if t is None or not t.go:
+         return
+      t.remove(callb)
+      if batch is not None:
+         t.remove_batch(batch)
+      if t.idle():
+         t.stop()
 
 class _callback:
    """
@@ -337,20 +646,20 @@ class _callback:
 
    def __init__(self, chip, gpio, edge=RISING_EDGE, func=None):
       """
-      Initialise a callback and adds it to the notification thread.
+      Initialise a callback.  It is added to the notification
+      thread by [*callback*].
       """
       self.count=0
       self._reset = False
       if func is None:
          func=self._tally
       self.callb = _callback_ADT(chip, gpio, edge, func)
-      _notify_thread.append(self.callb)
 
    def cancel(self):
       """
       Cancels a callback by removing it from the notification thread.
       """
-      _notify_thread.remove(self.callb)
+      _notify_remove(self.callb)
 
    def _tally(self, chip, gpio, level, tick):
       """
@@ -372,6 +681,50 @@ class _callback:
       self._reset = True
       self.count = 0
 
+class _callback_batch:
+   """
+   A class to provide batched GPIO level change callbacks.
+   """
+
+   def __init__(self, chip, gpio, edge, func, max_events, max_latency):
+      """
+      Initialise a batched callback.  It is added to the
+      notification thread by [*callback_batch*].
+      """
+      self.chip = chip
+      self.gpio = gpio
+      self.func = func
+      self.max_events = max_events
+      self.max_latency = max_latency
+      self.events = array.array('Q')
+      self.deadline = 0
+      self.callb = _callback_ADT(chip, gpio, edge, self._event)
+
+   def cancel(self):
+      """
+      Cancels a batched callback by removing it from the
+      notification thread.  Pending events are discarded.
+      """
+      _notify_remove(self.callb, self)
+
+   def _event(self, chip, gpio, level, tick):
+      """
+      Adds an event to the batch.
+      """
+      if not self.events:
+         self.deadline = time.time() + self.max_latency
+      self.events.extend((tick, level))
+      if len(self.events) >= (2 * self.max_events):
+         self.flush()
+
+   def flush(self):
+      """
+      Passes the pending events to the user function.
+      """
+      events = self.events
+      self.events = array.array('Q')
+      self.func(self.chip, self.gpio, events)
+
 def get_module_version():
    """
    Returns the version number of the lgpio Python module as a dotted
@@ -914,7 +1267,9 @@ def tx_wave(handle, gpio, pulses):
 
    This command starts a wave of pulses.
 
-   pulses is an array of pulses to be transmitted on the group.
+   pulses is a [*wave*], or a list of [*pulse*], to be transmitted
+   on the group.  A buffer of packed pulses, three unsigned 64 bit
+   integers per pulse, is also accepted.
 
    Each pulse is defined by the following triplet:
 
@@ -929,13 +1284,9 @@ def tx_wave(handle, gpio, pulses):
    Multiple waves may be queued in this way.
 
    """
-   if len(pulses):
-      PULSES = bytearray()
-      for p in pulses:
-         PULSES.extend(struct.pack(
-            "QQQ", p.group_bits, p.group_mask, p.pulse_delay))
-      return _u2i(_lgpio._tx_wave(handle&0xffff, gpio, PULSES)
-)
+   PULSES = _wavebuf(pulses)
+   if len(PULSES):
+      return _u2i(_lgpio._tx_wave(handle&0xffff, gpio, PULSES))
    else:
       return 0
 
@@ -972,6 +1323,34 @@ def tx_room(handle, gpio, kind):
    """
    return _u2i(_lgpio._tx_room(handle&0xffff, gpio, kind))
 
+def tx_jitter(handle, gpio, kind=TX_PWM):
+   """
+   This returns the timing statistics of the transmissions of the
+   specified kind on a GPIO or group.
+
+   handle:= >= 0 (as returned by [*gpiochip_open*]).
+     gpio:= the GPIO or group to be checked.
+     kind:= TX_PWM or TX_WAVE (default TX_PWM).
+
+   If OK returns a list of okay status, the number of edges output,
+   and the sum, maximum, and last of the edge lateness in
+   nanoseconds.
+
+   The lateness is how long after its scheduled time each edge was
+   output.  The statistics are reset whenever a new transmission
+   is started on the GPIO or group.  Zeros are returned if there is
+   no transmission.
+
+   On failure returns a negative error code.
+
+   ...
+   status, edges, late_sum, late_max, late_last = lgpio.tx_jitter(h, 5)
+   if edges:
+      print("mean {} ns, max {} ns".format(late_sum // edges, late_max))
+   ...
+   """
+   return _u2i_list(_lgpio._tx_jitter(handle&0xffff, gpio, kind))
+
 def gpio_set_debounce_micros(handle, gpio, debounce_micros):
    """
    This sets the debounce time for a GPIO.
@@ -1000,6 +1379,9 @@ def gpio_set_debounce_micros(handle, gpio, debounce_micros):
    Note that level changes will be timestamped debounce microseconds
    after the actual level change.
 
+   The debounce is done by the kernel if it is able, otherwise by
+   the library.
+
    """
    return _u2i(_lgpio._gpio_set_debounce_micros(
       handle&0xffff, gpio, debounce_micros))
@@ -1032,8 +1414,75 @@ def gpio_set_watchdog_micros(handle, gpio, watchdog_micros):
       handle&0xffff, gpio, watchdog_micros))
 
 
+def gpio_set_event_buffer(handle, gpio, event_buffer):
+   """
+   This sets the number of edges the kernel queues for a GPIO.
+
+         handle:= >= 0 (as returned by [*gpiochip_open*]).
+           gpio:= the GPIO to be configured.
+   event_buffer:= 0-1024, the number of edges, 0 for the kernel
+                  default.
+
+   If OK returns 0.
+
+   On failure returns a negative error code.
+
+   This only affects alerts and takes effect when the GPIO is next
+   claimed by [*gpio_claim_alert*].
+
+   The kernel discards new edges once its queue is full.  The
+   default queue of 16 edges may overflow if bursts of edges
+   arrive while the library is delayed.
+
+   ...
+   lgpio.gpio_set_event_buffer(h, 17, 1024)
+   lgpio.gpio_claim_alert(h, 17, lgpio.BOTH_EDGES)
+   ...
+   """
+   return _u2i(_lgpio._gpio_set_event_buffer(
+      handle&0xffff, gpio, event_buffer))
+
+
+def gpio_get_edge_stats(handle, gpio):
+   """
+   This returns the edge counts and timings of a GPIO claimed for
+   alerts.
+
+   handle:= >= 0 (as returned by [*gpiochip_open*]).
+     gpio:= the GPIO to be checked.
+
+   If OK returns a list of okay status, the number of rising edges,
+   the number of falling edges, the number of edges discarded by
+   the kernel, the last period, the last high time, the rolling
+   averages of the period and high time, and the timestamp of the
+   last edge.  Times are in nanoseconds.
+
+   On failure returns a negative error code.
+
+   The statistics are kept by the library for every edge so the
+   frequency and duty cycle of an input may be read without
+   receiving each edge in a callback.  The period is measured
+   between rising edges so both edges should be monitored for the
+   high time.  Zeros are returned if the GPIO is not claimed for
+   alerts.
+
+   Edges filtered by kernel debounce, the default where supported
+   (see [*gpio_set_debounce_micros*]), are not counted.  Set a
+   debounce of 0 to count every edge.
+
+   ...
+   s, rise, fall, lost, per, high, per_avg, high_avg, ts = (
+      lgpio.gpio_get_edge_stats(h, 17))
+   if per_avg:
+      print("{:.1f} Hz {:.1f}% duty".format(
+         1e9 / per_avg, 100.0 * high_avg / per_avg))
+   ...
+   """
+   return _u2i_list(_lgpio._gpio_get_edge_stats(handle&0xffff, gpio))
+
+
 def gpio_claim_alert(
-   handle, gpio, eFlags, lFlags=0, notify_handle=None):
+   handle, gpio, eFlags, lFlags=0, notify_handle=-1, event_buffer=None):
    """
    This claims a GPIO to be used as a source of alerts on level changes.
 
@@ -1042,6 +1491,8 @@ def gpio_claim_alert(
            eFlags:= event flags for the GPIO.
            lFlags:= line flags for the GPIO.
    notifiy_handle:= >=0 (as returned by [*notify_open*]).
+     event_buffer:= the kernel event buffer size, see
+                    [*gpio_set_event_buffer*] (default None, unchanged).
 
    If OK returns 0.
 
@@ -1054,12 +1505,17 @@ def gpio_claim_alert(
    as active low, open drain, open source,
    pull up, pull down, pull off.
 
-   Use the default notification handle of None unless you plan
+   Use the default notification handle of -1 unless you plan
    to read the alerts from a notification pipe you have opened.
+   The default passes the alerts in-process to [*callback*].
 
    """
+   if event_buffer is not None:
+      status = gpio_set_event_buffer(handle, gpio, event_buffer)
+      if status < 0:
+         return status
    if notify_handle is None:
-      notify_handle = _notify_thread._notify
+      notify_handle = -1
    return _u2i(_lgpio._gpio_claim_alert(
       handle&0xffff, lFlags, eFlags, gpio, notify_handle))
 
@@ -1075,9 +1531,15 @@ def callback(handle, gpio, edge=RISING_EDGE, func=None):
 
    Returns a callback instance.
 
+   On failure to start the callback thread returns a negative
+   error code.
+
    The user supplied callback receives four parameters, the chip,
    the GPIO, the level, and the timestamp.
 
+   Only edges matching edge are passed to the callback.  Watchdog
+   timeouts are passed to every callback for the GPIO.
+
    The reported level will be one of
 
    0: change to low (a falling edge) 
@@ -1095,9 +1557,18 @@ def callback(handle, gpio, edge=RISING_EDGE, func=None):
    be reset to zero by calling the callback instance's reset_tally()
    method.
 
+   [*gpio_get_edge_stats*] counts edges in the library without
+   passing them to a callback.
+
+   Alerts dropped because callbacks could not keep up are counted
+   by [*callback_overflows*].
+
    The callback may be cancelled by calling the callback
    instance's cancel() method.
 
+   The thread which runs the callbacks is started by the first
+   callback and stopped when the last is cancelled.
+
    A GPIO may have multiple callbacks (although I can't think of
    a reason to do so).
 
@@ -1124,7 +1595,79 @@ def callback(handle, gpio, edge=RISING_EDGE, func=None):
    cb1.cancel() # To cancel callback cb1.
    ...
    """
-   return _callback(handle>>16, gpio, edge, func)
+   cb = _callback(handle>>16, gpio, edge, func)
+   status = _notify_append(cb.callb)
+   if status < 0:
+      return status
+   return cb
+
+def callback_batch(handle, gpio, func,
+   max_events=256, max_latency=0.05, edge=BOTH_EDGES):
+   """
+   Calls a user supplied function (a callback) with blocks of
+   the edges detected on the specified GPIO.
+
+        handle:= >= 0 (as returned by [*gpiochip_open*]).
+          gpio:= >= 0, as legal for the gpiochip.
+          func:= user supplied callback function.
+    max_events:= >0, the most events passed in one call
+                 (default 256).
+   max_latency:= the most seconds an event is held before
+                 being passed (default 0.05).
+          edge:= BOTH_EDGES (default), RISING_EDGE, or
+                 FALLING_EDGE.
+
+   Returns a callback instance.
+
+   On failure to start the callback thread returns a negative
+   error code.
+
+   The user supplied callback receives three parameters, the
+   chip, the GPIO, and an array('Q') of events.  Each event
+   is a timestamp followed by a level, so the timestamps are
+   events[0::2] and the levels are events[1::2].  The levels
+   and timestamps are as described for [*callback*].
+
+   The callback is called when max_events events are pending,
+   or when the oldest pending event has waited max_latency
+   seconds.  One Python call per block rather than per edge
+   suits decoding fast signals such as DHT22 or IR remotes.
+
+   The callback may be cancelled by calling the callback
+   instance's cancel() method.  Pending events are discarded.
+
+   ...
+   def cbf(chip, gpio, events):
+      ticks = events[0::2]
+      levels = events[1::2]
+      print(chip, gpio, len(ticks))
+
+   cb1 = sbc.callback_batch(h, 22, cbf, max_events=1000)
+
+   cb1.cancel() # To cancel callback cb1.
+   ...
+   """
+   cb = _callback_batch(handle>>16, gpio, edge, func,
+      max_events, max_latency)
+   status = _notify_append(cb.callb, cb)
+   if status < 0:
+      return status
+   return cb
+
+def callback_overflows():
+   """
+   Returns the number of alerts dropped because they arrived
+   faster than the callbacks were dispatched.
+
+   Alerts are passed from the library's alert thread to Python
+   through a ring of 16384 alerts.  Alerts which arrive while the
+   ring is full are dropped and counted.
+
+   ...
+   print(lgpio.callback_overflows())
+   ...
+   """
+   return _lgpio._alerts_overflows()
 
 
 # I2C
@@ -1532,6 +2075,29 @@ def i2c_read_i2c_block_data(handle, reg, count):
    """
    return _u2i_list(_lgpio._i2c_read_i2c_block_data(handle, reg, count))
 
+def i2c_read_i2c_block_data_into(handle, reg, buffer):
+   """
+   Reads bytes from the specified register of the device into
+   a buffer.  The buffer length, 1-32, sets the number of bytes
+   to read.
+
+   handle:= >= 0 (as returned by [*i2c_open*]).
+      reg:= >= 0, the device register.
+   buffer:= a writable buffer, e.g. a bytearray or memoryview.
+
+   If OK returns the number of bytes read.
+
+   On failure returns a negative error code.
+
+   ...
+   buf = bytearray(32)
+   b = sbc.i2c_read_i2c_block_data_into(h, 4, buf)
+   if b >= 0:
+      process buf[:b]
+   ...
+   """
+   return _u2i(_lgpio._i2c_read_i2c_block_data_into(handle, reg, buffer))
+
 def i2c_read_device(handle, count):
    """
    Returns count bytes read from the raw device associated
@@ -1556,6 +2122,25 @@ def i2c_read_device(handle, count):
    """
    return _u2i_list(_lgpio._i2c_read_device(handle, count))
 
+def i2c_read_device_into(handle, buffer):
+   """
+   Reads bytes from the raw device associated with handle into
+   a buffer.  The buffer length sets the number of bytes to read.
+
+   handle:= >= 0 (as returned by [*i2c_open*]).
+   buffer:= a writable buffer, e.g. a bytearray or memoryview.
+
+   If OK returns the number of bytes read.
+
+   On failure returns a negative error code.
+
+   ...
+   buf = bytearray(12)
+   count = sbc.i2c_read_device_into(h, buf)
+   ...
+   """
+   return _u2i(_lgpio._i2c_read_device_into(handle, buffer))
+
 def i2c_write_device(handle, data):
    """
    Writes the data bytes to the raw device.
@@ -1697,6 +2282,191 @@ def notify_open():
    """
    return _u2i(_lgpio._notify_open())
 
+def notify_open_ring(records=4096):
+   """
+   Opens a shared memory notification.
+
+   records:= the number of alerts held by the ring, a power of
+             2 from 64 to 1048576 (default 4096).
+
+   If OK returns a handle (>= 0).
+
+   On failure returns a negative error code.
+
+   The alerts are written to a ring in memory shared with the
+   readers rather than being copied through a pipe.  This suits
+   alert rates of hundreds of kHz.  Use [*notify_ring*] to read
+   the ring.
+
+   The ring for handle x is the file .lgd-nfyx.ring in the
+   library's working directory.
+
+   ...
+   h = lgpio.notify_open_ring(65536)
+   ...
+   """
+   return _u2i(_lgpio._notify_open_ring(records))
+
+class notify_ring:
+   """
+   A class to read GPIO alerts from a shared memory notification.
+   """
+
+   def __init__(self, handle, directory="."):
+      """
+      Opens the ring and pipe of a shared memory notification.
+
+         handle:= >= 0 (as returned by [*notify_open_ring*]).
+      directory:= the library's working directory.  The library
+                  changes to it so the default is normally right.
+
+      Only alerts added after the ring is opened are read.
+
+      ...
+      h = lgpio.notify_open_ring(65536)
+      ring = lgpio.notify_ring(h)
+      lgpio.gpio_claim_alert(chip, 23, lgpio.BOTH_EDGES, notify_handle=h)
+      while True:
+         for chip, gpio, level, tick in ring.alerts():
+            print(chip, gpio, level, tick)
+      ...
+      """
+      path = os.path.join(directory, ".lgd-nfy{}".format(handle))
+      self._fd = os.open(path, os.O_RDONLY | os.O_NONBLOCK)
+      try:
+         with open(path + ".ring", "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+      except (IOError, OSError, ValueError):
+         os.close(self._fd)
+         raise
+      magic, self.records = struct.unpack_from('II', self._mm, 0)
+      if magic != _RING_MAGIC:
+         self._mm.close()
+         os.close(self._fd)
+         raise error(error_text(BAD_RING_SIZE))
+      self._view = memoryview(self._mm)
+      self.pos = self._count(_RING_HEAD)
+      self._first = self.pos
+      self.overruns = 0
+
+   def _count(self, offset):
+      """
+      Returns the ring header count at offset, the alerts written
+      (head) or being written (reserve).  The count is read until
+      two reads agree as on a 32 bit SBC the library may be part way
+      through updating it.
+      """
+      count = struct.unpack_from('Q', self._mm, offset)[0]
+      while True:
+         again = struct.unpack_from('Q', self._mm, offset)[0]
+         if again == count:
+            return count
+         count = again
+
+   def fileno(self):
+      """
+      Returns the file descriptor of the pipe which becomes
+      readable when alerts are added, for use with select.
+      """
+      return self._fd
+
+   def views(self, timeout=None):
+      """
+      Returns a list of memoryviews of the alerts added since the
+      last call.  Each view holds a whole number of 16 byte alerts
+      (see [*notify_open*] for the layout).  There are two views if
+      the alerts wrap around the end of the ring.
+
+      timeout:= the most seconds to wait for an alert if none are
+                waiting.  None waits indefinitely, 0 does not wait.
+
+      The views refer directly to the ring so must be used before
+      the library writes another ring's worth of alerts.  Call
+      [*overwritten*] once the views have been used to find how
+      many of their leading alerts may have been overwritten
+      meanwhile.  Alerts which were overwritten before being read
+      are counted in overruns.
+
+      ...
+      for v in ring.views():
+         for tick, chip, gpio, level, flags, pad in (
+            struct.iter_unpack('QBBBBI', v)):
+            print(chip, gpio, level, tick)
+      ...
+      """
+      try:
+         while os.read(self._fd, 4096):
+            pass
+      except OSError:
+         pass # the pipe is empty
+
+      head = self._count(_RING_HEAD)
+      if head == self.pos and timeout != 0:
+         select.select([self._fd], [], [], timeout)
+         head = self._count(_RING_HEAD)
+
+      pos = self.pos
+      if head - pos > self.records:
+         self.overruns += head - pos - self.records
+         pos = head - self.records
+      self.pos = head
+      self._first = pos
+
+      count = head - pos
+      start = pos % self.records
+      first = min(count, self.records - start)
+      views = []
+      if first:
+         base = _RING_HDR_LEN + start * _ALERT.size
+         views.append(self._view[base:base + first * _ALERT.size])
+      if count > first:
+         base = _RING_HDR_LEN
+         views.append(self._view[base:base + (count - first) * _ALERT.size])
+      return views
+
+   def overwritten(self):
+      """
+      Returns how many of the alerts returned by the last call of
+      [*views*] have since been, or are being, overwritten.  They
+      are the first alerts of the views and should be discarded.
+      They are counted in overruns.
+
+      ...
+      views = ring.views()
+      alerts = [a for v in views for a in struct.iter_unpack('QBBBBI', v)]
+      alerts = alerts[ring.overwritten():]
+      ...
+      """
+      lost = min(self._count(_RING_RESERVE) - self.records, self.pos)
+      lost -= self._first
+      if lost <= 0:
+         return 0
+      self._first += lost
+      self.overruns += lost
+      return lost
+
+   def alerts(self, timeout=None):
+      """
+      Returns a list of the alerts added since the last call as
+      (chip, gpio, level, tick) tuples.  Alerts overwritten while
+      being copied are discarded and counted in overruns.
+
+      timeout:= as for [*views*].
+      """
+      alerts = [(chip, gpio, level, tick)
+         for v in self.views(timeout)
+            for tick, chip, gpio, level, flags, pad in _ALERT.iter_unpack(v)]
+      return alerts[self.overwritten():]
+
+   def close(self):
+      """
+      Closes the ring.  Any views returned by [*views*] must have
+      been released.
+      """
+      self._view.release()
+      self._mm.close()
+      os.close(self._fd)
+
 def notify_pause(handle):
    """
    Pauses notifications on a handle.
@@ -1762,6 +2532,31 @@ def notify_close(handle):
    """
    return _u2i(_lgpio._notify_close(handle))
 
+def notify_stats(handle):
+   """
+   This returns the delivery statistics of a notification.
+
+   handle:= >= 0 (as returned by [*notify_open*])
+
+   If OK returns a list of okay status, the number of reports
+   delivered, the number of reports dropped, the number of complete
+   writes, the number of writes cut short, and the number of writes
+   refused because the pipe or socket was full.
+
+   Reports are dropped if the reader does not keep up.  For a shared
+   memory notification only the reports delivered and the writes are
+   counted.
+
+   On failure returns a negative error code.
+
+   ...
+   status, reports, dropped, writes, short, full = lgpio.notify_stats(h)
+   if dropped:
+      print("{} alerts lost".format(dropped))
+   ...
+   """
+   return _u2i_list(_lgpio._notify_stats(handle))
+
 # SERIAL
 
 def serial_open(tty, baud, ser_flags=0):
@@ -1865,6 +2660,29 @@ def serial_read(handle, count=1000):
    """
    return _u2i_list(_lgpio._serial_read(handle, count))
 
+def serial_read_into(handle, buffer):
+   """
+   Reads up to the buffer length bytes from the device into
+   a buffer.
+
+   handle:= >= 0 (as returned by [*serial_open*]).
+   buffer:= a writable buffer, e.g. a bytearray or memoryview.
+
+   If OK returns the number of bytes read.
+
+   On failure returns a negative error code.
+
+   If no data is ready zero is returned.
+
+   ...
+   buf = bytearray(100)
+   b = sbc.serial_read_into(h2, buf)
+   if b > 0:
+      process buf[:b]
+   ...
+   """
+   return _u2i(_lgpio._serial_read_into(handle, buffer))
+
 def serial_write(handle, data):
    """
    Writes the data bytes to the device.
@@ -1991,6 +2809,29 @@ def spi_read(handle, count):
    """
    return _u2i_list(_lgpio._spi_read(handle, count))
 
+def spi_read_into(handle, buffer):
+   """
+   Reads bytes from the SPI device into a buffer.  The buffer
+   length sets the number of bytes to read.
+
+   handle:= >= 0 (as returned by [*spi_open*]).
+   buffer:= a writable buffer, e.g. a bytearray or memoryview.
+
+   If OK returns the number of bytes read.
+
+   On failure returns a negative error code.
+
+   ...
+   buf = bytearray(60)
+   b = sbc.spi_read_into(h, buf) # read 60 bytes from handle h
+   if b == 60:
+      process read data
+   else:
+      error path
+   ...
+   """
+   return _u2i(_lgpio._spi_read_into(handle, buffer))
+
 def spi_write(handle, data):
    """
    Writes the data bytes to the SPI device.
@@ -2040,6 +2881,27 @@ def spi_xfer(handle, data):
    """
    return _u2i_list(_lgpio._spi_xfer(handle, _tobuf(data)))
 
+def spi_xfer_into(handle, data, buffer):
+   """
+   Writes the data bytes to the SPI device, reading the data
+   bytes returned by the device into a buffer.
+
+   handle:= >= 0 (as returned by [*spi_open*]).
+     data:= the bytes to write.
+   buffer:= a writable buffer at least as long as data.
+
+   If OK returns the number of bytes transferred.
+
+   On failure returns a negative error code.
+
+   ...
+   tx = bytes((1, 128, 0))
+   rx = bytearray(3)
+   count = sbc.spi_xfer_into(h, tx, rx)
+   ...
+   """
+   return _u2i(_lgpio._spi_xfer_into(handle, _tobuf(data), buffer))
+
 
 # UTILITIES
 
@@ -23,6 +23,7 @@ if int(os.environ.get('PYPI', '0')):
     # the liblgpio library
     Path('MANIFEST.in').write_text(dedent("""\
         include lgpio_extra.py
+        include lgpio_wave.py
         include src/lg*.h
         include src/rgpiod.h
         """))
@@ -38,6 +39,7 @@ else:
     # Otherwise, build a dynamically linked module
     Path('MANIFEST.in').write_text(dedent("""\
         include lgpio_extra.py
+        include lgpio_wave.py
         include src/lgpio.h
         """))
     lgpio_module = Extension(
@@ -65,7 +67,7 @@ setup (name = 'lgpio',
          "Programming Language :: Python :: 3",
        ],
        ext_modules=[lgpio_module],
-       py_modules=["lgpio"],
+       py_modules=["lgpio", "lgpio_wave"],
        cmdclass={'build_py': build_py},
        )
 
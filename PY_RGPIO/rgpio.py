@@ -19,6 +19,7 @@ o SPI wrapper
 o serial link wrapper
 o simple file handling
 o creating and running scripts on the rgpiod daemon
+o an asyncio client, rgpio.aio
 
 *Exceptions*
 
@@ -95,12 +96,18 @@ ESSENTIAL
 rgpio.sbc                 Initialise sbc connection
 stop                      Stop a sbc connection
 
+batch                     Pipeline commands to the daemon
+
+stats                     Get command and callback statistics
+stats_reset               Clear command and callback statistics
+
 FILES
 
 file_open                 Opens a file
 file_close                Closes a file
 
 file_read                 Reads bytes from a file
+file_read_into            Reads bytes from a file into a buffer
 file_write                Writes bytes to a file
 
 file_seek                 Seeks to a position within a file
@@ -138,11 +145,16 @@ tx_servo                  Starts servo pulses on a GPIO
 tx_wave                   Starts a wave on a group of GPIO
 tx_busy                   See if tx is active on a GPIO or group
 tx_room                   See if more room for tx on a GPIO or group
+tx_jitter                 Get the tx timing statistics of a GPIO or group
 
 gpio_set_debounce_micros  Sets the debounce time for a GPIO
 gpio_set_watchdog_micros  Sets the watchdog time for a GPIO
+gpio_set_event_buffer     Sets the kernel event buffer size for a GPIO
+gpio_get_edge_stats       Gets the edge counts and timings of a GPIO
 
 callback                  Starts a GPIO callback
+callback_batch            Starts a GPIO callback receiving blocks of edges
+callback_overflows        Number of callbacks dropped by the workers
 
 I2C
 
@@ -167,6 +179,7 @@ i2c_read_i2c_block_data   SMBus read I2C block data
 i2c_write_i2c_block_data  SMBus write I2C block data
 
 i2c_read_device           Reads the raw I2C device
+i2c_read_device_into      Reads the raw I2C device into a buffer
 i2c_write_device          Writes the raw I2C device
 
 i2c_process_call          SMBus process call
@@ -177,9 +190,12 @@ i2c_zip                   Performs multiple I2C transactions
 NOTIFICATIONS
 
 notify_open               Request a notification handle
+notify_open_ring          Request a shared memory notification handle
+rgpio.notify_ring         Read a shared memory notification
 notify_close              Close a notification
 notify_pause              Pause notifications
 notify_resume             Resume notifications
+notify_stats              Get the delivery statistics of a notification
 
 SCRIPTS
 
@@ -199,6 +215,7 @@ serial_read_byte          Reads a byte from a serial device
 serial_write_byte         Writes a byte to a serial device
 
 serial_read               Reads bytes from a serial device
+serial_read_into          Reads bytes from a serial device into a buffer
 serial_write              Writes bytes to a serial device
 
 serial_data_available     Returns number of bytes ready to be read
@@ -213,8 +230,10 @@ spi_open                  Opens a SPI device
 spi_close                 Closes a SPI device
 
 spi_read                  Reads bytes from a SPI device
+spi_read_into             Reads bytes from a SPI device into a buffer
 spi_write                 Writes bytes to a SPI device
 spi_xfer                  Transfers bytes with a SPI device
+spi_xfer_into             Transfers bytes with a SPI device into a buffer
 
 UTILITIES
 
@@ -236,6 +255,14 @@ import socket
 import struct
 import time
 import threading
+import array
+import select
+import mmap
+
+if sys.hexversion < 0x03000000:
+   import Queue as queue
+else:
+   import queue
 import os
 import atexit
 import hashlib
@@ -313,6 +340,23 @@ SPI_MODE_3 = 3
 
 _SOCK_CMD_LEN = 16
 
+_BATCH_SEND = 4096 # most bytes written at once by a batch
+
+# alert report: tick, chip, gpio, level, flags, pad
+
+_ALERT = struct.Struct('QBBBBI')
+
+# callback tables indexed by alert level for an unmonitored GPIO
+
+_NO_CALLBACKS = ((), (), ())
+
+# The shared memory notification ring header.
+
+_RING_MAGIC = 0x474e5252
+_RING_HEAD = 8
+_RING_RESERVE = 16
+_RING_HDR_LEN = 64
+
 # rgpiod command numbers
 
 _CMD_FO = 1
@@ -345,6 +389,9 @@ _CMD_GWDOG = 30
 _CMD_GIC = 31
 _CMD_GIL = 32
 _CMD_GMODE = 33
+_CMD_GJIT = 34
+_CMD_GEVB = 35
+_CMD_GES = 36
 _CMD_I2CO = 40
 _CMD_I2CC = 41
 _CMD_I2CRD = 42
@@ -367,6 +414,8 @@ _CMD_NO = 70
 _CMD_NC = 71
 _CMD_NR = 72
 _CMD_NP = 73
+_CMD_NOR = 74
+_CMD_NS = 75
 _CMD_PARSE = 80
 _CMD_PROC = 81
 _CMD_PROCD = 82
@@ -513,6 +562,8 @@ BAD_PWM_FREQ = -102
 BAD_PWM_DUTY = -103
 GPIO_NOT_AN_OUTPUT = -104
 INVALID_GROUP_ALERT = -105
+BAD_RING_SIZE = -106
+BAD_EVENT_BUFFER = -107
 
 # rgpiod error text
 
@@ -623,6 +674,8 @@ _errors=[
    [BAD_PWM_DUTY,  "bad PWM dutycycle"],
    [GPIO_NOT_AN_OUTPUT,  "GPIO not set as an output"],
    [INVALID_GROUP_ALERT,  "can not set a group to alert"],
+   [BAD_RING_SIZE,  "bad notification ring size"],
+   [BAD_EVENT_BUFFER,  "bad kernel event buffer size"],
 ]
 
 _except_a = "############################################################\n{}"
@@ -654,6 +707,106 @@ class _socklock:
    def __init__(self):
       self.s = None
       self.l = threading.Lock()
+      self.t = threading.local()
+      self.stats = None
+
+class _stats:
+   """
+   A class to accumulate command and callback statistics.
+   """
+
+   BUCKETS = 24 # command latency histogram, log2 microseconds
+
+   def __init__(self):
+      """
+      Initialises the statistics.
+      """
+      self.lock = threading.Lock()
+      self.reset()
+
+   def reset(self):
+      """
+      Clears the statistics.
+      """
+      with self.lock:
+         self.started = time.perf_counter()
+         self.commands = {}
+         self.alerts = 0
+         self.dispatch_time = 0.0
+         self.dispatch_max = 0.0
+
+   def _cmd(self, cmd):
+      """
+      Returns the counters for a command, [count, bytes sent,
+      bytes received, total latency, maximum latency, histogram].
+      """
+      c = self.commands.get(cmd)
+      if c is None:
+         c = [0, 0, 0, 0.0, 0.0, [0] * self.BUCKETS]
+         self.commands[cmd] = c
+      return c
+
+   def command(self, cmd, sent, received, latency):
+      """
+      Records a command of sent bytes whose reply header, of
+      received bytes, arrived latency seconds after it was sent.
+      """
+      b = min(int(latency * 1000000).bit_length(), self.BUCKETS - 1)
+      with self.lock:
+         c = self._cmd(cmd)
+         c[0] += 1
+         c[1] += sent
+         c[2] += received
+         c[3] += latency
+         if latency > c[4]:
+            c[4] = latency
+         c[5][b] += 1
+
+   def received(self, cmd, count):
+      """
+      Records count bytes of reply extension for a command.
+      """
+      with self.lock:
+         self._cmd(cmd)[2] += count
+
+   def dispatched(self, alerts, elapsed):
+      """
+      Records the dispatch of a block of alerts which took
+      elapsed seconds.
+      """
+      with self.lock:
+         self.alerts += alerts
+         self.dispatch_time += elapsed
+         if elapsed > self.dispatch_max:
+            self.dispatch_max = elapsed
+
+   def snapshot(self, pool):
+      """
+      Returns a dictionary of the statistics.
+      """
+      with self.lock:
+         elapsed = time.perf_counter() - self.started
+         commands = {}
+         for cmd, c in self.commands.items():
+            commands[cmd] = {
+               "count": c[0],
+               "bytes_sent": c[1],
+               "bytes_received": c[2],
+               "latency_total": c[3],
+               "latency_max": c[4],
+               "latency_histogram": list(c[5])}
+         callbacks = {
+            "alerts": self.alerts,
+            "alerts_per_sec": self.alerts / elapsed if elapsed else 0.0,
+            "dispatch_time": self.dispatch_time,
+            "dispatch_max": self.dispatch_max,
+            "queue_depth": 0,
+            "overflows": 0}
+      if pool is not None:
+         callbacks["queue_depth"] = sum(q.qsize() for q in pool.queues)
+         callbacks["overflows"] = pool.overflows
+      return {"elapsed": elapsed, "commands": commands,
+              "callbacks": callbacks}
 
 class error(Exception):
    """
@@ -669,6 +822,8 @@ class pulse:
    A class to store pulse information.
    """
 
+   __slots__ = ('group_bits', 'group_mask', 'pulse_delay')
+
    def __init__(self, group_bits, group_mask, pulse_delay):
       """
       Initialises a pulse.
@@ -682,6 +837,145 @@ class pulse:
       self.group_mask = group_mask
       self.pulse_delay = pulse_delay
 
+def _qarray(x):
+   """
+   Returns a sequence as an array of unsigned 64 bit integers.
+   Contiguous buffers of 64 bit integers, such as NumPy uint64
+   arrays, are copied as raw bytes.
+   """
+   if isinstance(x, array.array) and x.typecode == 'Q':
+      return x
+   try:
+      m = memoryview(x)
+   except TypeError:
+      return array.array('Q', x)
+   a = array.array('Q')
+   if (m.itemsize == 8 and m.c_contiguous and
+       m.format.lstrip('@=<') in ('Q', 'q', 'L', 'l')):
+      a.frombytes(m.cast('B'))
+   else:
+      a.extend(m.tolist())
+   return a
+
+class wave:
+   """
+   A class to store a wave as packed pulses.
+
+   The pulses are held in an array of unsigned 64 bit integers,
+   three per pulse (group_bits, group_mask, pulse_delay), which
+   is passed to [*tx_wave*] as is.
+   """
+
+   __slots__ = ('data',)
+
+   def __init__(self, pulses=()):
+      """
+      Initialises a wave.
+
+      pulses:= an optional list of [*pulse*] or another wave.
+      """
+      self.data = array.array('Q')
+      self.extend(pulses)
+
+   @classmethod
+   def from_arrays(cls, group_bits, group_mask, pulse_delay):
+      """
+      Returns a wave built from per pulse sequences.
+
+       group_bits:= the levels for each pulse.
+       group_mask:= the mask for each pulse, or a single mask
+                    used for every pulse.
+      pulse_delay:= the delay in microseconds after each pulse.
+
+      The sequences may be lists, arrays, or NumPy arrays and
+      must be the same length.
+
+      ...
+      # 1000 cycles of a 50 us square wave on group bit 0
+      w = wave.from_arrays([1, 0] * 1000, 1, [25] * 2000)
+      ...
+      """
+      bits = _qarray(group_bits)
+      delay = _qarray(pulse_delay)
+      if not hasattr(group_mask, '__len__'):
+         mask = array.array('Q', [int(group_mask)]) * len(bits)
+      else:
+         mask = _qarray(group_mask)
+      if len(bits) != len(mask) or len(bits) != len(delay):
+         raise ValueError("sequences differ in length")
+      w = cls()
+      w.data = array.array('Q', bytes(24 * len(bits)))
+      with memoryview(w.data) as m:
+         m[0::3] = bits
+         m[1::3] = mask
+         m[2::3] = delay
+      return w
+
+   @classmethod
+   def from_levels(cls, levels, group_mask=1):
+      """
+      Returns a wave built from level and duration pairs.
+
+          levels:= a sequence of (group_bits, pulse_delay) pairs.
+      group_mask:= the group GPIO updated by every pulse.
+
+      ...
+      # a 1 ms low then a 2 ms high on group bit 0
+      w = wave.from_levels([(0, 1000), (1, 2000)])
+      ...
+      """
+      levels = tuple(levels)
+      if not levels:
+         return cls()
+      bits, delay = zip(*levels)
+      return cls.from_arrays(bits, group_mask, delay)
+
+   def append(self, group_bits, group_mask, pulse_delay):
+      """
+      Adds a pulse to the end of the wave.
+      """
+      self.data.extend((group_bits, group_mask, pulse_delay))
+
+   def extend(self, pulses):
+      """
+      Adds a list of [*pulse*], or another wave, to the end
+      of the wave.
+      """
+      if isinstance(pulses, wave):
+         self.data.extend(pulses.data)
+      else:
+         for p in pulses:
+            self.data.extend((p.group_bits, p.group_mask, p.pulse_delay))
+
+   def duration(self):
+      """
+      Returns the total delay of the wave in microseconds.
+      """
+      return sum(self.data[2::3])
+
+   def __len__(self):
+      return len(self.data) // 3
+
+   def __getitem__(self, index):
+      i = range(len(self))[index] * 3
+      return pulse(self.data[i], self.data[i+1], self.data[i+2])
+
+def _wavebuf(pulses):
+   """
+   Returns a [*wave*], a buffer of packed pulses, or a list of
+   [*pulse*] as a buffer of packed pulses.
+   """
+   if isinstance(pulses, wave):
+      return pulses.data
+   try:
+      return memoryview(pulses).cast('B')
+   except TypeError:
+      buf = bytearray()
+      for p in pulses:
+         buf.extend(struct.pack(
+            "QQQ", p.group_bits, p.group_mask, p.pulse_delay))
+      return buf
+
 
 # A couple of hacks to cope with different string handling
 # between various Python versions
@@ -746,12 +1040,42 @@ def _u2i_list(lst):
          raise error(error_text(lst[0]))
    return lst
 
+def _lg_batched(sl, msg):
+   """
+   If a batch is open on the calling thread the message is
+   queued and True is returned.
+   """
+   b = getattr(sl.t, "batch", None)
+   if b is None:
+      return False
+   b.cmds.append(bytes(msg))
+   return True
+
+def _lg_command_timed(sl, cmd, msg):
+   """
+   Sends a command and receives its status, recording the
+   command in the socket's statistics.  The command is noted
+   so that its reply extension, if any, is also recorded.
+   """
+   start = time.perf_counter()
+   sl.s.sendall(msg)
+   status, dummy = struct.unpack('I12s', sl.s.recv(_SOCK_CMD_LEN))
+   sl.stats.command(
+      cmd, len(msg), _SOCK_CMD_LEN, time.perf_counter() - start)
+   sl.t.cmd = cmd
+   return status
+
 def _lg_command(sl, cmd, Q=0, L=0, H=0):
    """
    """
    status = CMD_INTERRUPTED
+   msg = struct.pack('IIHHHH', MAGIC, 0, cmd, Q, L, H)
+   if _lg_batched(sl, msg):
+      return 0
    with sl.l:
-      sl.s.send(struct.pack('IIHHHH', MAGIC, 0, cmd, Q, L, H))
+      if sl.stats is not None:
+         return _lg_command_timed(sl, cmd, msg)
+      sl.s.send(msg)
       status, dummy = struct.unpack('I12s', sl.s.recv(_SOCK_CMD_LEN))
    return status
 
@@ -759,7 +1083,12 @@ def _lg_command_nolock(sl, cmd, Q=0, L=0, H=0):
    """
    """
    status = CMD_INTERRUPTED
-   sl.s.send(struct.pack('IIHHHH', MAGIC, 0, cmd, Q, L, H))
+   msg = struct.pack('IIHHHH', MAGIC, 0, cmd, Q, L, H)
+   if _lg_batched(sl, msg):
+      return 0
+   if sl.stats is not None:
+      return _lg_command_timed(sl, cmd, msg)
+   sl.s.send(msg)
    status, dummy = struct.unpack('I12s', sl.s.recv(_SOCK_CMD_LEN))
    return status
 
@@ -773,7 +1102,11 @@ def _lg_command_ext(sl, cmd, p3, extents, Q=0, L=0, H=0):
       else:
          ext.extend(x)
    status = CMD_INTERRUPTED
+   if _lg_batched(sl, ext):
+      return 0
    with sl.l:
+      if sl.stats is not None:
+         return _lg_command_timed(sl, cmd, ext)
       sl.s.sendall(ext)
       status, dummy = struct.unpack('I12s', sl.s.recv(_SOCK_CMD_LEN))
    return status
@@ -788,10 +1121,29 @@ def _lg_command_ext_nolock(sl, cmd, p3, extents, Q=0, L=0, H=0):
          ext.extend(_b(x))
       else:
          ext.extend(x)
+   if _lg_batched(sl, ext):
+      return 0
+   if sl.stats is not None:
+      return _lg_command_timed(sl, cmd, ext)
    sl.s.sendall(ext)
    status, dummy = struct.unpack('I12s', sl.s.recv(_SOCK_CMD_LEN))
    return status
 
+def _lg_connect(host, port, unix):
+   """
+   Returns a socket connected to the rgpiod daemon, on the unix
+   socket path unix if set, otherwise on host and port.
+   """
+   if unix is None:
+      return socket.create_connection((host, port), None)
+   s = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+   try:
+      s.connect(unix)
+   except socket.error:
+      s.close()
+      raise
+   return s
+
 class _callback_ADT:
    """
    An ADT class to hold callback information.
@@ -811,15 +1163,78 @@ class _callback_ADT:
       self.gpio = gpio
       self.edge = edge
       self.func = func
+      self.inline = False
+
+class _callback_pool:
+   """
+   A class to run callbacks on a bounded pool of worker threads.
+   """
+
+   def __init__(self, workers, queue_size):
+      """
+      Starts the workers.  Each worker has its own queue of at
+      most queue_size pending calls.
+      """
+      self.go = True
+      self.overflows = 0
+      self.queues = [queue.Queue(queue_size) for i in range(workers)]
+      for q in self.queues:
+         t = threading.Thread(target=self._work, args=(q,))
+         t.daemon = True
+         t.start()
+
+   def put(self, key, func, args):
+      """
+      Queues a call.  All calls for the same key go to the same
+      worker so they are made in order.  If that worker's queue is
+      full the call is dropped and counted as an overflow.
+      """
+      try:
+         self.queues[hash(key) % len(self.queues)].put_nowait((func, args))
+      except queue.Full:
+         self.overflows += 1
+
+   def stop(self):
+      """
+      Stops the workers once their queued calls have been made.
+      """
+      self.go = False
+      for q in self.queues:
+         try:
+            q.put_nowait((None, None))
+         except queue.Full:
+            pass
+
+   def _work(self, q):
+      """
+      Makes the queued calls.
+      """
+      while self.go or not q.empty():
+         func, args = q.get()
+         if func is None:
+            break
+         func(*args)
 
 class _callback_thread(threading.Thread):
    """
    A class to encapsulate rgpio notification callbacks.
    """
 
-   def __init__(self, control, host, port):
+   def __init__(self, control, host, port, workers=0, queue_size=1024,
+                stats=None, unix=None, latency=None):
       """
       Initialises notifications.
+
+      If workers is greater than 0 the callbacks are run on a pool
+      of that many worker threads rather than on this thread.
+
+      If stats is set the dispatch of alerts is recorded in it.
+
+      If unix is set the unix socket path is used rather than
+      host and port.
+
+      If latency is set it is passed to the daemon as the
+      notification latency in microseconds.
       """
       threading.Thread.__init__(self)
       self.control = control
@@ -827,10 +1242,20 @@ class _callback_thread(threading.Thread):
       self.go = False
       self.daemon = True
       self.monitor = 0
-      self.callbacks = []
-      self.sl.s = socket.create_connection((host, port), None)
+      self.callbacks = {}
+      self.cb_lock = threading.Lock()
+      self.batches = ()
+      self.pool = None
+      self.stats = stats
+      self.sl.s = _lg_connect(host, port, unix)
       self.lastLevel = 0
-      self.handle = _u2i(_lg_command(self.sl, _CMD_NOIB))
+      if latency is None:
+         self.handle = _u2i(_lg_command(self.sl, _CMD_NOIB))
+      else:
+         ext = [struct.pack("I", latency)]
+         self.handle = _u2i(_lg_command_ext(self.sl, _CMD_NOIB, 4, ext, L=1))
+      if workers > 0:
+         self.pool = _callback_pool(workers, queue_size)
       self.go = True
       self.start()
 
@@ -842,19 +1267,93 @@ class _callback_thread(threading.Thread):
          self.go = False
          ext = [struct.pack("I", self.handle)]
          _lg_command_ext(self.control, _CMD_NC, 4, ext, L=1)
+         if self.pool is not None:
+            self.pool.stop()
+
+   def call(self, key, func, args):
+      """
+      Calls func, on the worker pool if there is one.
+      """
+      if self.pool is None:
+         func(*args)
+      else:
+         self.pool.put(key, func, args)
 
    def append(self, callb):
       """
       Adds a callback to the notification thread.
+
+      The callbacks for a GPIO are held in tables which are
+      replaced, never modified, so the thread may dispatch
+      without taking a lock.
       """
-      self.callbacks.append(callb)
+      key = (callb.chip, callb.gpio)
+      with self.cb_lock:
+         cbs = self.callbacks.get(key, _NO_CALLBACKS)[TIMEOUT]
+         self.callbacks[key] = self._tables(cbs + (callb,))
 
    def remove(self, callb):
       """
       Removes a callback from the notification thread.
       """
-      if callb in self.callbacks:
-         self.callbacks.remove(callb)
+      key = (callb.chip, callb.gpio)
+      with self.cb_lock:
+         cbs = self.callbacks.get(key, _NO_CALLBACKS)[TIMEOUT]
+         if callb in cbs:
+            cbs = tuple(cb for cb in cbs if cb is not callb)
+            if cbs:
+               self.callbacks[key] = self._tables(cbs)
+            else:
+               del self.callbacks[key]
+
+   def _tables(self, cbs):
+      """
+      Returns the callback tables for a GPIO indexed by the
+      reported level.  A falling edge (0) is passed to the
+      FALLING_EDGE and BOTH_EDGES callbacks, a rising edge (1)
+      to the RISING_EDGE and BOTH_EDGES callbacks, and a watchdog
+      timeout (2) to all callbacks.
+      """
+      return (tuple(cb for cb in cbs if cb.edge & FALLING_EDGE),
+              tuple(cb for cb in cbs if cb.edge & RISING_EDGE),
+              cbs)
+
+   def append_batch(self, batch):
+      """
+      Adds a batched callback whose pending events must be
+      delivered within its latency limit.
+      """
+      with self.cb_lock:
+         self.batches = self.batches + (batch,)
+
+   def remove_batch(self, batch):
+      """
+      Removes a batched callback.
+      """
+      with self.cb_lock:
+         self.batches = tuple(b for b in self.batches if b is not batch)
+
+   def _batch_timeout(self):
+      """
+      Returns the seconds until the earliest batch deadline or
+      None if no batch has pending events.
+      """
+      deadline = None
+      for b in self.batches:
+         if b.events and (deadline is None or b.deadline < deadline):
+            deadline = b.deadline
+      if deadline is None:
+         return None
+      return max(0.0, deadline - time.time())
+
+   def _flush_batches(self):
+      """
+      Delivers the events of batches whose deadline has passed.
+      """
+      now = time.time()
+      for b in self.batches:
+         if b.events and b.deadline <= now:
+            b.flush()
 
    def run(self):
       """
@@ -865,27 +1364,62 @@ class _callback_thread(threading.Thread):
       RECV_SIZ = 4096
       MSG_SIZ = 16 # 4 bytes of padding in each message
 
-      buf = bytes()
+      # Messages are received into a preallocated buffer and
+      # decoded in place.  Only a trailing partial message is
+      # ever moved.
+
+      pool = self.pool
+      stats = self.stats
+
+      buf = bytearray(RECV_SIZ)
+      view = memoryview(buf)
+      got = 0
       while self.go:
 
-         buf += self.sl.s.recv(RECV_SIZ)
-         offset = 0
+         timeout = self._batch_timeout()
+         if timeout is not None:
+            r, w, e = select.select([self.sl.s], [], [], timeout)
+            if not r:
+               self._flush_batches()
+               continue
+
+         n = self.sl.s.recv_into(view[got:])
+         if n == 0:
+            break
+         got += n
+         whole = got - (got % MSG_SIZ)
+
+         if stats is not None:
+            start = time.perf_counter()
+
+         for tick, chip, gpio, level, flags, pad in (
+            _ALERT.iter_unpack(view[:whole])):
 
-         while self.go and (len(buf) - offset) >= MSG_SIZ:
-            msgbuf = buf[offset:offset + MSG_SIZ]
-            offset += MSG_SIZ
-            tick, chip, gpio, level, flags, pad = (
-               struct.unpack('QBBBBI', msgbuf))
+            if not self.go:
+               break
 
             if flags == 0:
-               for cb in self.callbacks:
-                  if cb.gpio == gpio:
+               for cb in self.callbacks.get(
+                  (chip, gpio), _NO_CALLBACKS)[level]:
+                  if pool is None or cb.inline:
                      cb.func(chip, gpio, level, tick)
+                  else:
+                     pool.put(
+                        (chip, gpio), cb.func, (chip, gpio, level, tick))
             else: # no flags currently defined, ignore.
                pass
 
-         buf = buf[offset:]
+         if stats is not None:
+            stats.dispatched(whole // MSG_SIZ, time.perf_counter() - start)
 
+         got -= whole
+         if got:
+            buf[:got] = buf[whole:whole+got]
+
+         if self.batches:
+            self._flush_batches()
+
+      view.release()
       self.sl.s.close()
 
 class _callback:
@@ -937,6 +1471,309 @@ class _callback:
       self._reset = True
       self.count = 0
 
+class _callback_batch:
+   """
+   A class to provide batched GPIO level change callbacks.
+   """
+
+   def __init__(self, notify, chip, gpio, edge, func,
+      max_events, max_latency):
+      """
+      Initialise a batched callback and adds it to the notification
+      thread.
+      """
+      self._notify = notify
+      self.chip = chip
+      self.gpio = gpio
+      self.func = func
+      self.max_events = max_events
+      self.max_latency = max_latency
+      self.events = array.array('Q')
+      self.deadline = 0
+      self.callb = _callback_ADT(chip, gpio, edge, self._event)
+      self.callb.inline = True
+      self._notify.append_batch(self)
+      self._notify.append(self.callb)
+
+   def cancel(self):
+      """
+      Cancels a batched callback by removing it from the
+      notification thread.  Pending events are discarded.
+      """
+      self._notify.remove(self.callb)
+      self._notify.remove_batch(self)
+
+   def _event(self, chip, gpio, level, tick):
+      """
+      Adds an event to the batch.
+      """
+      if not self.events:
+         self.deadline = time.time() + self.max_latency
+      self.events.extend((tick, level))
+      if len(self.events) >= (2 * self.max_events):
+         self.flush()
+
+   def flush(self):
+      """
+      Passes the pending events to the user function.
+      """
+      events = self.events
+      self.events = array.array('Q')
+      self._notify.call(
+         (self.chip, self.gpio), self.func, (self.chip, self.gpio, events))
+
+class _batch:
+   """
+   A class to pipeline commands to the rgpiod daemon.
+   """
+
+   def __init__(self, sbc, window):
+      """
+      Initialises a batch.
+      """
+      self._sbc = sbc
+      self._prev = None
+      self.window = window
+      self.cmds = []
+      self.results = []
+
+   def __enter__(self):
+      """
+      Starts queueing the commands issued by the calling thread.
+      """
+      t = self._sbc.sl.t
+      self._prev = getattr(t, "batch", None)
+      t.batch = self
+      return self
+
+   def __exit__(self, exc_type, exc_value, traceback):
+      """
+      Stops queueing and, unless an exception was raised, sends
+      the queued commands.
+      """
+      self._sbc.sl.t.batch = self._prev
+      if exc_type is None:
+         self.flush()
+      else:
+         self.cmds = []
+      return False
+
+   def _reply(self, sl, cmd, start):
+      """
+      Reads the reply to cmd and appends it to results.
+      """
+      stats = sl.stats
+      if stats is not None:
+         sl.t.cmd = struct.unpack_from('H', cmd, 8)[0]
+      status, size = struct.unpack(
+         'II8x', self._sbc._rxbuf(_SOCK_CMD_LEN))
+      if stats is not None:
+         stats.command(
+            sl.t.cmd, len(cmd), 0, time.perf_counter() - start)
+      status = u2i(status)
+      if size:
+         self.results.append([status, self._sbc._rxbuf(size)])
+      else:
+         self.results.append(status)
+
+   def flush(self):
+      """
+      Sends the queued commands and appends their results to
+      results.  The commands are written window at a time.  The
+      replies are read in order, while the window is being written
+      if they arrive, so that neither end blocks when the requests
+      or replies exceed the socket buffers.
+
+      Returns the list of results.
+      """
+      sl = self._sbc.sl
+      cmds = self.cmds
+      self.cmds = []
+      first = len(self.results)
+      with sl.l:
+         for i in range(0, len(cmds), self.window):
+            chunk = cmds[i:i+self.window]
+            start = time.perf_counter()
+            data = memoryview(b"".join(chunk))
+            sent = 0
+            done = 0
+            while sent < len(data):
+               readable, writable, _ = select.select([sl.s], [sl.s], [])
+               if readable and done < len(chunk):
+                  self._reply(sl, chunk[done], start)
+                  done += 1
+               if writable:
+                  sent += sl.s.send(data[sent:sent+_BATCH_SEND])
+            for c in chunk[done:]:
+               self._reply(sl, c, start)
+      if exceptions:
+         for r in self.results[first:]:
+            if type(r) == list:
+               r = r[0]
+            if r < 0:
+               raise error(error_text(r))
+      return self.results
+
+class notify_ring:
+   """
+   A class to read GPIO alerts from a shared memory notification.
+   """
+
+   def __init__(self, handle, directory="."):
+      """
+      Opens the ring and pipe of a shared memory notification.
+
+         handle:= >= 0 (as returned by [*notify_open_ring*]).
+      directory:= the working directory of the rgpiod daemon.
+
+      The ring may only be read on the SBC running the rgpiod
+      daemon.  Only alerts added after the ring is opened are read.
+
+      ...
+      h = sbc.notify_open_ring(65536)
+      ring = rgpio.notify_ring(h, "/home/pi")
+      sbc.gpio_claim_alert(chip, 23, rgpio.BOTH_EDGES, notify_handle=h)
+      while True:
+         for chip, gpio, level, tick in ring.alerts():
+            print(chip, gpio, level, tick)
+      ...
+      """
+      path = os.path.join(directory, ".lgd-nfy{}".format(handle))
+      self._fd = os.open(path, os.O_RDONLY | os.O_NONBLOCK)
+      try:
+         with open(path + ".ring", "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+      except (IOError, OSError, ValueError):
+         os.close(self._fd)
+         raise
+      magic, self.records = struct.unpack_from('II', self._mm, 0)
+      if magic != _RING_MAGIC:
+         self._mm.close()
+         os.close(self._fd)
+         raise error(error_text(BAD_RING_SIZE))
+      self._view = memoryview(self._mm)
+      self.pos = self._count(_RING_HEAD)
+      self._first = self.pos
+      self.overruns = 0
+
+   def _count(self, offset):
+      """
+      Returns the ring header count at offset, the alerts written
+      (head) or being written (reserve).  The count is read until
+      two reads agree as on a 32 bit SBC the daemon may be part way
+      through updating it.
+      """
+      count = struct.unpack_from('Q', self._mm, offset)[0]
+      while True:
+         again = struct.unpack_from('Q', self._mm, offset)[0]
+         if again == count:
+            return count
+         count = again
+
+   def fileno(self):
+      """
+      Returns the file descriptor of the pipe which becomes
+      readable when alerts are added, for use with select.
+      """
+      return self._fd
+
+   def views(self, timeout=None):
+      """
+      Returns a list of memoryviews of the alerts added since the
+      last call.  Each view holds a whole number of 16 byte alerts
+      (see [*notify_open*] for the layout).  There are two views if
+      the alerts wrap around the end of the ring.
+
+      timeout:= the most seconds to wait for an alert if none are
+                waiting.  None waits indefinitely, 0 does not wait.
+
+      The views refer directly to the ring so must be used before
+      the daemon writes another ring's worth of alerts.  Call
+      [*overwritten*] once the views have been used to find how
+      many of their leading alerts may have been overwritten
+      meanwhile.  Alerts which were overwritten before being read
+      are counted in overruns.
+
+      ...
+      for v in ring.views():
+         for tick, chip, gpio, level, flags, pad in (
+            struct.iter_unpack('QBBBBI', v)):
+            print(chip, gpio, level, tick)
+      ...
+      """
+      try:
+         while os.read(self._fd, 4096):
+            pass
+      except OSError:
+         pass # the pipe is empty
+
+      head = self._count(_RING_HEAD)
+      if head == self.pos and timeout != 0:
+         select.select([self._fd], [], [], timeout)
+         head = self._count(_RING_HEAD)
+
+      pos = self.pos
+      if head - pos > self.records:
+         self.overruns += head - pos - self.records
+         pos = head - self.records
+      self.pos = head
+      self._first = pos
+
+      count = head - pos
+      start = pos % self.records
+      first = min(count, self.records - start)
+      views = []
+      if first:
+         base = _RING_HDR_LEN + start * _ALERT.size
+         views.append(self._view[base:base + first * _ALERT.size])
+      if count > first:
+         base = _RING_HDR_LEN
+         views.append(self._view[base:base + (count - first) * _ALERT.size])
+      return views
+
+   def overwritten(self):
+      """
+      Returns how many of the alerts returned by the last call of
+      [*views*] have since been, or are being, overwritten.  They
+      are the first alerts of the views and should be discarded.
+      They are counted in overruns.
+
+      ...
+      views = ring.views()
+      alerts = [a for v in views for a in struct.iter_unpack('QBBBBI', v)]
+      alerts = alerts[ring.overwritten():]
+      ...
+      """
+      lost = min(self._count(_RING_RESERVE) - self.records, self.pos)
+      lost -= self._first
+      if lost <= 0:
+         return 0
+      self._first += lost
+      self.overruns += lost
+      return lost
+
+   def alerts(self, timeout=None):
+      """
+      Returns a list of the alerts added since the last call as
+      (chip, gpio, level, tick) tuples.  Alerts overwritten while
+      being copied are discarded and counted in overruns.
+
+      timeout:= as for [*views*].
+      """
+      alerts = [(chip, gpio, level, tick)
+         for v in self.views(timeout)
+            for tick, chip, gpio, level, flags, pad in _ALERT.iter_unpack(v)]
+      return alerts[self.overwritten():]
+
+   def close(self):
+      """
+      Closes the ring.  Any views returned by [*views*] must have
+      been released.
+      """
+      self._view.release()
+      self._mm.close()
+      os.close(self._fd)
+
 def error_text(errnum):
    """
    Returns a description of an error number.
@@ -969,29 +1806,98 @@ def get_module_version():
       (RGPIO_PY_VERSION>>24)&0xff, (RGPIO_PY_VERSION>>16)&0xff,
       (RGPIO_PY_VERSION>>8)&0xff, RGPIO_PY_VERSION&0xff)
 
+def __getattr__(name):
+   """
+   Imports the asyncio client on first use as rgpio.aio.
+   """
+   if name == "aio":
+      import rgpio_aio
+      return rgpio_aio
+   raise AttributeError(
+      "module 'rgpio' has no attribute '{}'".format(name))
+
 class sbc():
 
    def _rxbuf(self, count):
       """
       Returns count bytes from the command socket.
       """
-      ext = bytearray(self.sl.s.recv(count))
-      while len(ext) < count:
-         ext.extend(self.sl.s.recv(count - len(ext)))
+      ext = bytearray(count)
+      self._rxbuf_into(ext, count)
       return ext
 
+   def _rxbuf_into(self, buf, count):
+      """
+      Receives count bytes from the command socket into the
+      writable buffer buf.  Any bytes which do not fit in buf
+      are read and discarded.
+
+      Returns the number of bytes stored in buf.
+      """
+      sl = self.sl
+      view = memoryview(buf).cast('B')
+      size = min(count, len(view))
+      got = 0
+      while got < size:
+         n = sl.s.recv_into(view[got:size])
+         if n == 0:
+            raise error(error_text(CMD_INTERRUPTED))
+         got += n
+      if sl.stats is not None:
+         sl.stats.received(getattr(sl.t, "cmd", 0), size)
+      if count > size:
+         discard = bytearray(count - size)
+         self._rxbuf_into(discard, count - size)
+      return size
+
    def __repr__(self):
       """
       Returns details of the sbc connection.
       """
+      if self._unix is not None:
+         return "<rgpio.sbc unix={}>".format(self._unix)
       return "<rgpio.sbc host={} port={}>".format(self._host, self._port)
 
+   @property
+   def sl(self):
+      """
+      Returns the command socket used by the calling thread.  Threads
+      are assigned to the command sockets in turn on first use.
+      """
+      if len(self._sls) == 1:
+         return self._sls[0]
+      sl = getattr(self._local, "sl", None)
+      if sl is None:
+         with self._sls_lock:
+            sl = self._sls[self._next_sl % len(self._sls)]
+            self._next_sl += 1
+         self._local.sl = sl
+      return sl
+
+   def _track(self, sl, handle):
+      """
+      Records a handle opened on a command socket which shares
+      the objects it opens so that [*stop*] may release it.
+      """
+      if (self._tracked is not None and handle >= 0 and
+            getattr(sl.t, "batch", None) is None):
+         with self._sls_lock:
+            self._tracked.append((sl, handle & 0xffff))
+      return handle
+
    # ESSENTIAL
 
    def __init__(self,
                 host = os.getenv("LG_ADDR", 'localhost'),
                 port = os.getenv("LG_PORT", 8889),
-                show_errors = True):
+                show_errors = True,
+                callback_workers = 0,
+                callback_queue = 1024,
+                sockets = 1,
+                share_id = None,
+                stats = False,
+                unix = None,
+                notify_latency = None):
       """
       Establishes a connection to the rgpiod daemon running on a SBC.
 
@@ -1002,6 +1908,24 @@ class sbc():
              The default is 8889 unless overridden by the LG_PORT
              environment variable.  The rgpiod daemon must have been
              started with the same port number.
+      callback_workers:= the number of threads used to run
+             callbacks.  The default of 0 runs callbacks on the
+             notification thread.
+      callback_queue:= the most callbacks which may be pending
+             for each worker thread (default 1024).
+      sockets:= the number of command sockets (default 1).
+      share_id:= the share id used by the command sockets if
+             there is more than one.  The default chooses an id.
+      stats:= if True command and callback statistics are
+             recorded (see [*stats*]).  The default is False.
+      unix:= the path of a unix socket on which the rgpiod daemon
+             is listening (see the rgpiod -s option).  If set, host
+             and port are ignored.  A host of the form unix:path
+             may also be used.
+      notify_latency:= the most microseconds the daemon may hold
+             GPIO alerts before sending them, or 0 to send each
+             at once.  The default leaves the daemon to coalesce
+             alerts using the Nagle algorithm.
 
       This connects to the rgpiod daemon and reserves resources
       to be used for sending commands and receiving notifications.
@@ -1023,27 +1947,113 @@ class sbc():
       if not sbc.connected:
          exit()
       ...
+
+      If the rgpiod daemon is on the same SBC a unix socket avoids
+      the cost of the TCP stack on each command.
+
+      ...
+      sbc = rgpio.sbc(unix='/run/rgpiod.sock')
+      ...
+
+      Callbacks are normally run on the thread which reads the
+      notifications, so a slow callback delays the reading.  If
+      alerts arrive faster than they are read the daemon's pipe
+      fills and alerts are lost.
+
+      If callback_workers is set the notification thread instead
+      queues each callback for a worker thread and carries on
+      reading.  All the callbacks for a GPIO are run by the same
+      worker so they are called in order.  If a worker's queue is
+      full the callback is dropped.  The number of dropped
+      callbacks is returned by [*callback_overflows*].
+
+      ...
+      sbc = rgpio.sbc(callback_workers=4)
+      ...
+
+      By default the notification socket uses the Nagle algorithm so
+      that alerts from a remote SBC may be delayed by tens of
+      milliseconds.  Latency sensitive uses such as sonar rangers or
+      encoders should set notify_latency to 0 so that each alert is
+      sent as soon as it is reported.  Loggers may instead set a
+      latency, e.g. 20000, so that the daemon gathers the alerts
+      into fewer, larger writes while bounding how long any alert
+      is held.  The daemon flushes the gathered alerts when the
+      latency expires.
+
+      ...
+      sbc = rgpio.sbc('mypi', notify_latency=0)
+      ...
+
+      Commands are sent on a single socket by default so commands
+      from different threads are sent one at a time.  If sockets is
+      greater than 1 that many command sockets are opened.  Each
+      thread is assigned a socket, in turn, when it first sends a
+      command and uses it from then on.  The rgpiod daemon serves
+      each socket with its own thread, so commands on different
+      sockets, e.g. SPI on one and I2C on another, run concurrently.
+
+      So that a handle opened by one thread may be used by the
+      others the sockets share the objects they open using share_id
+      (see [*set_share_id*] and [*use_share_id*]).  The daemon does
+      not release shared objects when a connection closes.  If
+      share_id is not given [*stop*] stops sharing the handles the
+      sbc opened, other than in a [*batch*], so that they are
+      released.  If the script ends without calling [*stop*], e.g.
+      if it crashes, they stay open until the daemon is restarted.
+      If share_id is given the objects persist and should be closed
+      explicitly.
+
+      ...
+      sbc = rgpio.sbc(sockets=4)
+      ...
       """
       self.connected = True
 
-      self.sl = _socklock()
+      self._sls = [_socklock() for i in range(max(1, sockets))]
+      self._sls_lock = threading.Lock()
+      self._next_sl = 0
+      self._local = threading.local()
       self._notify  = None
+      self._stats = None
+      self._tracked = None # handles to release at stop
+
+      if stats:
+         self._stats = _stats()
+         for sl in self._sls:
+            sl.stats = self._stats
 
       port = int(port)
 
       if host == '':
          host = "localhost"
 
+      if unix is None and host.startswith("unix:"):
+         unix = host[5:]
+
       self._host = host
       self._port = port
+      self._unix = unix
 
       try:
-         self.sl.s = socket.create_connection((host, port), None)
+         for sl in self._sls:
+            sl.s = _lg_connect(host, port, unix)
 
-         # Disable the Nagle algorithm.
-         self.sl.s.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            if unix is None:
+               # Disable the Nagle algorithm.
+               sl.s.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
 
-         self._notify = _callback_thread(self.sl, host, port)
+         if len(self._sls) > 1:
+            if share_id is None:
+               share_id = (os.getpid() << 8 ^ id(self)) & 0x7fffffff or 1
+               self._tracked = []
+            ext = [struct.pack("I", share_id)]
+            for sl in self._sls:
+               _u2i(_lg_command_ext(sl, _CMD_SHARE, 4, ext, L=1))
+
+         self._notify = _callback_thread(
+            self.sl, host, port, callback_workers, callback_queue,
+            self._stats, unix, notify_latency)
 
       except socket.error:
          exception = 1
@@ -1063,12 +2073,17 @@ class sbc():
 
          self.connected = False
 
-         if self.sl.s is not None:
-            self.sl.s = None
+         for sl in self._sls:
+            if sl.s is not None:
+               sl.s.close()
+               sl.s = None
 
          if show_errors:
 
-            s = "Can't connect to rgpiod at {}({})".format(host, str(port))
+            if unix is None:
+               s = "Can't connect to rgpiod at {}({})".format(host, str(port))
+            else:
+               s = "Can't connect to rgpiod at {}".format(unix)
 
 
             print(_except_a.format(s))
@@ -1102,11 +2117,122 @@ class sbc():
          self._notify.stop()
          self._notify = None
 
-      if self.sl.s is not None:
-         # Free all resources allocated to this connection
-         _lg_command(self.sl, _CMD_FREE)
-         self.sl.s.close()
-         self.sl.s = None
+      if self._tracked:
+         # Stop sharing so that the objects are freed below
+         for sl, handle in self._tracked:
+            if sl.s is not None:
+               ext = [struct.pack("II", handle, 0)]
+               _lg_command_ext(sl, _CMD_SHRS, 8, ext, L=2)
+         self._tracked = []
+
+      for sl in self._sls:
+         if sl.s is not None:
+            # Free all resources allocated to this connection
+            _lg_command(sl, _CMD_FREE)
+            sl.s.close()
+            sl.s = None
+
+   def batch(self, window=1024):
+      """
+      Returns a context manager which pipelines commands to the
+      rgpiod daemon.
+
+      window:= the maximum number of commands written before
+               waiting for their replies.
+
+      Commands issued by the calling thread within the with block
+      are queued rather than sent.  On leaving the block the queued
+      commands are written to the daemon and the replies are read
+      back in order.  This replaces a network round trip per command
+      with one per window of commands.
+
+      The values returned by the individual calls within the block
+      are placeholders (0).  The results are held in the results
+      attribute of the context manager.  A result is the status for
+      a command which returns no data, otherwise a list of the
+      status and a bytearray containing the data.
+
+      If exceptions are enabled an exception is raised after all
+      the replies have been read if any command failed.
+
+      Only queue commands whose results are not needed by later
+      commands in the same batch.
+
+      ...
+      with sbc.batch() as b:
+         for i in range(1000):
+            sbc.gpio_write(h, OUT, 0)
+            sbc.gpio_write(h, OUT, 1)
+      print(len(b.results))
+      2000
+      ...
+      """
+      return _batch(self, window)
+
+   def stats(self):
+      """
+      Returns a snapshot of the statistics recorded since the sbc
+      was created or [*stats_reset*] was last called, or None if
+      the sbc was not created with stats=True.
+
+      The snapshot is a dictionary with the following entries.
+
+      elapsed:= the seconds covered by the statistics.
+      commands:= a dictionary keyed by command number of
+                 dictionaries with the following entries.
+
+         count:= the number of commands sent.
+         bytes_sent:= the bytes sent, including the header.
+         bytes_received:= the bytes received, including the header.
+         latency_total:= the total seconds from sending each
+                         command to receiving its reply header.
+         latency_max:= the longest of those latencies.
+         latency_histogram:= a list of counts.  Entry n counts the
+                         latencies of less than 2**n microseconds
+                         not counted by entry n-1.  The last entry
+                         counts all longer latencies.
+
+      callbacks:= a dictionary with the following entries.
+
+         alerts:= the number of alerts received.
+         alerts_per_sec:= the alerts received per second.
+         dispatch_time:= the total seconds spent dispatching alerts.
+         dispatch_max:= the longest time spent dispatching one
+                        block of alerts.
+         queue_depth:= the number of callbacks waiting for a worker
+                       thread (see callback_workers).
+         overflows:= the callbacks dropped as a worker thread's
+                     queue was full since the sbc was created.
+
+      Commands sent in a [*batch*] are timed from when their batch
+      is sent.
+
+      ...
+      sbc = rgpio.sbc(stats=True)
+      ...
+      st = sbc.stats()
+      for cmd, c in st["commands"].items():
+         print(cmd, c["count"], c["latency_total"] / c["count"])
+      print(st["callbacks"]["alerts_per_sec"])
+      ...
+      """
+      if self._stats is None:
+         return None
+      pool = None
+      if self._notify is not None:
+         pool = self._notify.pool
+      return self._stats.snapshot(pool)
+
+   def stats_reset(self):
+      """
+      Clears the statistics returned by [*stats*].
+
+      ...
+      sbc.stats_reset()
+      ...
+      """
+      if self._stats is not None:
+         self._stats.reset()
 
    # FILES
 
@@ -1169,8 +2295,9 @@ class sbc():
       ...
       """
       ext = [struct.pack("I", file_mode)] + [file_name]
-      return _u2i(_lg_command_ext(
-         self.sl, _CMD_FO, 4+len(file_name), ext, L=1))
+      sl = self.sl
+      return self._track(sl, _u2i(_lg_command_ext(
+         sl, _CMD_FO, 4+len(file_name), ext, L=1)))
 
    def file_close(self, handle):
       """
@@ -1218,6 +2345,40 @@ class sbc():
             rdata = self._rxbuf(bytes)
       return _u2i_list([bytes, rdata])
 
+   def file_read_into(self, handle, buffer, count=None):
+      """
+      Reads up to count bytes from the file into a buffer.
+
+      handle:= >= 0 (as returned by [*file_open*]).
+      buffer:= a writable buffer, e.g. a bytearray or memoryview.
+       count:= >0, the number of bytes to read, defaults to the
+               buffer size.
+
+      If OK returns the number of bytes read.
+
+      On failure returns a negative error code.
+
+      No memory is allocated for the data, which is received
+      directly into the buffer.
+
+      ...
+      buf = bytearray(100)
+      b = sbc.file_read_into(h2, buf)
+      if b > 0:
+         # process buf[:b]
+      ...
+      """
+      if count is None:
+         count = memoryview(buffer).nbytes
+      bytes = CMD_INTERRUPTED
+      ext = [struct.pack("II", handle, count)]
+      with self.sl.l:
+         bytes = u2i(
+            _lg_command_ext_nolock(self.sl, _CMD_FR, 8, ext, L=2))
+         if bytes > 0:
+            bytes = self._rxbuf_into(buffer, bytes)
+      return _u2i(bytes)
+
    def file_write(self, handle, data):
       """
       Writes the data bytes to the file.
@@ -1331,7 +2492,8 @@ class sbc():
       ...
       """
       ext = [struct.pack("I", gpiochip)]
-      handle = u2i(_lg_command_ext(self.sl, _CMD_GO, 4, ext, L=1))
+      sl = self.sl
+      handle = self._track(sl, u2i(_lg_command_ext(sl, _CMD_GO, 4, ext, L=1)))
       if handle >= 0:
          handle = handle | (gpiochip << 16)
 
@@ -1884,7 +3046,9 @@ class sbc():
 
       This command starts a wave of pulses.
 
-      pulses is an array of pulses to be transmitted on the group.
+      pulses is a [*wave*], or a list of [*pulse*], to be transmitted
+      on the group.  A buffer of packed pulses, three unsigned 64 bit
+      integers per pulse, is also accepted.
 
       Each pulse is defined by the following triplet:
 
@@ -1899,14 +3063,11 @@ class sbc():
       Multiple waves may be queued in this way.
 
       """
-      if len(pulses):
-         q = 3 * len(pulses)
+      ext1 = _wavebuf(pulses)
+      if len(ext1):
+         q = memoryview(ext1).nbytes // 8
          l = 2
          size = (q*8) + (l*4)
-         ext1 = bytearray()
-         for p in pulses:
-            ext1.extend(struct.pack(
-               "QQQ", p.group_bits, p.group_mask, p.pulse_delay))
          ext2 = struct.pack("II", handle&0xffff, gpio)
          ext = [ext1, ext2]
          return _u2i(_lg_command_ext(self.sl, _CMD_GWAVE, size, ext, Q=q, L=l))
@@ -1948,6 +3109,45 @@ class sbc():
       ext = [struct.pack("III", handle&0xffff, gpio, kind)]
       return _u2i(_lg_command_ext(self.sl, _CMD_GROOM, 12, ext, L=3))
 
+   def tx_jitter(self, handle, gpio, kind=TX_PWM):
+      """
+      This returns the timing statistics of the transmissions of the
+      specified kind on a GPIO or group.
+
+      handle:= >= 0 (as returned by [*gpiochip_open*]).
+        gpio:= the GPIO or group to be checked.
+        kind:= TX_PWM or TX_WAVE (default TX_PWM).
+
+      If OK returns a list of okay status, the number of edges
+      output, and the sum, maximum, and last of the edge lateness
+      in nanoseconds.
+
+      The lateness is how long after its scheduled time each edge
+      was output.  The statistics are reset whenever a new
+      transmission is started on the GPIO or group.  Zeros are
+      returned if there is no transmission.
+
+      On failure returns a negative error code.
+
+      ...
+      status, edges, late_sum, late_max, late_last = sbc.tx_jitter(h, 5)
+      if edges:
+         print("mean {} ns, max {} ns".format(late_sum // edges, late_max))
+      ...
+      """
+      bytes = CMD_INTERRUPTED
+      ext = [struct.pack("III", handle&0xffff, gpio, kind)]
+      edges, late_sum, late_max, late_last = 0, 0, 0, 0
+      with self.sl.l:
+         bytes = u2i(
+            _lg_command_ext_nolock(self.sl, _CMD_GJIT, 12, ext, L=3))
+         if bytes > 0:
+            rdata = self._rxbuf(bytes)
+            edges, late_sum, late_max, late_last = struct.unpack(
+               "QQQQ", rdata)
+            bytes = OKAY
+      return _u2i_list([bytes, edges, late_sum, late_max, late_last])
+
    def gpio_set_debounce_micros(self, handle, gpio, debounce_micros):
       """
       This sets the debounce time for a GPIO.
@@ -1976,6 +3176,9 @@ class sbc():
       Note that level changes will be timestamped debounce microseconds
       after the actual level change.
 
+      The debounce is done by the kernel if it is able, otherwise
+      by the daemon.
+
       """
       ext = [struct.pack("III", handle&0xffff, gpio, debounce_micros)]
       return _u2i(_lg_command_ext(self.sl, _CMD_GDEB, 12, ext, L=3))
@@ -2007,9 +3210,85 @@ class sbc():
       ext = [struct.pack("III", handle&0xffff, gpio, watchdog_micros)]
       return _u2i(_lg_command_ext(self.sl, _CMD_GWDOG, 12, ext, L=3))
 
+   def gpio_set_event_buffer(self, handle, gpio, event_buffer):
+      """
+      This sets the number of edges the kernel queues for a GPIO.
+
+            handle:= >= 0 (as returned by [*gpiochip_open*]).
+              gpio:= the GPIO to be configured.
+      event_buffer:= 0-1024, the number of edges, 0 for the kernel
+                     default.
+
+      If OK returns 0.
+
+      On failure returns a negative error code.
+
+      This only affects alerts and takes effect when the GPIO is
+      next claimed by [*gpio_claim_alert*].
+
+      The kernel discards new edges once its queue is full.  The
+      default queue of 16 edges may overflow if bursts of edges
+      arrive while the daemon is delayed.
+
+      ...
+      sbc.gpio_set_event_buffer(h, 17, 1024)
+      sbc.gpio_claim_alert(h, 17, rgpio.BOTH_EDGES)
+      ...
+      """
+      ext = [struct.pack("III", handle&0xffff, gpio, event_buffer)]
+      return _u2i(_lg_command_ext(self.sl, _CMD_GEVB, 12, ext, L=3))
+
+   def gpio_get_edge_stats(self, handle, gpio):
+      """
+      This returns the edge counts and timings of a GPIO claimed for
+      alerts.
+
+      handle:= >= 0 (as returned by [*gpiochip_open*]).
+        gpio:= the GPIO to be checked.
+
+      If OK returns a list of okay status, the number of rising edges,
+      the number of falling edges, the number of edges discarded by
+      the kernel, the last period, the last high time, the rolling
+      averages of the period and high time, and the timestamp of the
+      last edge.  Times are in nanoseconds.
+
+      On failure returns a negative error code.
+
+      The statistics are kept by the daemon for every edge so the
+      frequency and duty cycle of an input may be read without
+      receiving each edge in a callback.  The period is measured
+      between rising edges so both edges should be monitored for the
+      high time.  Zeros are returned if the GPIO is not claimed for
+      alerts.
+
+      Edges filtered by kernel debounce, the default where supported
+      (see [*gpio_set_debounce_micros*]), are not counted.  Set a
+      debounce of 0 to count every edge.
+
+      ...
+      s, rise, fall, lost, per, high, per_avg, high_avg, ts = (
+         sbc.gpio_get_edge_stats(h, 17))
+      if per_avg:
+         print("{:.1f} Hz {:.1f}% duty".format(
+            1e9 / per_avg, 100.0 * high_avg / per_avg))
+      ...
+      """
+      bytes = CMD_INTERRUPTED
+      ext = [struct.pack("II", handle&0xffff, gpio)]
+      stats = [0] * 8
+      with self.sl.l:
+         bytes = u2i(
+            _lg_command_ext_nolock(self.sl, _CMD_GES, 8, ext, L=2))
+         if bytes > 0:
+            rdata = self._rxbuf(bytes)
+            stats = list(struct.unpack("QQQQQQQQ", rdata))
+            bytes = OKAY
+      return _u2i_list([bytes] + stats)
+
 
    def gpio_claim_alert(
-      self, handle, gpio, eFlags, lFlags=0, notify_handle=None):
+      self, handle, gpio, eFlags, lFlags=0, notify_handle=None,
+      event_buffer=None):
       """
       This claims a GPIO to be used as a source of alerts on level changes.
 
@@ -2018,6 +3297,9 @@ class sbc():
               eFlags:= event flags for the GPIO.
               lFlags:= line flags for the GPIO.
       notifiy_handle: >=0 (as returned by [*notify_open*]).
+        event_buffer:= the kernel event buffer size, see
+                       [*gpio_set_event_buffer*] (default None,
+                       unchanged).
 
       If OK returns 0.
 
@@ -2034,6 +3316,10 @@ class sbc():
       to read the alerts from a notification pipe you have opened.
 
       """
+      if event_buffer is not None:
+         status = self.gpio_set_event_buffer(handle, gpio, event_buffer)
+         if status < 0:
+            return status
       if notify_handle is None:
          notify_handle = self._notify.handle
       ext = [struct.pack(
@@ -2057,6 +3343,9 @@ class sbc():
       The user supplied callback receives four parameters, the chip,
       the GPIO, the level, and the timestamp.
 
+      Only edges matching edge are passed to the callback.  Watchdog
+      timeouts are passed to every callback for the GPIO.
+
       The reported level will be one of
 
       0: change to low (a falling edge) 
@@ -2074,6 +3363,9 @@ class sbc():
       be reset to zero by calling the callback instance's reset_tally()
       method.
 
+      [*gpio_get_edge_stats*] counts edges in the daemon without
+      passing them to a callback.
+
       The callback may be cancelled by calling the callback
       instance's cancel() method.
 
@@ -2105,6 +3397,66 @@ class sbc():
       """
       return _callback(self._notify, handle>>16, gpio, edge, func)
 
+   def callback_batch(self, handle, gpio, func,
+      max_events=256, max_latency=0.05, edge=BOTH_EDGES):
+      """
+      Calls a user supplied function (a callback) with blocks of
+      the edges detected on the specified GPIO.
+
+           handle:= >= 0 (as returned by [*gpiochip_open*]).
+             gpio:= >= 0, as legal for the gpiochip.
+             func:= user supplied callback function.
+       max_events:= >0, the most events passed in one call
+                    (default 256).
+      max_latency:= the most seconds an event is held before
+                    being passed (default 0.05).
+             edge:= BOTH_EDGES (default), RISING_EDGE, or
+                    FALLING_EDGE.
+
+      Returns a callback instance.
+
+      The user supplied callback receives three parameters, the
+      chip, the GPIO, and an array('Q') of events.  Each event
+      is a timestamp followed by a level, so the timestamps are
+      events[0::2] and the levels are events[1::2].  The levels
+      and timestamps are as described for [*callback*].
+
+      The callback is called when max_events events are pending,
+      or when the oldest pending event has waited max_latency
+      seconds.  One Python call per block rather than per edge
+      suits decoding fast signals such as DHT22 or IR remotes.
+
+      The callback may be cancelled by calling the callback
+      instance's cancel() method.  Pending events are discarded.
+
+      ...
+      def cbf(chip, gpio, events):
+         ticks = events[0::2]
+         levels = events[1::2]
+         print(chip, gpio, len(ticks))
+
+      cb1 = sbc.callback_batch(h, 22, cbf, max_events=1000)
+
+      cb1.cancel() # To cancel callback cb1.
+      ...
+      """
+      return _callback_batch(self._notify, handle>>16, gpio, edge, func,
+         max_events, max_latency)
+
+   def callback_overflows(self):
+      """
+      Returns the number of callbacks dropped because a worker
+      thread's queue was full.  This is always 0 unless the sbc
+      was created with callback_workers.
+
+      ...
+      print(sbc.callback_overflows())
+      ...
+      """
+      if self._notify is None or self._notify.pool is None:
+         return 0
+      return self._notify.pool.overflows
+
 
    # I2C
 
@@ -2144,7 +3496,9 @@ class sbc():
       ...
       """
       ext = [struct.pack("III", i2c_bus, i2c_address, i2c_flags)]
-      return _u2i(_lg_command_ext(self.sl, _CMD_I2CO, 12, ext, L=3))
+      sl = self.sl
+      return self._track(
+         sl, _u2i(_lg_command_ext(sl, _CMD_I2CO, 12, ext, L=3)))
 
    def i2c_close(self, handle):
       """
@@ -2585,6 +3939,39 @@ class sbc():
             rdata = self._rxbuf(bytes)
       return _u2i_list([bytes, rdata])
 
+   def i2c_read_device_into(self, handle, buffer, count=None):
+      """
+      Reads count bytes from the raw device associated
+      with handle into a buffer.
+
+      handle:= >= 0 (as returned by [*i2c_open*]).
+      buffer:= a writable buffer, e.g. a bytearray or memoryview.
+       count:= >0, the number of bytes to read, defaults to the
+               buffer size.
+
+      If OK returns the number of bytes read.
+
+      On failure returns a negative error code.
+
+      No memory is allocated for the data, which is received
+      directly into the buffer.
+
+      ...
+      buf = bytearray(12)
+      count = sbc.i2c_read_device_into(h, buf)
+      ...
+      """
+      if count is None:
+         count = memoryview(buffer).nbytes
+      bytes = CMD_INTERRUPTED
+      ext = [struct.pack("II", handle, count)]
+      with self.sl.l:
+         bytes = u2i(
+            _lg_command_ext_nolock(self.sl, _CMD_I2CRD, 8, ext, L=2))
+         if bytes > 0:
+            bytes = self._rxbuf_into(buffer, bytes)
+      return _u2i(bytes)
+
    def i2c_write_device(self, handle, data):
       """
       Writes the data bytes to the raw device.
@@ -2735,7 +4122,39 @@ class sbc():
          sbc.notify_resume(h)
       ...
       """
-      return _u2i(_lg_command(self.sl, _CMD_NO))
+      sl = self.sl
+      return self._track(sl, _u2i(_lg_command(sl, _CMD_NO)))
+
+   def notify_open_ring(self, records=4096):
+      """
+      Opens a shared memory notification.
+
+      This is a privileged command. See [+Permits+].
+
+      records:= the number of alerts held by the ring, a power of
+                2 from 64 to 1048576 (default 4096).
+
+      If OK returns a handle (>= 0).
+
+      On failure returns a negative error code.
+
+      The alerts are written to a ring in memory shared with the
+      readers rather than being copied through a pipe.  This suits
+      alert rates of hundreds of kHz.  Use [*notify_ring*] to read
+      the ring.
+
+      The ring for handle x is the file .lgd-nfyx.ring in the
+      rgpiod daemon's working directory.  It may only be read on
+      the SBC running the daemon.
+
+      ...
+      h = sbc.notify_open_ring(65536)
+      ...
+      """
+      ext = [struct.pack("I", records)]
+      sl = self.sl
+      return self._track(
+         sl, _u2i(_lg_command_ext(sl, _CMD_NOR, 4, ext, L=1)))
 
    def notify_pause(self, handle):
       """
@@ -2805,6 +4224,40 @@ class sbc():
       ext = [struct.pack("I", handle)]
       return _u2i(_lg_command_ext(self.sl, _CMD_NC, 4, ext, L=1))
 
+   def notify_stats(self, handle):
+      """
+      This returns the delivery statistics of a notification.
+
+      handle:= >= 0 (as returned by [*notify_open*])
+
+      If OK returns a list of okay status, the number of reports
+      delivered, the number of reports dropped, the number of complete
+      writes, the number of writes cut short, and the number of writes
+      refused because the pipe or socket was full.
+
+      Reports are dropped if the reader does not keep up.  For a shared
+      memory notification only the reports delivered and the writes are
+      counted.
+
+      On failure returns a negative error code.
+
+      ...
+      status, reports, dropped, writes, short, full = sbc.notify_stats(h)
+      if dropped:
+         print("{} alerts lost".format(dropped))
+      ...
+      """
+      bytes = CMD_INTERRUPTED
+      ext = [struct.pack("I", handle)]
+      stats = [0, 0, 0, 0, 0]
+      with self.sl.l:
+         bytes = u2i(
+            _lg_command_ext_nolock(self.sl, _CMD_NS, 4, ext, L=1))
+         if bytes > 0:
+            stats = list(struct.unpack("QQQQQ", self._rxbuf(bytes)))
+            bytes = OKAY
+      return _u2i_list([bytes] + stats)
+
    # SCRIPTS
 
    def script_store(self, script):
@@ -2825,8 +4278,9 @@ class sbc():
       ...
       """
       if len(script):
-         return _u2i(_lg_command_ext(
-            self.sl, _CMD_PROC, len(script)+1, [script+'\0']))
+         sl = self.sl
+         return self._track(sl, _u2i(_lg_command_ext(
+            sl, _CMD_PROC, len(script)+1, [script+'\0'])))
       else:
          return 0
 
@@ -2991,7 +4445,9 @@ class sbc():
       ...
       """
       ext = [struct.pack("II", baud, ser_flags)] + [tty]
-      return _u2i(_lg_command_ext(self.sl, _CMD_SERO, 8+len(tty), ext, L=2))
+      sl = self.sl
+      return self._track(
+         sl, _u2i(_lg_command_ext(sl, _CMD_SERO, 8+len(tty), ext, L=2)))
 
    def serial_close(self, handle):
       """
@@ -3079,6 +4535,42 @@ class sbc():
             rdata = self._rxbuf(bytes)
       return _u2i_list([bytes, rdata])
 
+   def serial_read_into(self, handle, buffer, count=None):
+      """
+      Reads up to count bytes from the device into a buffer.
+
+      handle:= >= 0 (as returned by [*serial_open*]).
+      buffer:= a writable buffer, e.g. a bytearray or memoryview.
+       count:= >0, the number of bytes to read, defaults to the
+               buffer size.
+
+      If OK returns the number of bytes read.
+
+      On failure returns a negative error code.
+
+      If no data is ready zero is returned.
+
+      No memory is allocated for the data, which is received
+      directly into the buffer.
+
+      ...
+      buf = bytearray(100)
+      b = sbc.serial_read_into(h2, buf)
+      if b > 0:
+         # process buf[:b]
+      ...
+      """
+      if count is None:
+         count = memoryview(buffer).nbytes
+      bytes = CMD_INTERRUPTED
+      ext = [struct.pack("II", handle, count)]
+      with self.sl.l:
+         bytes = u2i(
+            _lg_command_ext_nolock(self.sl, _CMD_SERR, 8, ext, L=2))
+         if bytes > 0:
+            bytes = self._rxbuf_into(buffer, bytes)
+      return _u2i(bytes)
+
    def serial_write(self, handle, data):
       """
       Writes the data bytes to the device.
@@ -3220,7 +4712,9 @@ class sbc():
       ...
       """
       ext = [struct.pack("IIII", spi_device, spi_channel, baud, spi_flags)]
-      return _u2i(_lg_command_ext(self.sl, _CMD_SPIO, 16, ext, L=4))
+      sl = self.sl
+      return self._track(
+         sl, _u2i(_lg_command_ext(sl, _CMD_SPIO, 16, ext, L=4)))
 
    def spi_close(self, handle):
       """
@@ -3269,6 +4763,37 @@ class sbc():
             rdata = self._rxbuf(bytes)
       return _u2i_list([bytes, rdata])
 
+   def spi_read_into(self, handle, buffer, count=None):
+      """
+      Reads count bytes from the SPI device into a buffer.
+
+      handle:= >= 0 (as returned by [*spi_open*]).
+      buffer:= a writable buffer, e.g. a bytearray or memoryview.
+       count:= >0, the number of bytes to read, defaults to the
+               buffer size.
+
+      If OK returns the number of bytes read.
+
+      On failure returns a negative error code.
+
+      No memory is allocated for the data, which is received
+      directly into the buffer.
+
+      ...
+      buf = bytearray(60)
+      b = sbc.spi_read_into(h, buf) # read 60 bytes from handle h
+      ...
+      """
+      if count is None:
+         count = memoryview(buffer).nbytes
+      bytes = CMD_INTERRUPTED
+      ext = [struct.pack("II", handle, count)]
+      with self.sl.l:
+         bytes = u2i(_lg_command_ext_nolock(self.sl, _CMD_SPIR, 8, ext, L=2))
+         if bytes > 0:
+            bytes = self._rxbuf_into(buffer, bytes)
+      return _u2i(bytes)
+
    def spi_write(self, handle, data):
       """
       Writes the data bytes to the SPI device.
@@ -3338,6 +4863,38 @@ class sbc():
             rdata = self._rxbuf(bytes)
       return _u2i_list([bytes, rdata])
 
+   def spi_xfer_into(self, handle, data, buffer):
+      """
+      Writes the data bytes to the SPI device, storing the
+      data bytes read from the device in a buffer.
+
+      handle:= >= 0 (as returned by [*spi_open*]).
+        data:= the bytes to write.
+      buffer:= a writable buffer, e.g. a bytearray or memoryview,
+               at least as large as data.
+
+      If OK returns the number of bytes read.
+
+      On failure returns a negative error code.
+
+      No memory is allocated for the read data, which is received
+      directly into the buffer.  This suits high rate sampling
+      where the same buffer may be reused for each transfer.
+
+      ...
+      rx = bytearray(3)
+      count = sbc.spi_xfer_into(h, b'\\x01\\x80\\x00', rx)
+      ...
+      """
+      bytes = CMD_INTERRUPTED
+      ext = [struct.pack("I", handle)] + [data]
+      with self.sl.l:
+         bytes = u2i(_lg_command_ext_nolock(
+            self.sl, _CMD_SPIX, 4+len(data), ext, L=1))
+         if bytes > 0:
+            bytes = self._rxbuf_into(buffer, bytes)
+      return _u2i(bytes)
+
 
    # UTILITIES
 
@@ -3406,27 +4963,41 @@ class sbc():
 
       bytes = CMD_INTERRUPTED
 
-      with self.sl.l:
+      # Each command socket is logged in.  The calling thread is
+      # pinned to each socket in turn so that _rxbuf reads from it.
 
-         salt1 = "{:015x}".format((int(time.time()*1e7))&0xfffffffffffffff)
-         ext = salt1 + '.' + user
-         bytes = u2i(_lg_command_ext_nolock(
-            self.sl, _CMD_USER, len(ext), [ext]))
+      pinned = getattr(self._local, "sl", None)
+
+      try:
+         for sl in self._sls:
+
+            self._local.sl = sl
+
+            with sl.l:
+
+               salt1 = "{:015x}".format(
+                  (int(time.time()*1e7))&0xfffffffffffffff)
+               ext = salt1 + '.' + user
+               bytes = u2i(_lg_command_ext_nolock(
+                  sl, _CMD_USER, len(ext), [ext]))
+
+               if bytes < 0:
+                  return bytes
 
-         if bytes < 0:
-            return bytes
+               salt1 = bytearray(salt1.encode('utf-8'))
+               salt2 = self._rxbuf(bytes)[:15]
 
-         salt1 = bytearray(salt1.encode('utf-8'))
-         salt2 = self._rxbuf(bytes)[:15]
+               pwd=""
 
-         pwd=""
+               h = hashlib.md5()
+               h.update(salt1 + secret + salt2)
+               pwd = h.hexdigest()
 
-         h = hashlib.md5()
-         h.update(salt1 + secret + salt2)
-         pwd = h.hexdigest()
+               res = u2i(_lg_command_ext_nolock(
+                  sl, _CMD_PASSW, len(pwd), [pwd]))
 
-         res = u2i(_lg_command_ext_nolock(
-            self.sl, _CMD_PASSW, len(pwd), [pwd]))
+      finally:
+         self._local.sl = pinned
 
       return res
 
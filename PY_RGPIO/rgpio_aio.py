@@ -0,0 +1,940 @@
+"""
+[http://abyz.me.uk/lg/py_rgpio.html]
+
+rgpio_aio is an asyncio client for the rgpiod daemon.  It is also
+available as rgpio.aio.
+
+It provides an sbc class with the same methods as rgpio.sbc.  The
+methods are coroutines.  Many requests may be in flight at once on
+the one connection, so a single event loop may drive any number
+of SBCs without a thread per SBC.
+
+GPIO alerts are delivered through asynchronous iterators rather
+than callback threads.
+
+...
+import asyncio
+import rgpio
+
+async def main():
+   async with rgpio.aio.sbc('tom') as sbc:
+      h = await sbc.gpiochip_open(0)
+      await sbc.gpio_claim_alert(h, 17, rgpio.BOTH_EDGES)
+      async for chip, gpio, level, tick in sbc.alerts(h, 17):
+         print(chip, gpio, level, tick)
+
+asyncio.run(main())
+...
+
+Errors are reported in the same way as by rgpio.  If rgpio.exceptions
+is True (the default) a failing command raises rgpio.error.
+
+The methods are documented in the rgpio module.  Only the
+differences are described here.
+"""
+
+import asyncio
+import collections
+import hashlib
+import os
+import socket
+import struct
+import time
+
+import rgpio
+
+from rgpio import error, error_text, u2i, pulse, _b, _str, _u2i, _u2i_list
+from rgpio import _wavebuf
+
+# Re-export the rgpio constants and command numbers.
+
+for _name in dir(rgpio):
+   if _name.isupper():
+      globals()[_name] = getattr(rgpio, _name)
+del _name
+
+# the edges which receive an alert, indexed by alert level
+
+_LEVEL_EDGE = (FALLING_EDGE, RISING_EDGE, BOTH_EDGES)
+
+class _alerts:
+   """
+   An asynchronous iterator of GPIO alerts.
+   """
+
+   def __init__(self, notify, chip, gpio, edge):
+      """
+      Initialises an alert iterator and adds it to the notifier.
+      """
+      self._notify = notify
+      self.chip = chip
+      self.gpio = gpio
+      self.edge = edge
+      self.queue = asyncio.Queue()
+      self._notify.append(self)
+
+   def cancel(self):
+      """
+      Stops the alerts.  The iteration ends once any queued
+      alerts have been returned.
+      """
+      if self._notify is not None:
+         self._notify.remove(self)
+         self._notify = None
+         self.queue.put_nowait(None)
+
+   def __aiter__(self):
+      return self
+
+   async def __anext__(self):
+      alert = await self.queue.get()
+      if alert is None:
+         raise StopAsyncIteration
+      return alert
+
+   async def __aenter__(self):
+      return self
+
+   async def __aexit__(self, exc_type, exc_value, traceback):
+      self.cancel()
+      return False
+
+async def _open(host, port, unix):
+   """
+   Returns a reader and writer connected to the rgpiod daemon, on
+   the unix socket path unix if set, otherwise on host and port.
+   """
+   if unix is None:
+      return await asyncio.open_connection(host, port)
+   return await asyncio.open_unix_connection(unix)
+
+class _notifier:
+   """
+   A class to read GPIO alerts from a notification connection.
+   """
+
+   def __init__(self):
+      """
+      Initialises a notifier.
+      """
+      self.handle = None
+      self.alerts = []
+      self._reader = None
+      self._writer = None
+      self._task = None
+
+   async def start(self, host, port, unix=None, latency=None):
+      """
+      Opens the notification connection.
+      """
+      self._reader, self._writer = await _open(host, port, unix)
+      if latency is None:
+         self._writer.write(
+            struct.pack('IIHHHH', MAGIC, 0, _CMD_NOIB, 0, 0, 0))
+      else:
+         self._writer.write(
+            struct.pack('IIHHHHI', MAGIC, 4, _CMD_NOIB, 0, 1, 0, latency))
+      status, dummy = struct.unpack(
+         'I12s', await self._reader.readexactly(_SOCK_CMD_LEN))
+      self.handle = _u2i(status)
+      self._task = asyncio.ensure_future(self._run())
+
+   def stop(self):
+      """
+      Closes the notification connection and ends all iterators.
+      """
+      if self._task is not None:
+         self._task.cancel()
+         self._task = None
+      if self._writer is not None:
+         self._writer.close()
+         self._writer = None
+      for a in list(self.alerts):
+         a.cancel()
+
+   def append(self, alert):
+      """
+      Adds an alert iterator.
+      """
+      self.alerts.append(alert)
+
+   def remove(self, alert):
+      """
+      Removes an alert iterator.
+      """
+      if alert in self.alerts:
+         self.alerts.remove(alert)
+
+   async def _run(self):
+      """
+      Reads alerts and queues them to the matching iterators.
+      """
+      MSG_SIZ = 16
+      try:
+         while True:
+            buf = await self._reader.read(4096)
+            if not buf:
+               break
+            while len(buf) % MSG_SIZ:
+               buf += await self._reader.readexactly(MSG_SIZ - len(buf) % MSG_SIZ)
+            for tick, chip, gpio, level, flags, pad in (
+               struct.iter_unpack('QBBBBI', buf)):
+               if flags == 0:
+                  edge = _LEVEL_EDGE[level]
+                  for a in self.alerts:
+                     if a.chip == chip and a.gpio == gpio and a.edge & edge:
+                        a.queue.put_nowait((chip, gpio, level, tick))
+      except (asyncio.IncompleteReadError, ConnectionError):
+         pass
+      for a in list(self.alerts):
+         a.cancel()
+
+class sbc():
+
+   def __init__(self,
+                host = os.getenv("LG_ADDR", 'localhost'),
+                port = os.getenv("LG_PORT", 8889),
+                show_errors = True,
+                unix = None,
+                notify_latency = None):
+      """
+      Creates an asyncio connection to the rgpiod daemon running on
+      a SBC.  The parameters are as for rgpio.sbc.
+
+      The connection is made by [*connect*] or by using the sbc as
+      an asynchronous context manager.
+
+      ...
+      sbc = rgpio.aio.sbc('mypi')
+      await sbc.connect()
+      if not sbc.connected:
+         exit()
+      ...
+      """
+      if host == '':
+         host = "localhost"
+
+      if unix is None and host.startswith("unix:"):
+         unix = host[5:]
+
+      self._host = host
+      self._port = int(port)
+      self._unix = unix
+      self._notify_latency = notify_latency
+      self._show_errors = show_errors
+
+      self.connected = False
+
+      self._reader = None
+      self._writer = None
+      self._task = None
+      self._pending = collections.deque()
+      self._failed = None # why the reader stopped
+      self._drain = None
+      self._notify = None
+
+   def __repr__(self):
+      """
+      Returns details of the sbc connection.
+      """
+      if self._unix is not None:
+         return "<rgpio.aio.sbc unix={}>".format(self._unix)
+      return "<rgpio.aio.sbc host={} port={}>".format(self._host, self._port)
+
+   async def __aenter__(self):
+      await self.connect()
+      return self
+
+   async def __aexit__(self, exc_type, exc_value, traceback):
+      await self.stop()
+      return False
+
+   async def _recv(self):
+      """
+      Reads the replies and passes each to the oldest waiting
+      request.
+      """
+      exc = error(error_text(CMD_INTERRUPTED))
+      try:
+         while True:
+            status, size = struct.unpack(
+               'II8x', await self._reader.readexactly(_SOCK_CMD_LEN))
+            if size:
+               data = bytearray(await self._reader.readexactly(size))
+            else:
+               data = ""
+            if not self._pending:
+               continue # no request waiting, e.g. a cancelled command
+            fut = self._pending.popleft()
+            if not fut.done():
+               fut.set_result([u2i(status), data])
+      except Exception as e:
+         exc = e # e.g. asyncio.IncompleteReadError, ConnectionError
+      finally:
+         self._failed = exc
+         while self._pending:
+            fut = self._pending.popleft()
+            if not fut.done():
+               fut.set_exception(exc)
+
+   async def _command(self, cmd, p3=0, extents=[], Q=0, L=0, H=0):
+      """
+      Sends a command and returns a list of the status and any
+      returned data.
+
+      The request is written immediately so that the replies,
+      which rgpiod returns in order, match the pending requests.
+      """
+      ext = bytearray(struct.pack('IIHHHH', MAGIC, p3, cmd, Q, L, H))
+      for x in extents:
+         if type(x) == type(""):
+            ext.extend(_b(x))
+         else:
+            ext.extend(x)
+      if self._writer is None:
+         raise error(error_text(SOCK_WRIT_FAILED))
+      if self._failed is not None:
+         raise self._failed
+      fut = asyncio.get_event_loop().create_future()
+      self._pending.append(fut)
+      self._writer.write(ext)
+      if self._writer.transport.get_write_buffer_size() > 65536:
+         async with self._drain:
+            await self._writer.drain()
+      return await fut
+
+   async def _status(self, cmd, p3=0, extents=[], Q=0, L=0, H=0):
+      """
+      Sends a command and returns the status.
+      """
+      status, data = await self._command(cmd, p3, extents, Q, L, H)
+      return status
+
+   async def _data(self, cmd, p3=0, extents=[], Q=0, L=0, H=0):
+      """
+      Sends a command and returns a checked list of the status
+      and returned data.
+      """
+      return _u2i_list(await self._command(cmd, p3, extents, Q, L, H))
+
+   # ESSENTIAL
+
+   async def connect(self):
+      """
+      Establishes the connections to the rgpiod daemon.
+
+      The connected attribute is set True on success, otherwise
+      False.
+      """
+      host = self._host
+      port = self._port
+      unix = self._unix
+
+      try:
+         self._reader, self._writer = await _open(host, port, unix)
+
+         if unix is None:
+            # Disable the Nagle algorithm.
+            self._writer.get_extra_info('socket').setsockopt(
+               socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+         self._drain = asyncio.Lock()
+         self._failed = None
+         self._task = asyncio.ensure_future(self._recv())
+
+         self._notify = _notifier()
+         await self._notify.start(host, port, unix, self._notify_latency)
+
+      except OSError:
+         exception = 1
+
+      except (struct.error, asyncio.IncompleteReadError):
+         exception = 2
+
+      except error:
+         # assumed to be no handle available
+         exception = 3
+
+      else:
+         exception = 0
+
+      if exception != 0:
+
+         self.connected = False
+
+         self._close()
+
+         if self._show_errors:
+
+            if unix is None:
+               s = "Can't connect to rgpiod at {}({})".format(host, str(port))
+            else:
+               s = "Can't connect to rgpiod at {}".format(unix)
+
+            print(rgpio._except_a.format(s))
+            if exception == 1:
+                print(rgpio._except_1)
+            elif exception == 2:
+                print(rgpio._except_2)
+            else:
+                print(rgpio._except_3)
+            print(rgpio._except_z)
+
+      else: # auto login if LG_USER exists
+
+         self.connected = True
+
+         user = os.getenv("LG_USER", '')
+
+         if len(user) > 0:
+            await self.set_user(user)
+
+      return self.connected
+
+   def _close(self):
+      """
+      Closes the connections.
+      """
+      if self._notify is not None:
+         self._notify.stop()
+         self._notify = None
+
+      if self._writer is not None:
+         self._writer.close()
+         self._writer = None
+
+      if self._task is not None:
+         self._task.cancel()
+         self._task = None
+
+   async def stop(self):
+      """
+      Disconnects from the rgpiod daemon and releases any used
+      resources.
+      """
+      try:
+         if self.connected:
+            self.connected = False
+            if self._notify is not None:
+               ext = [struct.pack("I", self._notify.handle)]
+               await self._status(_CMD_NC, 4, ext, L=1)
+            # Free all resources allocated to this connection
+            await self._status(_CMD_FREE)
+      except (error, OSError, EOFError):
+         pass # the connection has gone, closing frees the resources
+      finally:
+         self._close()
+
+   # FILES
+
+   async def file_open(self, file_name, file_mode):
+      ext = [struct.pack("I", file_mode)] + [file_name]
+      return _u2i(await self._status(
+         _CMD_FO, 4+len(file_name), ext, L=1))
+
+   async def file_close(self, handle):
+      ext = [struct.pack("I", handle)]
+      return _u2i(await self._status(_CMD_FC, 4, ext, L=1))
+
+   async def file_read(self, handle, count):
+      ext = [struct.pack("II", handle, count)]
+      return await self._data(_CMD_FR, 8, ext, L=2)
+
+   async def file_write(self, handle, data):
+      ext = [struct.pack("I", handle)] + [data]
+      return _u2i(await self._status(_CMD_FW, 4+len(data), ext, L=1))
+
+   async def file_seek(self, handle, seek_offset, seek_from):
+      ext = [struct.pack("IiI", handle, seek_offset, seek_from)]
+      return _u2i(await self._status(_CMD_FS, 12, ext, L=3))
+
+   async def file_list(self, fpattern):
+      ext = [struct.pack("I", 60000)] + [fpattern]
+      return await self._data(_CMD_FL, 4+len(fpattern), ext, L=1)
+
+   # GPIO
+
+   async def gpiochip_open(self, gpiochip):
+      ext = [struct.pack("I", gpiochip)]
+      handle = await self._status(_CMD_GO, 4, ext, L=1)
+      if handle >= 0:
+         handle = handle | (gpiochip << 16)
+      return _u2i(handle)
+
+   async def gpiochip_close(self, handle):
+      ext = [struct.pack("I", handle&0xffff)]
+      return _u2i(await self._status(_CMD_GC, 4, ext, L=1))
+
+   async def gpio_get_chip_info(self, handle):
+      ext = [struct.pack("I", handle&0xffff)]
+      bytes, rdata = await self._command(_CMD_GIC, 4, ext, L=1)
+      if bytes > 0:
+         lines, name, label = struct.unpack("I32s32s", rdata)
+         bytes = OKAY
+      else:
+         lines, name, label = 0, b"", b""
+      return _u2i_list([bytes, lines,
+         name.decode().rstrip('\0'), label.decode().rstrip('\0')])
+
+   async def gpio_get_line_info(self, handle, gpio):
+      ext = [struct.pack("II", handle&0xffff, gpio)]
+      bytes, rdata = await self._command(_CMD_GIL, 8, ext, L=2)
+      if bytes > 0:
+         offset, flags, name, user = struct.unpack("II32s32s", rdata)
+         bytes = OKAY
+      else:
+         offset, flags, name, user = 0, 0, b"", b""
+      return _u2i_list(
+         [bytes, offset, flags,
+            name.decode().rstrip('\0'), user.decode().rstrip('\0')])
+
+   async def gpio_get_mode(self, handle, gpio):
+      ext = [struct.pack("II", handle&0xffff, gpio)]
+      return _u2i(await self._status(_CMD_GMODE, 8, ext, L=2))
+
+   async def gpio_claim_input(self, handle, gpio, lFlags=0):
+      ext = [struct.pack("III", handle&0xffff, lFlags, gpio)]
+      return _u2i(await self._status(_CMD_GSIX, 12, ext, L=3))
+
+   async def gpio_claim_output(self, handle, gpio, level=0, lFlags=0):
+      ext = [struct.pack("IIII", handle&0xffff, lFlags, gpio, level)]
+      return _u2i(await self._status(_CMD_GSOX, 16, ext, L=4))
+
+   async def gpio_free(self, handle, gpio):
+      ext = [struct.pack("II", handle&0xffff, gpio)]
+      return _u2i(await self._status(_CMD_GSF, 8, ext, L=2))
+
+   async def group_claim_input(self, handle, gpio, lFlags=0):
+      if len(gpio):
+         ext = bytearray()
+         ext.extend(struct.pack("II", handle&0xffff, lFlags))
+         for g in gpio:
+            ext.extend(struct.pack("I", g))
+         return _u2i(await self._status(
+            _CMD_GSGIX, (len(gpio)+2)*4, [ext], L=len(gpio)+2))
+      else:
+         return 0
+
+   async def group_claim_output(self, handle, gpio, levels=[0], lFlags=0):
+      if len(gpio):
+         diff = len(gpio)-len(levels)
+         if diff > 0:
+            levels = levels + [0]*diff
+         ext = bytearray()
+         ext.extend(struct.pack("II", handle&0xffff, lFlags))
+         for g in gpio:
+            ext.extend(struct.pack("I", g))
+         for v in range(len(gpio)):
+            ext.extend(struct.pack("I", levels[v]))
+         return _u2i(await self._status(
+            _CMD_GSGOX, (2+(len(gpio)*2))*4, [ext], L=2+(len(gpio)*2)))
+      else:
+         return 0
+
+   async def group_free(self, handle, gpio):
+      ext = [struct.pack("II", handle&0xffff, gpio)]
+      return _u2i(await self._status(_CMD_GSGF, 8, ext, L=2))
+
+   async def gpio_read(self, handle, gpio):
+      ext = [struct.pack("II", handle&0xffff, gpio)]
+      return _u2i(await self._status(_CMD_GR, 8, ext, L=2))
+
+   async def gpio_write(self, handle, gpio, level):
+      ext = [struct.pack("III", handle&0xffff, gpio, level)]
+      return _u2i(await self._status(_CMD_GW, 12, ext, L=3))
+
+   async def group_read(self, handle, gpio):
+      ext = [struct.pack("II", handle&0xffff, gpio)]
+      levels = 0
+      bytes, data = await self._command(_CMD_GGR, 8, ext, L=2)
+      if bytes > 0:
+         levels, status = struct.unpack('QI', _str(data))
+      else:
+         status = bytes
+      return _u2i_list([status, levels])
+
+   async def group_write(self, handle, gpio, group_bits, group_mask=GROUP_ALL):
+      ext = [struct.pack(
+         "QQII", group_bits, group_mask, handle&0xffff, gpio)]
+      return _u2i(await self._status(_CMD_GGWX, 24, ext, Q=2, L=2))
+
+   async def tx_pulse(self, handle, gpio,
+      pulse_on, pulse_off, pulse_offset=0, pulse_cycles=0):
+      ext = [struct.pack("IIIIII", handle&0xffff, gpio,
+         pulse_on, pulse_off, pulse_offset, pulse_cycles)]
+      return _u2i(await self._status(_CMD_GPX, 24, ext, L=6))
+
+   async def tx_pwm(self, handle, gpio,
+      pwm_frequency, pwm_duty_cycle, pulse_offset=0, pulse_cycles=0):
+      ext = [struct.pack("IIIIII", handle&0xffff, gpio,
+         int(pwm_frequency*1000), int(pwm_duty_cycle*1000),
+         pulse_offset, pulse_cycles)]
+      return _u2i(await self._status(_CMD_PX, 24, ext, L=6))
+
+   async def tx_servo(self, handle, gpio, pulse_width,
+      servo_frequency=50, pulse_offset=0, pulse_cycles=0):
+      ext = [struct.pack("IIIIII", handle&0xffff, gpio,
+         pulse_width, servo_frequency, pulse_offset, pulse_cycles)]
+      return _u2i(await self._status(_CMD_SX, 24, ext, L=6))
+
+   async def tx_wave(self, handle, gpio, pulses):
+      ext1 = _wavebuf(pulses)
+      if len(ext1):
+         q = memoryview(ext1).nbytes // 8
+         l = 2
+         size = (q*8) + (l*4)
+         ext2 = struct.pack("II", handle&0xffff, gpio)
+         ext = [ext1, ext2]
+         return _u2i(await self._status(_CMD_GWAVE, size, ext, Q=q, L=l))
+      else:
+         return 0
+
+   async def tx_busy(self, handle, gpio, kind):
+      ext = [struct.pack("III", handle&0xffff, gpio, kind)]
+      return _u2i(await self._status(_CMD_GBUSY, 12, ext, L=3))
+
+   async def tx_room(self, handle, gpio, kind):
+      ext = [struct.pack("III", handle&0xffff, gpio, kind)]
+      return _u2i(await self._status(_CMD_GROOM, 12, ext, L=3))
+
+   async def tx_jitter(self, handle, gpio, kind=TX_PWM):
+      ext = [struct.pack("III", handle&0xffff, gpio, kind)]
+      bytes, rdata = await self._command(_CMD_GJIT, 12, ext, L=3)
+      if bytes > 0:
+         edges, late_sum, late_max, late_last = struct.unpack("QQQQ", rdata)
+         bytes = OKAY
+      else:
+         edges, late_sum, late_max, late_last = 0, 0, 0, 0
+      return _u2i_list([bytes, edges, late_sum, late_max, late_last])
+
+   async def gpio_set_debounce_micros(self, handle, gpio, debounce_micros):
+      ext = [struct.pack("III", handle&0xffff, gpio, debounce_micros)]
+      return _u2i(await self._status(_CMD_GDEB, 12, ext, L=3))
+
+   async def gpio_set_watchdog_micros(self, handle, gpio, watchdog_micros):
+      ext = [struct.pack("III", handle&0xffff, gpio, watchdog_micros)]
+      return _u2i(await self._status(_CMD_GWDOG, 12, ext, L=3))
+
+   async def gpio_set_event_buffer(self, handle, gpio, event_buffer):
+      ext = [struct.pack("III", handle&0xffff, gpio, event_buffer)]
+      return _u2i(await self._status(_CMD_GEVB, 12, ext, L=3))
+
+   async def gpio_get_edge_stats(self, handle, gpio):
+      ext = [struct.pack("II", handle&0xffff, gpio)]
+      bytes, rdata = await self._command(_CMD_GES, 8, ext, L=2)
+      if bytes > 0:
+         stats = list(struct.unpack("QQQQQQQQ", rdata))
+         bytes = OKAY
+      else:
+         stats = [0] * 8
+      return _u2i_list([bytes] + stats)
+
+   async def gpio_claim_alert(
+      self, handle, gpio, eFlags, lFlags=0, notify_handle=None,
+      event_buffer=None):
+      if event_buffer is not None:
+         status = await self.gpio_set_event_buffer(
+            handle, gpio, event_buffer)
+         if status < 0:
+            return status
+      if notify_handle is None:
+         notify_handle = self._notify.handle
+      ext = [struct.pack(
+         "IIIII", handle&0xffff, lFlags, eFlags, gpio, notify_handle)]
+      return _u2i(await self._status(_CMD_GSAX, 20, ext, L=5))
+
+   def alerts(self, handle, gpio, edge=BOTH_EDGES):
+      """
+      Returns an asynchronous iterator of the alerts for a GPIO.
+      This replaces rgpio.sbc.callback.
+
+      handle:= >= 0 (as returned by [*gpiochip_open*]).
+        gpio:= >= 0, as legal for the gpiochip.
+        edge:= BOTH_EDGES (default), RISING_EDGE, or FALLING_EDGE.
+
+      Each alert is a tuple of the chip, the GPIO, the level, and
+      the timestamp.  The level is as for rgpio.sbc.callback.
+
+      The GPIO must have been claimed with [*gpio_claim_alert*]
+      using the default notification handle.
+
+      The iterator's cancel() method stops the alerts, as does
+      leaving an async with block using the iterator.
+
+      ...
+      async with sbc.alerts(h, 17) as al:
+         async for chip, gpio, level, tick in al:
+            print(chip, gpio, level, tick)
+      ...
+      """
+      return _alerts(self._notify, handle>>16, gpio, edge)
+
+   # I2C
+
+   async def i2c_open(self, i2c_bus, i2c_address, i2c_flags=0):
+      ext = [struct.pack("III", i2c_bus, i2c_address, i2c_flags)]
+      return _u2i(await self._status(_CMD_I2CO, 12, ext, L=3))
+
+   async def i2c_close(self, handle):
+      ext = [struct.pack("I", handle)]
+      return _u2i(await self._status(_CMD_I2CC, 4, ext, L=1))
+
+   async def i2c_write_quick(self, handle, bit):
+      ext = [struct.pack("II", handle, bit)]
+      return _u2i(await self._status(_CMD_I2CWQ, 8, ext, L=2))
+
+   async def i2c_write_byte(self, handle, byte_val):
+      ext = [struct.pack("II", handle, byte_val)]
+      return _u2i(await self._status(_CMD_I2CWS, 8, ext, L=2))
+
+   async def i2c_read_byte(self, handle):
+      ext = [struct.pack("I", handle)]
+      return _u2i(await self._status(_CMD_I2CRS, 4, ext, L=1))
+
+   async def i2c_write_byte_data(self, handle, reg, byte_val):
+      ext = [struct.pack("III", handle, reg, byte_val)]
+      return _u2i(await self._status(_CMD_I2CWB, 12, ext, L=3))
+
+   async def i2c_write_word_data(self, handle, reg, word_val):
+      ext = [struct.pack("III", handle, reg, word_val)]
+      return _u2i(await self._status(_CMD_I2CWW, 12, ext, L=3))
+
+   async def i2c_read_byte_data(self, handle, reg):
+      ext = [struct.pack("II", handle, reg)]
+      return _u2i(await self._status(_CMD_I2CRB, 8, ext, L=2))
+
+   async def i2c_read_word_data(self, handle, reg):
+      ext = [struct.pack("II", handle, reg)]
+      return _u2i(await self._status(_CMD_I2CRW, 8, ext, L=2))
+
+   async def i2c_process_call(self, handle, reg, word_val):
+      ext = [struct.pack("III", handle, reg, word_val)]
+      return _u2i(await self._status(_CMD_I2CPC, 12, ext, L=3))
+
+   async def i2c_write_block_data(self, handle, reg, data):
+      ext = [struct.pack("II", handle, reg)] + [data]
+      return _u2i(await self._status(_CMD_I2CWK, 8+len(data), ext, L=2))
+
+   async def i2c_read_block_data(self, handle, reg):
+      ext = [struct.pack("II", handle, reg)]
+      return await self._data(_CMD_I2CRK, 8, ext, L=2)
+
+   async def i2c_block_process_call(self, handle, reg, data):
+      ext = [struct.pack("II", handle, reg)] + [data]
+      return await self._data(_CMD_I2CPK, 8+len(data), ext, L=2)
+
+   async def i2c_write_i2c_block_data(self, handle, reg, data):
+      ext = [struct.pack("II", handle, reg)] + [data]
+      return _u2i(await self._status(_CMD_I2CWI, 8+len(data), ext, L=2))
+
+   async def i2c_read_i2c_block_data(self, handle, reg, count):
+      ext = [struct.pack("III", handle, reg, count)]
+      return await self._data(_CMD_I2CRI, 12, ext, L=3)
+
+   async def i2c_read_device(self, handle, count):
+      ext = [struct.pack("II", handle, count)]
+      return await self._data(_CMD_I2CRD, 8, ext, L=2)
+
+   async def i2c_write_device(self, handle, data):
+      ext = [struct.pack("I", handle)] + [data]
+      return _u2i(await self._status(_CMD_I2CWD, 4+len(data), ext, L=1))
+
+   async def i2c_zip(self, handle, data):
+      ext = [struct.pack("I", handle)] + [data]
+      return await self._data(_CMD_I2CZ, 4+len(data), ext, L=1)
+
+   # NOTIFICATIONS
+
+   async def notify_open(self):
+      return _u2i(await self._status(_CMD_NO))
+
+   async def notify_pause(self, handle):
+      ext = [struct.pack("I", handle)]
+      return _u2i(await self._status(_CMD_NP, 4, ext, L=1))
+
+   async def notify_resume(self, handle):
+      ext = [struct.pack("I", handle)]
+      return _u2i(await self._status(_CMD_NR, 4, ext, L=1))
+
+   async def notify_close(self, handle):
+      ext = [struct.pack("I", handle)]
+      return _u2i(await self._status(_CMD_NC, 4, ext, L=1))
+
+   async def notify_stats(self, handle):
+      ext = [struct.pack("I", handle)]
+      bytes, rdata = await self._command(_CMD_NS, 4, ext, L=1)
+      stats = [0, 0, 0, 0, 0]
+      if bytes > 0:
+         stats = list(struct.unpack("QQQQQ", rdata))
+         bytes = OKAY
+      return _u2i_list([bytes] + stats)
+
+   # SCRIPTS
+
+   async def script_store(self, script):
+      if len(script):
+         return _u2i(await self._status(
+            _CMD_PROC, len(script)+1, [script+'\0']))
+      else:
+         return 0
+
+   async def script_run(self, handle, params=None):
+      ext = struct.pack("I", handle)
+      nump = 1
+      if params is not None:
+         for p in params:
+            ext += struct.pack("I", p)
+         nump = 1 + len(params)
+      return _u2i(await self._status(_CMD_PROCR, nump*4, [ext], L=nump))
+
+   async def script_update(self, handle, params=None):
+      ext = struct.pack("I", handle)
+      nump = 1
+      if params is not None:
+         for p in params:
+            ext += struct.pack("I", p)
+         nump = 1 + len(params)
+      return _u2i(await self._status(_CMD_PROCU, nump*4, [ext], L=nump))
+
+   async def script_status(self, handle):
+      params = ()
+      ext = [struct.pack("I", handle)]
+      bytes, data = await self._command(_CMD_PROCP, 4, ext, L=1)
+      if bytes > 0:
+         pars = struct.unpack('11i', _str(data))
+         status = pars[0]
+         params = pars[1:]
+      else:
+         status = bytes
+      return _u2i_list([status, params])
+
+   async def script_stop(self, handle):
+      ext = [struct.pack("I", handle)]
+      return _u2i(await self._status(_CMD_PROCS, 4, ext, L=1))
+
+   async def script_delete(self, handle):
+      ext = [struct.pack("I", handle)]
+      return _u2i(await self._status(_CMD_PROCD, 4, ext, L=1))
+
+   # SERIAL
+
+   async def serial_open(self, tty, baud, ser_flags=0):
+      ext = [struct.pack("II", baud, ser_flags)] + [tty]
+      return _u2i(await self._status(_CMD_SERO, 8+len(tty), ext, L=2))
+
+   async def serial_close(self, handle):
+      ext = [struct.pack("I", handle)]
+      return _u2i(await self._status(_CMD_SERC, 4, ext, L=1))
+
+   async def serial_read_byte(self, handle):
+      ext = [struct.pack("I", handle)]
+      return _u2i(await self._status(_CMD_SERRB, 4, ext, L=1))
+
+   async def serial_write_byte(self, handle, byte_val):
+      ext = [struct.pack("II", handle, byte_val)]
+      return _u2i(await self._status(_CMD_SERWB, 8, ext, L=2))
+
+   async def serial_read(self, handle, count=1000):
+      ext = [struct.pack("II", handle, count)]
+      return await self._data(_CMD_SERR, 8, ext, L=2)
+
+   async def serial_write(self, handle, data):
+      ext = [struct.pack("I", handle)] + [data]
+      return _u2i(await self._status(_CMD_SERW, 4+len(data), ext, L=1))
+
+   async def serial_data_available(self, handle):
+      ext = [struct.pack("I", handle)]
+      return _u2i(await self._status(_CMD_SERDA, 4, ext, L=1))
+
+   # SHELL
+
+   async def shell(self, shellscr, pstring=""):
+      ls = len(shellscr)+1
+      lp = len(pstring)+1
+      ext = [struct.pack("I", ls)] + [shellscr+'\x00'+pstring+'\x00']
+      return _u2i(await self._status(_CMD_SHELL, 4+ls+lp, ext, L=1))
+
+   # SPI
+
+   async def spi_open(self, spi_device, spi_channel, baud, spi_flags=0):
+      ext = [struct.pack("IIII", spi_device, spi_channel, baud, spi_flags)]
+      return _u2i(await self._status(_CMD_SPIO, 16, ext, L=4))
+
+   async def spi_close(self, handle):
+      ext = [struct.pack("I", handle)]
+      return _u2i(await self._status(_CMD_SPIC, 4, ext, L=1))
+
+   async def spi_read(self, handle, count):
+      ext = [struct.pack("II", handle, count)]
+      return await self._data(_CMD_SPIR, 8, ext, L=2)
+
+   async def spi_write(self, handle, data):
+      ext = [struct.pack("I", handle)] + [data]
+      return _u2i(await self._status(_CMD_SPIW, 4+len(data), ext, L=1))
+
+   async def spi_xfer(self, handle, data):
+      ext = [struct.pack("I", handle)] + [data]
+      return await self._data(_CMD_SPIX, 4+len(data), ext, L=1)
+
+   # UTILITIES
+
+   async def get_sbc_name(self):
+      bytes, rdata = await self._command(_CMD_SBC)
+      return rdata
+
+   async def set_user(self, user="default",
+      secretsFile=os.path.expanduser("~/.lg_secret")):
+      user = user.strip()
+
+      if user == "":
+         user = "default"
+
+      secret = bytearray()
+
+      with open(secretsFile) as f:
+         for line in f:
+            l = line.split("=")
+            if len(l) == 2:
+               if l[0].strip() == user:
+                  secret = bytearray(l[1].strip().encode('utf-8'))
+                  break
+
+      salt1 = "{:015x}".format((int(time.time()*1e7))&0xfffffffffffffff)
+      ext = salt1 + '.' + user
+      bytes, rdata = await self._command(_CMD_USER, len(ext), [ext])
+
+      if bytes < 0:
+         return bytes
+
+      salt1 = bytearray(salt1.encode('utf-8'))
+      salt2 = rdata[:15]
+
+      h = hashlib.md5()
+      h.update(salt1 + secret + salt2)
+      pwd = h.hexdigest()
+
+      return await self._status(_CMD_PASSW, len(pwd), [pwd])
+
+   async def set_share_id(self, handle, share_id):
+      ext = [struct.pack("II", handle, share_id)]
+      return _u2i(await self._status(_CMD_SHRS, 8, ext, L=2))
+
+   async def use_share_id(self, share_id):
+      ext = [struct.pack("I", share_id)]
+      return _u2i(await self._status(_CMD_SHRU, 4, ext, L=1))
+
+   async def get_internal(self, config_id):
+      ext = [struct.pack("I", config_id)]
+      config_value = None
+      bytes, data = await self._command(_CMD_CGI, 4, ext, L=1)
+      if bytes > 0:
+         config_value = struct.unpack('Q', _str(data))[0]
+         status = OKAY
+      else:
+         status = bytes
+      return _u2i_list([status, config_value])
+
+   async def set_internal(self, config_id, config_value):
+      ext = [struct.pack("QI", config_value, config_id)]
+      return _u2i(await self._status(_CMD_CSI, 12, ext, Q=1, L=1))
+
@@ -0,0 +1,387 @@
+"""
+[http://abyz.me.uk/lg/py_rgpio.html]
+
+rgpio_wave compiles common bit-banged outputs into packed waves
+for [*tx_wave*].
+
+uart                      Soft UART transmit frames
+shift_out                 Clocked (SPI-like) shift out
+ir_raw                    IR carrier bursts from mark/space times
+ir_nec                    IR NEC frames
+ir_rc5                    IR RC5 frames
+servo                     Synchronised servo pulses
+steps                     Stepper step trains with optional ramps
+
+cache_info                Get the compiled wave cache statistics
+cache_clear               Empty the compiled wave cache
+
+Each function returns an rgpio.wave.  GPIO are given as bit numbers
+within the group, 0 being the group leader.  Times are computed in
+fractional microseconds and each edge rounded to the nearest
+microsecond from the start of the wave so rounding errors do not
+accumulate.
+
+Compiled waves are cached, least recently used first out, keyed by
+the parameters.  Repeated frames are transmitted without being
+regenerated.  The cache holds the packed pulses, each call returns a
+new wave which may be modified freely.
+
+...
+import rgpio
+import rgpio_wave
+
+sbc = rgpio.sbc()
+h = sbc.gpiochip_open(0)
+sbc.group_claim_output(h, [20, 21])
+
+# "hello" at 9600 baud on GPIO 20 (group bit 0)
+sbc.tx_wave(h, 20, rgpio_wave.uart(b"hello", 9600))
+...
+"""
+
+import functools
+
+from rgpio import wave
+
+CACHE_SIZE = 128 # compiled waves kept per function
+
+def _add(w, mask, segments):
+   """
+   Appends (group_bits, microseconds) segments to a wave, merging
+   adjacent segments with the same levels.
+   """
+   t = 0.0
+   edge = 0
+   level = None
+   run = 0.0
+   for bits, duration in segments:
+      if bits == level:
+         run += duration
+         continue
+      if level is not None:
+         t += run
+         w.append(level, mask, int(t + 0.5) - edge)
+         edge = int(t + 0.5)
+      level = bits
+      run = duration
+   if level is not None:
+      t += run
+      w.append(level, mask, int(t + 0.5) - edge)
+   return w
+
+def _wave(data):
+   """
+   Returns a new wave holding cached packed pulses.
+   """
+   w = wave()
+   w.data.frombytes(data)
+   return w
+
+def _codes(data):
+   """
+   Returns data as a hashable tuple of ints.
+   """
+   if isinstance(data, str):
+      data = data.encode('latin-1')
+   return tuple(data)
+
+def _parity(value):
+   return bin(value).count("1") & 1
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def _uart(data, baud, bit, bits, stop_bits, parity, invert):
+   mark = 0 if invert else 1 << bit
+   space = mark ^ (1 << bit)
+   period = 1e6 / baud
+   segments = []
+   for byte in data:
+      byte &= (1 << bits) - 1
+      segments.append((space, period)) # start bit
+      for i in range(bits):
+         segments.append((mark if (byte >> i) & 1 else space, period))
+      if parity is not None:
+         p = _parity(byte) ^ (parity == "odd")
+         segments.append((mark if p else space, period))
+      segments.append((mark, stop_bits * period))
+   return _add(wave(), 1 << bit, segments).data.tobytes()
+
+def uart(data, baud, bit=0, bits=8, stop_bits=1, parity=None, invert=False):
+   """
+   Returns a wave transmitting data as soft UART frames.
+
+        data:= the bytes, or for 9 bit frames the values, to send.
+        baud:= 50-1000000, the bit rate.
+         bit:= the group bit to use (default 0).
+        bits:= 5-9, the data bits per frame (default 8).
+   stop_bits:= 1, 1.5, or 2 (default 1).
+      parity:= None, "even", or "odd" (default None).
+      invert:= True for an idle low line (default False).
+
+   Data bits are sent least significant first.  The line is left
+   idle (high unless inverted) at the end of the wave.  Set the
+   GPIO idle before transmitting the first wave.
+
+   ...
+   sbc.tx_wave(h, 20, rgpio_wave.uart(b"\\x55\\xaa", 115200))
+   ...
+   """
+   if parity not in (None, "even", "odd"):
+      raise ValueError("parity must be None, 'even', or 'odd'")
+   return _wave(_uart(_codes(data), baud, bit, bits, stop_bits,
+      parity, bool(invert)))
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def _shift_out(data, frequency, clock_bit, data_bit, bits, msb_first,
+   cpol, cpha, select_bit):
+   clk = 1 << clock_bit
+   mask = clk | (1 << data_bit)
+   idle = clk if cpol else 0
+   active = idle ^ clk
+   deselect = 0
+   if select_bit is not None:
+      mask |= 1 << select_bit
+      deselect = 1 << select_bit # active low
+   half = 5e5 / frequency
+   segments = []
+   for value in data:
+      for i in range(bits):
+         shift = (bits - 1 - i) if msb_first else i
+         level = (1 << data_bit) if (value >> shift) & 1 else 0
+         if cpha:
+            segments.append((level | active, half))
+            segments.append((level | idle, half))
+         else:
+            segments.append((level | idle, half))
+            segments.append((level | active, half))
+   segments.append((deselect | idle, half))
+   return _add(wave(), mask, segments).data.tobytes()
+
+def shift_out(data, frequency, clock_bit=0, data_bit=1, bits=8,
+   msb_first=True, cpol=0, cpha=0, select_bit=None):
+   """
+   Returns a wave clocking data out on a clock and data pair.
+
+         data:= the values to send.
+    frequency:= the clock frequency in Hz.
+    clock_bit:= the group bit used for the clock (default 0).
+     data_bit:= the group bit used for the data (default 1).
+         bits:= the bits per value (default 8).
+    msb_first:= True to send the most significant bit first
+                (default True).
+         cpol:= 0 for a clock idling low, 1 for idling high.
+         cpha:= 0 to sample on the leading clock edge, 1 to sample
+                on the trailing edge.
+   select_bit:= the group bit of an active low select, or None.
+
+   The select, if any, is asserted for the whole transfer and
+   released at the end.  The clock is left idle.
+
+   ...
+   w = rgpio_wave.shift_out([0x12, 0x34], 100000, clock_bit=0, data_bit=1)
+   sbc.tx_wave(h, 20, w)
+   ...
+   """
+   if isinstance(data, int):
+      data = (data,)
+   return _wave(_shift_out(tuple(data), frequency, clock_bit, data_bit,
+      bits, bool(msb_first), cpol, cpha, select_bit))
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def _ir_raw(times, bit, carrier, duty):
+   on = 1 << bit
+   period = 1e6 / carrier
+   segments = []
+   for i, duration in enumerate(times):
+      if i & 1:
+         segments.append((0, duration))
+      else:
+         for c in range(max(1, int(duration / period + 0.5))):
+            segments.append((on, period * duty))
+            segments.append((0, period * (1 - duty)))
+   return _add(wave(), on, segments).data.tobytes()
+
+def ir_raw(times, bit=0, carrier=38000, duty=0.33):
+   """
+   Returns a wave of IR carrier bursts.
+
+     times:= alternate mark and space times in microseconds,
+             starting with a mark.
+       bit:= the group bit driving the IR LED (default 0).
+   carrier:= the carrier frequency in Hz (default 38000).
+      duty:= the fraction of each carrier cycle the LED is on
+             (default 0.33).
+
+   Each mark is sent as a whole number of carrier cycles.  The LED
+   is left off.
+   """
+   return _wave(_ir_raw(tuple(times), bit, carrier, duty))
+
+def ir_nec(address, command, bit=0, carrier=38000, duty=0.33):
+   """
+   Returns a wave sending an NEC IR frame.
+
+   address:= 0-255, or 0-65535 for an extended address.
+   command:= 0-255.
+
+   The other parameters are as for [*ir_raw*].
+
+   An 8 bit address is sent followed by its inverse, an extended
+   address is sent as 16 bits.
+
+   ...
+   sbc.tx_wave(h, 22, rgpio_wave.ir_nec(0x04, 0x08))
+   ...
+   """
+   if address > 255:
+      code = address & 0xffff
+   else:
+      code = address | ((address ^ 0xff) << 8)
+   code |= (command & 0xff) << 16 | ((command & 0xff) ^ 0xff) << 24
+   times = [9000, 4500]
+   for i in range(32):
+      times.extend((562.5, 1687.5 if (code >> i) & 1 else 562.5))
+   times.append(562.5)
+   return _wave(_ir_raw(tuple(times), bit, carrier, duty))
+
+def ir_rc5(address, command, toggle=0, bit=0, carrier=36000, duty=0.33):
+   """
+   Returns a wave sending an RC5 IR frame.
+
+   address:= 0-31.
+   command:= 0-127, commands above 63 use the RC5X field bit.
+    toggle:= the toggle bit, change it for each new key press.
+
+   The other parameters are as for [*ir_raw*].
+   """
+   frame = (1 << 13) | (((command >> 6) ^ 1) & 1) << 12
+   frame |= (toggle & 1) << 11 | (address & 31) << 6 | (command & 63)
+   halves = []
+   for i in range(13, -1, -1):
+      if (frame >> i) & 1:
+         halves.extend((0, 1)) # space then mark
+      else:
+         halves.extend((1, 0))
+   times = []
+   level = 1
+   for h in halves[1:]: # the frame always starts with a space
+      if h == level and times:
+         times[-1] += 889
+      else:
+         times.append(889)
+         level = h
+   if level == 0:
+      times.pop() # no need to end with a space
+   return _wave(_ir_raw(tuple(times), bit, carrier, duty))
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def _servo(widths, frequency, cycles):
+   mask = 0
+   start = 0
+   for i, width in enumerate(widths):
+      if width is not None:
+         mask |= 1 << i
+         if width > 0:
+            start |= 1 << i
+   segments = []
+   level = start
+   t = 0
+   for width, i in sorted(
+      (w, i) for i, w in enumerate(widths) if w):
+      if width > t:
+         segments.append((level, width - t))
+         t = width
+      level &= ~(1 << i)
+   segments.append((level, 1e6 / frequency - t))
+   w = _add(wave(), mask, segments)
+   return w.data.tobytes() * cycles
+
+def servo(widths, frequency=50, cycles=1):
+   """
+   Returns a wave of synchronised servo pulses.
+
+      widths:= the pulse width in microseconds for each group bit,
+               0 for off, or None to leave the GPIO unchanged.
+   frequency:= the pulses per second (default 50).
+      cycles:= the number of pulses to send (default 1).
+
+   All the pulses start together.
+
+   ...
+   # three servos on group bits 0-2, bit 3 unused, for 1 second
+   w = rgpio_wave.servo([1000, 1500, 2000], cycles=50)
+   ...
+   """
+   return _wave(_servo(tuple(widths), frequency, cycles))
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def _steps(count, rate, bit, dir_bit, direction, start_rate, ramp,
+   pulse_width):
+   step = 1 << bit
+   mask = step
+   dir_level = 0
+   if dir_bit is not None:
+      mask |= 1 << dir_bit
+      if direction:
+         dir_level = 1 << dir_bit
+   segments = []
+   if dir_bit is not None:
+      segments.append((dir_level, pulse_width)) # direction set up time
+   for i in range(count):
+      r = rate
+      if ramp and start_rate is not None:
+         n = min(i, count - 1 - i, ramp)
+         r = start_rate + (rate - start_rate) * n / ramp
+      segments.append((dir_level | step, pulse_width))
+      segments.append((dir_level, max(0, 1e6 / r - pulse_width)))
+   return _add(wave(), mask, segments).data.tobytes()
+
+def steps(count, rate, bit=0, dir_bit=None, direction=0,
+   start_rate=None, ramp=0, pulse_width=10):
+   """
+   Returns a wave of stepper motor step pulses.
+
+         count:= the number of steps.
+          rate:= the steps per second.
+           bit:= the group bit of the step input (default 0).
+       dir_bit:= the group bit of the direction input, or None.
+     direction:= the direction level (default 0).
+    start_rate:= the steps per second at the start and end of a
+                 ramp, or None for no ramp.
+          ramp:= the number of steps to accelerate over, and to
+                 decelerate over.
+   pulse_width:= the step pulse width in microseconds (default 10).
+
+   With a ramp the rate rises linearly from start_rate to rate
+   over the first ramp steps and falls back over the last ramp
+   steps.
+
+   ...
+   # 2000 steps at 1000 steps/s with 200 step ramps from 100 steps/s
+   w = rgpio_wave.steps(2000, 1000, 0, 1, 1, start_rate=100, ramp=200)
+   ...
+   """
+   if rate <= 0:
+      raise ValueError("rate must be greater than 0")
+   if ramp and start_rate is not None and start_rate <= 0:
+      raise ValueError("start_rate must be greater than 0")
+   return _wave(_steps(count, rate, bit, dir_bit, direction, start_rate,
+      ramp, pulse_width))
+
+_COMPILERS = (_uart, _shift_out, _ir_raw, _servo, _steps)
+
+def cache_info():
+   """
+   Returns a dictionary of cache statistics for each compiler.
+
+   ...
+   print(rgpio_wave.cache_info()["uart"].hits)
+   ...
+   """
+   return {f.__name__[1:]: f.cache_info() for f in _COMPILERS}
+
+def cache_clear():
+   """
+   Empties the compiled wave cache.
+   """
+   for f in _COMPILERS:
+      f.cache_clear()
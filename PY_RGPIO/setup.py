@@ -18,7 +18,7 @@ setup(name='rgpio',
       long_description_content_type="text/markdown",
       download_url='http://abyz.me.uk/lg/lg.zip',
       license='unlicense.org',
-      py_modules=['rgpio'],
+      py_modules=['rgpio', 'rgpio_aio', 'rgpio_wave'],
       keywords=['linux', 'sbc', 'gpio',],
       classifiers=[
          "Programming Language :: Python :: 3",
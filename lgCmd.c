@@ -85,6 +85,7 @@ cmdInfo_t cmdInfo[]=
    {LG_CMD_GWAVE, "GWAVE", 101, 2, 1}, // lgTxWave
    {LG_CMD_GBUSY, "GBUSY", 101, 2, 1}, // lgTxBusy
    {LG_CMD_GROOM, "GROOM", 101, 2, 1}, // lgTxRoom
+   {LG_CMD_GJIT,  "GJIT",  101, 12, 0}, // lgTxJitter
    {LG_CMD_P,     "P",     101, 2, 1}, // lgTxPwm (simple)
    {LG_CMD_PX,    "PX",    101, 2, 1}, // lgTxPwm
    {LG_CMD_S,     "S",     101, 2, 1}, // lgTxServo (simple)
@@ -92,6 +93,8 @@ cmdInfo_t cmdInfo[]=
 
    {LG_CMD_GDEB,  "GDEB",  101, 0, 1}, // lgGpioSetDebounce
    {LG_CMD_GWDOG, "GWDOG", 101, 0, 1}, // lgGpioSetWatchdog
+   {LG_CMD_GEVB,  "GEVB",  101, 0, 1}, // lgGpioSetEventBuffer
+   {LG_CMD_GES,   "GES",   101, 14, 0}, // lgGpioGetEdgeStats
 
    /* I2C */
 
@@ -126,9 +129,11 @@ cmdInfo_t cmdInfo[]=
    /* NOTIFICATIONS */
 
    {LG_CMD_NO,    "NO",    100, 2, 1}, // lgNotifyOpen
+   {LG_CMD_NOR,   "NOR",   101, 2, 1}, // lgNotifyOpenRing
    {LG_CMD_NC,    "NC",    101, 0, 1}, // lgNotifyClose
    {LG_CMD_NP,    "NP",    101, 0, 1}, // lgNotifyPause
    {LG_CMD_NR,    "NR",    101, 0, 1}, // lgNotifyResume
+   {LG_CMD_NS,    "NS",    101, 13, 0}, // lgNotifyStats
 
    /* SCRIPTS */
 
@@ -524,8 +529,10 @@ int cmdParse(char *text, cmdCtl_p ctlP, lgCmd_p cmdP, int cmdBufSize)
             case LG_CMD_MICS:  // v
             case LG_CMD_MILS:  // v
             case LG_CMD_NR:    // h
+            case LG_CMD_NOR:   // v
             case LG_CMD_NC:    // h
             case LG_CMD_NP:    // h
+            case LG_CMD_NS:    // h
             case LG_CMD_PROCD: // h
             case LG_CMD_PROCP: // h
             case LG_CMD_PROCS: // h
@@ -571,6 +578,7 @@ int cmdParse(char *text, cmdCtl_p ctlP, lgCmd_p cmdP, int cmdBufSize)
                break;
 
             case LG_CMD_FR:    // h v
+            case LG_CMD_GES:   // h g
             case LG_CMD_GGR:   // h g
             case LG_CMD_GIL:   // h g
             case LG_CMD_GMODE: // h g
@@ -594,7 +602,9 @@ int cmdParse(char *text, cmdCtl_p ctlP, lgCmd_p cmdP, int cmdBufSize)
                break;
                               
             case LG_CMD_GDEB:  // h g v
+            case LG_CMD_GEVB:  // h g v
             case LG_CMD_GROOM: // h g t
+            case LG_CMD_GJIT:  // h g t
             case LG_CMD_GBUSY: // h g t
             case LG_CMD_GSA:   // h g nfyh
             case LG_CMD_GSIX:  // h lf g
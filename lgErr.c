@@ -141,6 +141,8 @@ static xErrInfo_t xErrInfo[]=
    {LG_BAD_PWM_DUTY,  "bad PWM dutycycle"},
    {LG_GPIO_NOT_AN_OUTPUT,  "GPIO not set as an output"},
    {LG_INVALID_GROUP_ALERT,  "can not set a group to alert"},
+   {LG_BAD_RING_SIZE,  "bad notification ring size"},
+   {LG_BAD_EVENT_BUFFER,  "bad kernel event buffer size"},
 };
 
 const char *lguErrorText(int error)
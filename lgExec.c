@@ -570,6 +570,9 @@ int lgExecCmd(lgCmd_p cmdP, int cmdBufSize)
    lgCtx_p Ctx;
    lgLineInfo_t lInfo;
    lgChipInfo_t cInfo;
+   lgTxStats_t txStats;
+   lgNotifyStats_t nfyStats;
+   lgEdgeStats_t edgeStats;
    res = LG_OKAY;
    char *cmdExt=(char*)&cmdP[1];
    uint32_t *argI=(uint32_t*)&cmdP[1];
@@ -782,6 +785,16 @@ int lgExecCmd(lgCmd_p cmdP, int cmdBufSize)
 
       case LG_CMD_NC: res = lgNotifyClose(argI[0]); break;
 
+      case LG_CMD_NS:
+         res = lgNotifyStats(argI[0], &nfyStats);
+         if (res == LG_OKAY)
+         {
+            memcpy(cmdExt, &nfyStats, sizeof(nfyStats));
+            res = sizeof(nfyStats);
+            cmdP->size = res;
+         }
+         break;
+
       case LG_CMD_NO:
          if (!gPermits || xCheckNotifyPermissions(Ctx))
             res = lgNotifyOpen();
@@ -789,8 +802,19 @@ int lgExecCmd(lgCmd_p cmdP, int cmdBufSize)
             res = LG_NO_PERMISSIONS;
          break;
 
+      case LG_CMD_NOR:
+         if (!gPermits || xCheckNotifyPermissions(Ctx))
+            res = lgNotifyOpenRing(argI[0]);
+         else
+            res = LG_NO_PERMISSIONS;
+         break;
+
       case LG_CMD_NOIB:
-         res = lgNotifyOpenInBand(argI[0]);
+         /* argI[1] is only present if the client set a latency */
+         if (size >= 8)
+            res = lgNotifyOpenInBandWithLatency(argI[0], argI[1]);
+         else
+            res = lgNotifyOpenInBand(argI[0]);
          break;
 
       case LG_CMD_NP: res = lgNotifyPause(argI[0]); break;
@@ -967,6 +991,22 @@ int lgExecCmd(lgCmd_p cmdP, int cmdBufSize)
          res = lgGpioSetWatchdog(argI[0], argI[1], argI[2]);
          break;
 
+      case LG_CMD_GEVB:
+         // handle gpio value
+         res = lgGpioSetEventBuffer(argI[0], argI[1], argI[2]);
+         break;
+
+      case LG_CMD_GES:
+         // handle gpio
+         res = lgGpioGetEdgeStats(argI[0], argI[1], &edgeStats);
+         if (res == LG_OKAY)
+         {
+            memcpy(cmdExt, &edgeStats, sizeof(edgeStats));
+            res = sizeof(edgeStats);
+            cmdP->size = res;
+         }
+         break;
+
       case LG_CMD_GSI:
          // handle gpio
          res = lgGpioClaimInput(argI[0],       0, argI[1]);
@@ -1110,6 +1150,17 @@ int lgExecCmd(lgCmd_p cmdP, int cmdBufSize)
          // handle gpio type
          res = lgTxRoom(argI[0], argI[1], argI[2]);
          break;
+
+      case LG_CMD_GJIT:
+         // handle gpio type
+         res = lgTxJitter(argI[0], argI[1], argI[2], &txStats);
+         if (res == LG_OKAY)
+         {
+            memcpy(cmdExt, &txStats, sizeof(txStats));
+            res = sizeof(txStats);
+            cmdP->size = res;
+         }
+         break;
          
       case LG_CMD_GSF:
          // handle gpio
@@ -249,6 +249,20 @@ uint64_t xMakeFlags(uint64_t s)
    return f;
 }
 
+static void xMakeDebounce(struct gpio_v2_line_config *cfg, int debounce_us)
+{
+   /* debounce the first line of the request in the kernel */
+
+   if (debounce_us)
+   {
+      cfg->num_attrs = 1;
+      cfg->attrs[0].mask = 1;
+      cfg->attrs[0].attr.id = GPIO_V2_LINE_ATTR_ID_DEBOUNCE;
+      cfg->attrs[0].attr.debounce_period_us = debounce_us;
+   }
+   else cfg->num_attrs = 0;
+}
+
 uint64_t xMakeStatus(uint64_t f)
 {
    uint64_t s = 0;
@@ -357,7 +371,7 @@ static int xSetAsFree(lgChipObj_p chip, int gpio)
          "free alert GPIO: %d (mode %d)", gpio, GPIO->mode);
 
       if ((pEvt = lgGpioGetAlertRec(chip, gpio)) != NULL)
-         pEvt->active = 0;
+         lgGpioStopAlertRec(pEvt);
 
       for (i=0; i<10; i++)
       {
@@ -514,6 +528,7 @@ static int xSetAsPwm(
    lgTxRec_p p;
    int zero = 0;
    int status = 0;
+   int slot;
 
    LG_DBG(LG_DEBUG_TRACE, "chip=*%p gpio=%d", (void*)chip, gpio);
 
@@ -554,17 +569,20 @@ static int xSetAsPwm(
          {
             /* delete prior pending entry if it has infinite cycles */
 
-            if ((p->entries > 1) && (p->cycles[p->entries-1] == -1))
+            slot = LG_TX_SLOT(p, p->entries-1);
+
+            if ((p->entries > 1) && (p->cycles[slot] == -1))
             {
                --p->entries;
             }
 
             if (p->entries < LG_TX_BUF)
             {
-               p->micros_on[p->entries] = micros_on;
-               p->micros_off[p->entries] = micros_off;
-               if (cycles) p->cycles[p->entries] = cycles;
-               else p->cycles[p->entries] = -1;
+               slot = LG_TX_SLOT(p, p->entries);
+               p->micros_on[slot] = micros_on;
+               p->micros_off[slot] = micros_off;
+               if (cycles) p->cycles[slot] = cycles;
+               else p->cycles[slot] = -1;
                p->entries++;
                status = LG_TX_BUF - p->entries;
             }
@@ -585,9 +603,11 @@ static int xSetAsPwm(
 
       if ((micros_on + micros_off) > lgMinTxDelay)
       {
-         lgGpioCreateTxRec(
-            chip, gpio, micros_on, micros_off, micros_offset, cycles);
-         status = LG_TX_BUF - 1;
+         if (lgGpioCreateTxRec(
+            chip, gpio, micros_on, micros_off, micros_offset, cycles))
+            status = LG_TX_BUF - 1;
+         else
+            status = LG_NO_MEMORY;
       }
       else return LG_BAD_PWM_MICROS;
    }
@@ -637,8 +657,8 @@ static int xWave(
    {
       if (p->entries < LG_TX_BUF)
       {
-         p->pulses[p->entries] = pulsesTmp;
-         p->num_pulses[p->entries] = count;
+         p->pulses[LG_TX_SLOT(p, p->entries)] = pulsesTmp;
+         p->num_pulses[LG_TX_SLOT(p, p->entries)] = count;
          p->entries++;
          status = LG_TX_BUF - p->entries;
       }
@@ -654,8 +674,13 @@ static int xWave(
    {
       lgPthTxUnlock();
 
-      lgGroupCreateWaveRec(chip, gpio, count, pulsesTmp);
-      status = LG_TX_BUF - 1;
+      if (lgGroupCreateWaveRec(chip, gpio, count, pulsesTmp))
+         status = LG_TX_BUF - 1;
+      else
+      {
+         free(pulsesTmp);
+         status = LG_NO_MEMORY;
+      }
    }
 
    return status;
@@ -1110,12 +1135,28 @@ int lgGpioClaimAlert(
             req.num_lines = 1;
             req.offsets[0] = gpio;
             req.config.flags = flags;
+            req.event_buffer_size = chip->LineInf[gpio].event_buffer;
             strncpy(req.consumer, chip->userLabel, sizeof(req.consumer));
 
             LG_DBG(LG_DEBUG_TRACE, "flags %"PRIu64, flags);
 
+            /* prefer kernel debounce, so bounces never reach us */
+
+            xMakeDebounce(&req.config, chip->LineInf[gpio].debounce_us);
+
             status = ioctl(chip->fd, GPIO_V2_GET_LINE_IOCTL, &req);
 
+            if ((status != 0) && req.config.num_attrs)
+            {
+               LG_DBG(LG_DEBUG_ALLOC, "no kernel debounce %d", gpio);
+
+               req.config.num_attrs = 0;
+
+               status = ioctl(chip->fd, GPIO_V2_GET_LINE_IOCTL, &req);
+            }
+
+            chip->LineInf[gpio].debounce_kernel = req.config.num_attrs;
+
             if (status == 0)
             {
                offsets_p = calloc(1, sizeof(uint32_t));
@@ -1143,15 +1184,28 @@ int lgGpioClaimAlert(
 
                chip->LineInf[gpio].mode = LG_CHIP_BIT_ALERT;
                chip->LineInf[gpio].eFlags = eFlags;
+               chip->LineInf[gpio].alert_flags = flags;
                chip->LineInf[gpio].group_size = 1;
                chip->LineInf[gpio].fd = req.fd;
                chip->LineInf[gpio].offset = 0;
 
                if ((p = lgGpioGetAlertRec(chip, gpio)) != NULL)
-                  p->active= 0;
+                  lgGpioStopAlertRec(p);
+
+               if (lgGpioCreateAlertRec(
+                  chip, gpio, &chip->LineInf[gpio], nfyHandle) == NULL)
+               {
+                  /* the alert thread can't watch the line, give it up */
 
-               lgGpioCreateAlertRec(
-                  chip, gpio, &chip->LineInf[gpio], nfyHandle);
+                  free(offsets_p);
+                  free(values_p);
+                  chip->LineInf[gpio].offsets_p = NULL;
+                  chip->LineInf[gpio].values_p = NULL;
+                  chip->LineInf[gpio].mode = LG_CHIP_MODE_UNKNOWN;
+                  chip->LineInf[gpio].fd = -1;
+                  close(req.fd);
+                  status = LG_NOT_ENOUGH_MEMORY;
+               }
             }
             else status = LG_BAD_EVENT_REQUEST;
          }
@@ -1286,6 +1340,40 @@ int lgTxRoom(int handle, int gpio, int kind)
    return status;
 }
 
+int lgTxJitter(int handle, int gpio, int kind, lgTxStats_p txStats)
+{
+   lgChipObj_p chip;
+   lgTxRec_p p;
+   int status;
+
+   LG_DBG(LG_DEBUG_TRACE, "handle=%d gpio=%d kind=%d", handle, gpio, kind);
+
+   if ((kind != LG_TX_PWM) && (kind != LG_TX_WAVE))
+      PARAM_ERROR(LG_BAD_TX_TYPE, "bad tx kind (%d)", kind);
+
+   status = lgHdlGetLockedObj(handle, LG_HDL_TYPE_GPIO, (void **)&chip);
+
+   if (status == LG_OKAY)
+   {
+      if (gpio < chip->lines)
+      {
+         lgPthTxLock();
+
+         if (((p = lgGpioGetTxRec(chip, gpio, kind)) != NULL) && p->active)
+            *txStats = p->stats;
+         else
+            memset(txStats, 0, sizeof(lgTxStats_t));
+
+         lgPthTxUnlock();
+      }
+      else status = LG_BAD_GPIO_NUMBER;
+
+      lgHdlUnlock(handle);
+   }
+
+   return status;
+}
+
 int lgTxPwm(
    int handle,
    int gpio,
@@ -1561,6 +1649,7 @@ int lgGpioSetDebounce(int handle, int gpio, int debounce_us)
    lgLineInf_p GPIO;
    lgChipObj_p chip;
    lgAlertRec_p p;
+   struct gpio_v2_line_config cfg;
 
    LG_DBG(LG_DEBUG_TRACE, "handle=%d gpio=%d debounce_us=%d",
       handle, gpio, debounce_us);
@@ -1578,8 +1667,38 @@ int lgGpioSetDebounce(int handle, int gpio, int debounce_us)
 
          GPIO->debounce_us = debounce_us;
 
+         if (GPIO->mode & LG_CHIP_BIT_ALERT)
+         {
+            /* reconfigure the line for kernel debounce */
+
+            memset(&cfg, 0, sizeof(cfg));
+
+            cfg.flags = GPIO->alert_flags;
+
+            xMakeDebounce(&cfg, debounce_us);
+
+            if (ioctl(GPIO->fd, GPIO_V2_LINE_SET_CONFIG_IOCTL, &cfg) == 0)
+               GPIO->debounce_kernel = cfg.num_attrs;
+            else
+            {
+               /* clear any earlier kernel debounce, debounce here */
+
+               cfg.num_attrs = 0;
+
+               ioctl(GPIO->fd, GPIO_V2_LINE_SET_CONFIG_IOCTL, &cfg);
+
+               GPIO->debounce_kernel = 0;
+            }
+         }
+
          if ((p = lgGpioGetAlertRec(chip, gpio)) != NULL)
-            p->debounce_nanos = debounce_us * 1e3;
+         {
+            if (GPIO->debounce_kernel)
+               lgGpioSetAlertTiming(p, 0, GPIO->watchdog_us * 1e3);
+            else
+               lgGpioSetAlertTiming(
+                  p, debounce_us * 1e3, GPIO->watchdog_us * 1e3);
+         }
       }
       else status = LG_BAD_GPIO_NUMBER;
 
@@ -1613,7 +1732,13 @@ int lgGpioSetWatchdog(int handle, int gpio, int watchdog_us)
          GPIO->watchdog_us = watchdog_us;
 
          if ((p = lgGpioGetAlertRec(chip, gpio)) != NULL)
-            p->watchdog_nanos = watchdog_us * 1e3;
+         {
+            if (GPIO->debounce_kernel)
+               lgGpioSetAlertTiming(p, 0, watchdog_us * 1e3);
+            else
+               lgGpioSetAlertTiming(
+                  p, GPIO->debounce_us * 1e3, watchdog_us * 1e3);
+         }
       }
       else status = LG_BAD_GPIO_NUMBER;
 
@@ -1623,6 +1748,50 @@ int lgGpioSetWatchdog(int handle, int gpio, int watchdog_us)
    return status;
 }
 
+int lgGpioSetEventBuffer(int handle, int gpio, int eventBuffer)
+{
+   int status;
+   lgChipObj_p chip;
+
+   LG_DBG(LG_DEBUG_TRACE, "handle=%d gpio=%d eventBuffer=%d",
+      handle, gpio, eventBuffer);
+
+   if ((eventBuffer < 0) || (eventBuffer > LG_MAX_EVENT_BUFFER))
+      PARAM_ERROR(LG_BAD_EVENT_BUFFER, "bad event buffer (%d)", eventBuffer);
+
+   status = lgHdlGetLockedObj(handle, LG_HDL_TYPE_GPIO, (void **)&chip);
+
+   if (status == LG_OKAY)
+   {
+      if (gpio < chip->lines) chip->LineInf[gpio].event_buffer = eventBuffer;
+      else status = LG_BAD_GPIO_NUMBER;
+
+      lgHdlUnlock(handle);
+   }
+
+   return status;
+}
+
+int lgGpioGetEdgeStats(int handle, int gpio, lgEdgeStats_p edgeStats)
+{
+   int status;
+   lgChipObj_p chip;
+
+   LG_DBG(LG_DEBUG_TRACE, "handle=%d gpio=%d", handle, gpio);
+
+   status = lgHdlGetLockedObj(handle, LG_HDL_TYPE_GPIO, (void **)&chip);
+
+   if (status == LG_OKAY)
+   {
+      if (gpio < chip->lines) lgGpioGetAlertStats(chip, gpio, edgeStats);
+      else status = LG_BAD_GPIO_NUMBER;
+
+      lgHdlUnlock(handle);
+   }
+
+   return status;
+}
+
 int lgGpioSetAlertsFunc(
    int handle, int gpio, lgGpioAlertsFunc_t cbf, void *userdata)
 {
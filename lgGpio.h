@@ -38,7 +38,10 @@ typedef struct lgLineInf_s
    int      group_size;
    int      fd;
    int      debounce_us;
+   int      debounce_kernel; /* debounce done by the kernel */
    int      watchdog_us;
+   int      event_buffer;    /* kernel events queued, 0 for default */
+   uint64_t alert_flags;     /* kernel line flags of an alert */
    lgGpioAlertsFunc_t alertFunc;
    void     *userdata;
    uint32_t offset;
@@ -39,7 +39,6 @@ For more information, please refer to <http://unlicense.org/>
 #define LG_HDL_FREE 0
 #define LG_HDL_RSVD 1
 
-#define LG_HDL_SLOTS 1024
 
 typedef struct
 {
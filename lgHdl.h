@@ -41,6 +41,8 @@ For more information, please refer to <http://unlicense.org/>
 #define LG_HDL_TYPE_SCRIPT 6
 #define LG_HDL_TYPE_SPI    7
 
+#define LG_HDL_SLOTS 1024
+
 int lgHdlAlloc
    (int type, int objSize, void **objPtr, destructor_t destructor);
 
@@ -31,6 +31,7 @@ For more information, please refer to <http://unlicense.org/>
 #include <unistd.h>
 #include <sys/types.h>
 #include <sys/stat.h>
+#include <sys/mman.h>
 #include <fcntl.h>
 #include <pthread.h>
 #include <limits.h>
@@ -57,12 +58,22 @@ static void xCreatePipe(const char *name, int perm)
 
 static void _notifyClose(lgNotify_t *h)
 {
-   char fifo[128];
+   char fifo[LG_MAX_PATH];
 
    LG_DBG(LG_DEBUG_INTERNAL, "fd=%d pipe_no=%d objp=*%p",
       h->fd, h->pipe_number, h);
 
    if (h->fd >= 0) close(h->fd);
+
+   if (h->pend != NULL) free(h->pend);
+
+   if (h->ring != NULL)
+   {
+      munmap(h->ring, h->ring_bytes);
+      snprintf(fifo, sizeof(fifo), "%s/.lgd-nfy%d.ring",
+         lguGetWorkDir(), h->pipe_number-1);
+      unlink(fifo);
+   }
    
    if (h->pipe_number)
    {
@@ -171,12 +182,84 @@ int lgNotifyOpen(void)
 
 /* ----------------------------------------------------------------------- */
 
-int lgNotifyOpenInBand(int fd)
+int lgNotifyOpenRing(int records)
+{
+   int fd, bytes;
+   char name[LG_MAX_PATH];
+   lgNotifyRing_t *ring;
+   lgNotify_t *h;
+   int handle;
+   int status;
+
+   LG_DBG(LG_DEBUG_TRACE, "records=%d", records);
+
+   if ((records < LG_MIN_NOTIFY_RING) ||
+       (records > LG_MAX_NOTIFY_RING) ||
+       (records & (records - 1)))
+      PARAM_ERROR(LG_BAD_RING_SIZE, "bad ring size (%d)", records);
+
+   /* the pipe is kept to signal readers */
+
+   handle = lgNotifyOpenWithSize(0);
+
+   if (handle < 0) return handle;
+
+   snprintf(name, sizeof(name), "%s/.lgd-nfy%d.ring",
+      lguGetWorkDir(), handle);
+
+   bytes = sizeof(lgNotifyRing_t) + (records * sizeof(lgGpioReport_t));
+
+   ring = MAP_FAILED;
+
+   fd = open(name, O_RDWR|O_CREAT|O_TRUNC, 0664);
+
+   if (fd >= 0)
+   {
+      if ((fchmod(fd, 0664) == 0) && (ftruncate(fd, bytes) == 0))
+      {
+         ring = mmap(NULL, bytes, PROT_READ|PROT_WRITE, MAP_SHARED, fd, 0);
+      }
+
+      close(fd);
+   }
+
+   if (ring == MAP_FAILED)
+   {
+      unlink(name);
+      lgNotifyClose(handle);
+      PARAM_ERROR(LG_BAD_PATHNAME, "ring %s failed (%m)", name);
+   }
+
+   ring->magic = LG_NOTIFY_RING_MAGIC;
+   ring->records = records;
+
+   status = lgHdlGetLockedObj(handle, LG_HDL_TYPE_NOTIFY, (void **)&h);
+
+   if (status == LG_OKAY)
+   {
+      h->ring = ring;
+      h->ring_bytes = bytes;
+
+      lgHdlUnlock(handle);
+   }
+   else
+   {
+      munmap(ring, bytes);
+      unlink(name);
+      return status;
+   }
+
+   return handle;
+}
+
+/* ----------------------------------------------------------------------- */
+
+int lgNotifyOpenInBandWithLatency(int fd, int latencyMicros)
 {
    int handle;
    lgNotify_t *h;
 
-   LG_DBG(LG_DEBUG_TRACE, "fd=%d", fd);
+   LG_DBG(LG_DEBUG_TRACE, "fd=%d latencyMicros=%d", fd, latencyMicros);
 
    handle = lgHdlAlloc(
       LG_HDL_TYPE_NOTIFY, sizeof(lgNotify_t), (void**)&h,
@@ -187,6 +270,23 @@ int lgNotifyOpenInBand(int fd)
    h->fd = fd;
    h->pipe_number = 0;
    h->max_emits = MAX_EMITS;
+
+   if (latencyMicros > 0)
+   {
+      /* reports are coalesced for up to latencyMicros */
+
+      h->pend = malloc(sizeof(lgGpioReport_t) * MAX_EMITS);
+
+      if (h->pend == NULL)
+      {
+         h->fd = -1; /* the socket belongs to the caller */
+         lgHdlFree(handle, LG_HDL_TYPE_NOTIFY);
+         return LG_NO_MEMORY;
+      }
+
+      h->latency_micros = latencyMicros;
+   }
+
    h->state = LG_NOTIFY_RUNNING;
 
    //lgNotifyCloseOrphans(handle, fd);
@@ -194,6 +294,11 @@ int lgNotifyOpenInBand(int fd)
    return handle;
 }
 
+int lgNotifyOpenInBand(int fd)
+{
+   return lgNotifyOpenInBandWithLatency(fd, 0);
+}
+
 
 /* ----------------------------------------------------------------------- */
 
@@ -279,3 +384,30 @@ int lgNotifyClose(int handle)
 }
 
 
+/* ----------------------------------------------------------------------- */
+
+int lgNotifyStats(int handle, lgNotifyStats_p nfyStats)
+{
+   int status;
+   lgNotify_t *h;
+
+   LG_DBG(LG_DEBUG_TRACE, "handle=%d nfyStats=*%p", handle, nfyStats);
+
+   status = lgHdlGetLockedObj(handle, LG_HDL_TYPE_NOTIFY, (void **)&h);
+
+   if (status == LG_OKAY)
+   {
+      if (h->state > LG_NOTIFY_CLOSING) *nfyStats = h->stats;
+      else
+      {
+         LG_DBG(LG_DEBUG_USER, "bad handle (%d)", handle);
+         status = LG_BAD_HANDLE;
+      }
+
+      lgHdlUnlock(handle);
+   }
+
+   return status;
+}
+
+
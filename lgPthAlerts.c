@@ -25,44 +25,86 @@ OTHER DEALINGS IN THE SOFTWARE.
 For more information, please refer to <http://unlicense.org/>
 */
 
-#define _GNU_SOURCE /* needed for ppoll */
-
 #include <stdio.h>
 #include <stdlib.h>
 #include <errno.h>
 #include <unistd.h>
 #include <string.h>
-#include <poll.h>
+#include <sys/epoll.h>
+#include <sys/eventfd.h>
+#include <sys/timerfd.h>
 
 #include "lgDbg.h"
 #include "lgHdl.h"
 #include "lgGpio.h"
 #include "lgPthAlerts.h"
 
+/*
+The alert thread waits on a persistent epoll set holding the line
+fd of each alert record, a timerfd, and an eventfd.  Line fds are
+added when a record is created and removed when it is stopped so
+there is no limit on the number of lines which may be watched.
+
+The timerfd is armed for the earliest of the pending debounce and
+watchdog timeouts, the time the oldest buffered alert may be
+emitted, and the time any coalesced notifications must be flushed.
+The thread does not run at all when nothing is due.
+
+The eventfd wakes the thread when a record is stopped so that it
+may be deleted promptly.
+*/
+
 #define LG_MAX_ALERTS 2000
 #define LG_GPIO_MAX_ALERTS_PER_READ 128
+#define LG_ALERT_EPOLL_EVENTS 64
+#define LG_EDGE_AVG_SHIFT 4 /* new measurements weigh 1/16 */
 
 pthread_t pthAlert;
 pthread_mutex_t lgAlertMutex = PTHREAD_MUTEX_INITIALIZER;
 volatile lgAlertRec_p alertRec = NULL;
-pthread_mutex_t lgAlertCondMutex = PTHREAD_MUTEX_INITIALIZER;
-pthread_cond_t lgAlertCond = PTHREAD_COND_INITIALIZER;
 int pthAlertRunning = LG_THREAD_NONE;
 
-lgGpioAlert_t aBuf[LG_MAX_ALERTS];
+/*
+Alerts are gathered in aBuf, one sorted run per line per pass, after
+any held alerts.  They are merged into the other buffer, see
+xAlertMerge, which then becomes aBuf.
+*/
 
-static void xWaitForSignal(pthread_cond_t *cond, pthread_mutex_t *mutex)
+static lgGpioAlert_t aBufs[2][LG_MAX_ALERTS];
+lgGpioAlert_t *aBuf = aBufs[0];
+
+static int aRunPos[LG_MAX_ALERTS]; /* next alert of each run */
+static int aRunEnd[LG_MAX_ALERTS]; /* end of each run */
+static int aRunHeap[LG_MAX_ALERTS]; /* runs ordered by next alert */
+
+static int alertEpollFd = -1;
+static int alertTimerFd = -1;
+static int alertWakeFd = -1;
+static uint64_t alertTimerDue = 0; /* when alertTimerFd is armed for */
+static uint64_t nfyFlushDue = 0;   /* when coalesced reports must be sent */
+
+static void xAlertWake(void)
 {
-   pthread_mutex_lock(mutex);
-   pthread_cond_wait(cond, mutex);
-   pthread_mutex_unlock(mutex);
+   uint64_t one = 1;
+
+   if (write(alertWakeFd, &one, sizeof(one))) ;
 }
 
-void xSendUnwaitSignal(pthread_cond_t *cond, pthread_mutex_t *mutex)
+static void xAlertArm(uint64_t due)
 {
-   pthread_mutex_lock(mutex);
-   pthread_cond_signal(cond);
-   pthread_mutex_unlock(mutex);
+   struct itimerspec its;
+
+   /* due is CLOCK_MONOTONIC nanoseconds, 0 disarms */
+
+   if (due == alertTimerDue) return;
+
+   memset(&its, 0, sizeof(its));
+
+   its.it_value.tv_sec = due / 1000000000;
+   its.it_value.tv_nsec = due % 1000000000;
+
+   if (timerfd_settime(alertTimerFd, TFD_TIMER_ABSTIME, &its, NULL) == 0)
+      alertTimerDue = due;
 }
 
 int tscomp(const void *p1, const void *p2)
@@ -70,7 +112,106 @@ int tscomp(const void *p1, const void *p2)
    const lgGpioAlert_t *e1 = p1;
    const lgGpioAlert_t *e2 = p2;
 
-   return e1->report.timestamp - e2->report.timestamp;
+   if (e1->report.timestamp < e2->report.timestamp) return -1;
+   if (e1->report.timestamp > e2->report.timestamp) return 1;
+   return 0;
+}
+
+static int xRunBefore(int r1, int r2)
+{
+   int diff;
+
+   diff = tscomp(&aBuf[aRunPos[r1]], &aBuf[aRunPos[r2]]);
+
+   if (diff) return diff < 0;
+
+   return r1 < r2; /* keep equal timestamps in arrival order */
+}
+
+static void xRunDown(int runs, int pos)
+{
+   int r = aRunHeap[pos];
+   int child;
+
+   while ((child = (2 * pos) + 1) < runs)
+   {
+      if (((child + 1) < runs) &&
+          xRunBefore(aRunHeap[child+1], aRunHeap[child])) child++;
+
+      if (!xRunBefore(aRunHeap[child], r)) break;
+
+      aRunHeap[pos] = aRunHeap[child];
+      pos = child;
+   }
+
+   aRunHeap[pos] = r;
+}
+
+static void xAlertRoom(int *start, int *count, int need)
+{
+   /*
+   Emitted alerts are left before start.  Reclaim them only when
+   the alerts about to be added might not otherwise fit, so that
+   they never cause an alert to be dropped.
+   */
+
+   if (*start && ((LG_MAX_ALERTS - *count) < need))
+   {
+      memmove(aBuf, aBuf+*start, sizeof(aBuf[0])*(*count-*start));
+      *count -= *start;
+      *start = 0;
+   }
+}
+
+static void xAlertMerge(int *start, int *count)
+{
+   lgGpioAlert_t *out;
+   int runs, r, i, n;
+
+   /*
+   Each line's alerts arrive in time order and the held alerts are
+   already sorted so aBuf[start..count) is a few sorted runs.  The
+   runs are found and merged through a heap of their next alerts.
+   */
+
+   runs = 0;
+
+   for (i=*start; i<*count; i++)
+   {
+      if ((i == *start) ||
+          (aBuf[i].report.timestamp < aBuf[i-1].report.timestamp))
+      {
+         if (runs) aRunEnd[runs-1] = i;
+         aRunPos[runs++] = i;
+      }
+   }
+
+   if (runs < 2) return; /* already in order */
+
+   aRunEnd[runs-1] = *count;
+
+   for (r=0; r<runs; r++) aRunHeap[r] = r;
+
+   for (r=(runs/2)-1; r>=0; r--) xRunDown(runs, r);
+
+   if (aBuf == aBufs[0]) out = aBufs[1]; else out = aBufs[0];
+
+   n = 0;
+
+   while (runs)
+   {
+      r = aRunHeap[0];
+
+      out[n++] = aBuf[aRunPos[r]++];
+
+      if (aRunPos[r] == aRunEnd[r]) aRunHeap[0] = aRunHeap[--runs];
+
+      if (runs) xRunDown(runs, 0);
+   }
+
+   aBuf = out;
+   *start = 0;
+   *count = n;
 }
 
 uint64_t xMonotonicTimestamp(void)
@@ -82,166 +223,238 @@ uint64_t xMonotonicTimestamp(void)
    return ((uint64_t)1E9 * xts.tv_sec) + xts.tv_nsec;
 }
 
-void emitNotifications(int count)
+static void xNotifyWrite(lgNotify_t *h, lgGpioReport_t *report, int emit)
 {
-   static int maxHandles = 20;
-   static int *handles = NULL;
-   lgGpioReport_t report[LG_MAX_ALERTS];
+   int sent;
+   int chunk;
+   int err;
+
+   sent = 0;
+
+   while (emit > 0)
+   {
+      if (emit > h->max_emits) chunk = h->max_emits; else chunk = emit;
+
+      err = write(h->fd, report+sent, chunk*sizeof(lgGpioReport_t));
+
+      if (err != (chunk*sizeof(lgGpioReport_t)))
+      {
+         if (err < 0)
+         {
+            if ((errno != EAGAIN) && (errno != EWOULDBLOCK))
+            {
+               /* serious error, no point continuing */
+
+               LG_DBG(LG_DEBUG_ALWAYS, "fd=%d err=%d errno=%d",
+                  h->fd, err, errno);
+
+               LG_DBG(LG_DEBUG_ALWAYS, "%s", strerror(errno));
+
+               h->stats.dropped += emit;
+               h->state = LG_NOTIFY_CLOSING;
+               return;
+            }
+
+            h->stats.fullWrites++;
+            h->stats.dropped += chunk;
+         }
+         else
+         {
+            h->stats.shortWrites++;
+            h->stats.reports += err / sizeof(lgGpioReport_t);
+            h->stats.dropped += chunk - (err / sizeof(lgGpioReport_t));
+
+            LG_DBG(LG_DEBUG_ALWAYS, "sent %zd, asked for %d",
+               err/sizeof(lgGpioReport_t), chunk);
+         }
+      }
+      else
+      {
+         h->stats.writes++;
+         h->stats.reports += chunk;
+      }
+
+      sent += chunk;
+      emit -= chunk;
+   }
+}
+
+static void xNotifyCoalesce(
+   lgNotify_t *h, lgGpioReport_t *report, int emit, int flush)
+{
+   uint64_t now;
+   int d;
+
+   /*
+   Reports are held until a full block has been gathered or the
+   oldest has waited latency_micros.  This trades latency for
+   fewer, larger writes.
+   */
+
+   now = xMonotonicTimestamp();
+
+   for (d=0; d<emit; d++)
+   {
+      if (!h->pending) h->pending_ts = now;
+
+      h->pend[h->pending++] = report[d];
+
+      if (h->pending == h->max_emits)
+      {
+         xNotifyWrite(h, h->pend, h->pending);
+         h->pending = 0;
+      }
+   }
+
+   if (h->pending &&
+      (flush || ((now - h->pending_ts) >= (h->latency_micros * 1000ULL))))
+   {
+      xNotifyWrite(h, h->pend, h->pending);
+      h->pending = 0;
+   }
+}
+
+static void xNotifyRing(lgNotify_t *h, lgGpioReport_t *report, int emit)
+{
+   lgNotifyRing_t *r = h->ring;
+   uint64_t head = r->head;
+   uint32_t mask = r->records - 1;
+   int d;
+
+   /* readers must see the new reserve before the reports change */
+
+   __atomic_store_n(&r->reserve, head + emit, __ATOMIC_RELAXED);
+   __atomic_thread_fence(__ATOMIC_RELEASE);
+
+   for (d=0; d<emit; d++) r->report[(head + d) & mask] = report[d];
+
+   /* readers must see the reports before the new head */
+
+   __atomic_store_n(&r->head, head + emit, __ATOMIC_RELEASE);
+
+   h->stats.reports += emit;
+   h->stats.writes++;
+
+   /* wake any reader, a full pipe already signals */
+
+   if (write(h->fd, "", 1)) ;
+}
+
+void emitNotifications(lgGpioAlert_p alerts, int count, int flush)
+{
+   static int handles[LG_HDL_SLOTS];
+   static int nfyCount[LG_HDL_SLOTS]; /* reports for each handle */
+   static int nfyFirst[LG_HDL_SLOTS]; /* start of each handle's reports */
+   static int touched[LG_HDL_SLOTS];  /* handles with reports */
+   static lgGpioReport_t report[LG_MAX_ALERTS];
    int numHandles;
+   int numTouched;
    int i;
    int status;
    lgNotify_t *h;
    int emit;
    int d;
-   int sent;
-   int max_emits;
-   int err;
+   int n;
+   uint64_t due;
 
-   if (handles == NULL) handles = malloc(sizeof(int) * maxHandles);
+   nfyFlushDue = 0;
 
-   numHandles = lgHdlGetHandlesForType(
-      LG_HDL_TYPE_NOTIFY, handles, maxHandles);
-   
-   if (numHandles > maxHandles)
+   /*
+   Route the reports to their handles in one pass, a counting sort
+   on the notification handle which keeps the time order of each
+   handle's reports.
+   */
+
+   numTouched = 0;
+
+   for (d=0; d<count; d++)
+   {
+      n = alerts[d].nfyHandle;
+
+      if ((n >= 0) && (n < LG_HDL_SLOTS))
+      {
+         if (!nfyCount[n]++) touched[numTouched++] = n;
+      }
+   }
+
+   emit = 0;
+
+   for (i=0; i<numTouched; i++)
    {
-      LG_DBG(LG_DEBUG_ALWAYS, "too many notifications");
-      numHandles = maxHandles;
+      n = touched[i];
+      nfyFirst[n] = emit;
+      emit += nfyCount[n];
+      nfyCount[n] = 0; /* refilled below */
    }
 
+   for (d=0; d<count; d++)
+   {
+      n = alerts[d].nfyHandle;
+
+      if ((n >= 0) && (n < LG_HDL_SLOTS))
+         report[nfyFirst[n] + nfyCount[n]++] = alerts[d].report;
+   }
+
+   numHandles = lgHdlGetHandlesForType(
+      LG_HDL_TYPE_NOTIFY, handles, LG_HDL_SLOTS);
+
    for (i=0; i<numHandles; i++)
    {
+      n = handles[i];
+
       status = lgHdlGetLockedObjTrusted(
-         handles[i], LG_HDL_TYPE_NOTIFY, (void **)&h);
+         n, LG_HDL_TYPE_NOTIFY, (void **)&h);
       
       if (status < 0) continue;
 
       if (h->state == LG_NOTIFY_CLOSING)
       {
-         lgHdlFree(handles[i], LG_HDL_TYPE_NOTIFY);
+         lgHdlFree(n, LG_HDL_TYPE_NOTIFY);
       }
       else if (h->state >= LG_NOTIFY_RUNNING)
       {
          emit = 0;
 
-         if (h->state == LG_NOTIFY_RUNNING)
+         if (h->state == LG_NOTIFY_RUNNING) emit = nfyCount[n];
+
+         if (h->ring != NULL)
          {
-            for (d=0; d<count; d++)
-            {
-               /* is this for this notify handle? */
-               if (handles[i] == aBuf[d].nfyHandle)
-               {
-                  report[emit] = aBuf[d].report;
-                  emit++;
-               }
-            }
+            if (emit) xNotifyRing(h, report+nfyFirst[n], emit);
          }
-
-         if (emit)
+         else if (h->pend != NULL)
          {
-            max_emits = h->max_emits;
-
-            sent = 0;
+            xNotifyCoalesce(h, report+nfyFirst[n], emit, flush);
 
-            while (emit > 0)
+            if (h->pending)
             {
-               if (emit > max_emits)
-               {
-                  err = write(h->fd,
-                           report+sent,
-                           max_emits*sizeof(lgGpioReport_t));
-
-                  if (err != (max_emits*sizeof(lgGpioReport_t)))
-                  {
-                     if (err < 0)
-                     {
-                        if ((errno != EAGAIN) && (errno != EWOULDBLOCK))
-                        {
-                           /* serious error, no point continuing */
-
-                           LG_DBG(LG_DEBUG_ALWAYS, "fd=%d err=%d errno=%d",
-                              h->fd, err, errno);
-
-                           LG_DBG(LG_DEBUG_ALWAYS, "%s", strerror(errno));
-
-                           h->state = LG_NOTIFY_CLOSING;
-                           break;
-                        }
-                        //else gpioStats.wouldBlockPipeWrite++;
-                     }
-                     else
-                     {
-                        //gpioStats.shortPipeWrite++;
-                        LG_DBG(LG_DEBUG_ALWAYS, "sent %zd, asked for %d",
-                           err/sizeof(lgGpioReport_t), max_emits);
-                     }
-                  }
-                  else
-                  {
-                     //gpioStats.goodPipeWrite++;
-                  }
-
-                  sent += max_emits;
-                  emit    -= max_emits;
-               }
-               else
-               {
-                  err = write(h->fd,
-                           report+sent,
-                           emit*sizeof(lgGpioReport_t));
-
-                  if (err != (emit*sizeof(lgGpioReport_t)))
-                  {
-                     if (err < 0)
-                     {
-                        if ((errno != EAGAIN) && (errno != EWOULDBLOCK))
-                        {
-                           LG_DBG(LG_DEBUG_ALWAYS, "fd=%d err=%d errno=%d",
-                              h->fd, err, errno);
-
-                           LG_DBG(LG_DEBUG_ALWAYS, "%s", strerror(errno));
-
-                           /* serious error, no point continuing */
-                           h->state = LG_NOTIFY_CLOSING;
-                           break;
-                        }
-                        //else gpioStats.wouldBlockPipeWrite++;
-                     }
-                     else
-                     {
-                        //gpioStats.shortPipeWrite++;
-                        LG_DBG(LG_DEBUG_ALWAYS, "sent %zd, asked for %d",
-                           err/sizeof(lgGpioReport_t), emit);
-                     }
-                  }
-                  else
-                  {
-                     //gpioStats.goodPipeWrite++;
-                  }
-
-                  sent += emit;
-                  emit = 0;
-               }
+               due = h->pending_ts + (h->latency_micros * 1000ULL);
+               if ((nfyFlushDue == 0) || (due < nfyFlushDue))
+                  nfyFlushDue = due;
             }
          }
+
+         else if (emit) xNotifyWrite(h, report+nfyFirst[n], emit);
       }
 
-      lgHdlUnlock(handles[i]);
+      lgHdlUnlock(n);
    }
+
+   for (i=0; i<numTouched; i++) nfyCount[touched[i]] = 0;
 }
 
-int emit(int count, uint64_t tmax)
+int emit(lgGpioAlert_p alerts, int count, uint64_t tmax)
 {
    int i;
 
    for (i=0; i<count; i++)
    {
-      if (aBuf[i].report.timestamp > tmax) break;
+      if (alerts[i].report.timestamp > tmax) break;
    }
  
    if (lgGpioSamplesFunc)
-      (lgGpioSamplesFunc)(i, aBuf, lgGpioSamplesUserdata);
+      (lgGpioSamplesFunc)(i, alerts, lgGpioSamplesUserdata);
    
-   emitNotifications(i);
+   emitNotifications(alerts, i, tmax == (uint64_t)-1);
 
    return i;
 }
@@ -418,13 +631,96 @@ void xDebWatEvt(
    }
 }
 
+static uint64_t xEdgeAvg(uint64_t avg, uint64_t val)
+{
+   if (avg == 0) return val;
+
+   return avg + (((int64_t)val - (int64_t)avg) >> LG_EDGE_AVG_SHIFT);
+}
+
+static void xEdgeStats(lgAlertRec_p p, struct gpio_v2_line_event *ep, int n)
+{
+   int i;
+   lgEdgeStats_p s = &p->stats;
+
+   /*
+   Count the edges and time the periods of a read.  Readers copy
+   the statistics without blocking this thread and retry if
+   stats_seq shows they were being written.
+   */
+
+   __atomic_store_n(&p->stats_seq, p->stats_seq + 1, __ATOMIC_RELAXED);
+   __atomic_thread_fence(__ATOMIC_RELEASE);
+
+   for (i=0; i<n; i++)
+   {
+      if (ep[i].line_seqno > (p->last_seqno + 1))
+      {
+         /* don't time across the lost edges */
+
+         s->lost += ep[i].line_seqno - p->last_seqno - 1;
+         p->last_rise_ts = 0;
+      }
+
+      p->last_seqno = ep[i].line_seqno;
+
+      if (ep[i].id == GPIO_V2_LINE_EVENT_RISING_EDGE)
+      {
+         s->rising++;
+
+         if (p->last_rise_ts)
+         {
+            s->period = ep[i].timestamp_ns - p->last_rise_ts;
+            s->periodAvg = xEdgeAvg(s->periodAvg, s->period);
+         }
+
+         p->last_rise_ts = ep[i].timestamp_ns;
+      }
+      else
+      {
+         s->falling++;
+
+         if (p->last_rise_ts && (p->last_rise_ts == s->timestamp))
+         {
+            /* the previous edge was rising */
+
+            s->high = ep[i].timestamp_ns - p->last_rise_ts;
+            s->highAvg = xEdgeAvg(s->highAvg, s->high);
+         }
+      }
+
+      s->timestamp = ep[i].timestamp_ns;
+   }
+
+   __atomic_store_n(&p->stats_seq, p->stats_seq + 1, __ATOMIC_RELEASE);
+}
+
+static void xAlertDue(lgAlertRec_p p, uint64_t *due)
+{
+   uint64_t t;
+
+   /* the kernel time at which xDebWatEvt has work for p */
+
+   if (p->debounce_nanos && !p->debounced)
+   {
+      t = p->last_evt_ts + p->debounce_nanos + 50001;
+      if ((*due == 0) || (t < *due)) *due = t;
+   }
+
+   if (p->watchdog_nanos && !p->watchdogd)
+   {
+      t = p->last_rpt_ts + p->watchdog_nanos + 50001;
+      if ((*due == 0) || (t < *due)) *due = t;
+   }
+}
+
 void *lgPthAlert(void)
 {
-   lgAlertRec_p p, t;
+   lgAlertRec_p p, t, recs;
    int i, e;
-   int num_gpio;
+   int num_events;
    int gpiobasecount;
-   int retval;
+   int start=0; /* held alerts are aBuf[start..count) */
    int count=0;
    int sent;
    int bytes;
@@ -432,195 +728,221 @@ void *lgPthAlert(void)
    uint64_t lastLT=0;
    uint64_t nowLT;
    uint64_t nowGT;
-   struct pollfd pfd[64];
-   lgAlertRec_p pAlertRec[64];
+   uint64_t dueGT;
+   uint64_t due;
+   uint64_t expirations;
+   struct epoll_event events[LG_ALERT_EPOLL_EVENTS];
    struct gpio_v2_line_event eIn[LG_GPIO_MAX_ALERTS_PER_READ];
-   struct timespec tspec = {0, 5e5}; /* 0.5 ms timeout */
 
    while (1)
    {
-      pthread_mutex_lock(&lgAlertMutex);
+      num_events = epoll_wait(
+         alertEpollFd, events, LG_ALERT_EPOLL_EVENTS, -1);
 
-      if (alertRec != NULL)
+      if (num_events < 0)
       {
-         p = alertRec;
-         i = 0;
+         if (errno != EINTR)
+            LG_DBG(LG_DEBUG_ALWAYS, "epoll_wait error %d (%s)",
+               errno, strerror(errno));
 
-         /* poll active alerts */
+         num_events = 0;
+      }
+
+      nowLT = xMonotonicTimestamp();
 
-         while (p != NULL)
+      for (i=0; i<num_events; i++)
+      {
+         if (events[i].data.ptr == &alertTimerFd)
          {
-            if (p->active)
-            {
-               pfd[i].fd= p->state->fd;
-               pfd[i].events = POLLIN|POLLPRI;
-               pAlertRec[i] = p;
-               i++;
-            }
-            else
-            {
-               /* delete inactive record */
+            if (read(alertTimerFd, &expirations, sizeof(expirations))) ;
+            alertTimerDue = 0; /* expired, rearm even if unchanged */
+            continue;
+         }
 
-               if (p->prev) p->prev->next = p->next;
-               else alertRec = p->next;
+         if (events[i].data.ptr == &alertWakeFd)
+         {
+            if (read(alertWakeFd, &expirations, sizeof(expirations))) ;
+            continue;
+         }
 
-               if (p->next) p->next->prev = p->prev;
+         p = events[i].data.ptr;
 
-               t = p; p = p->prev; free(t);
-            }
+         if (!p->active) continue;
 
-            if (p) p = p->next;
-         }
+         /* a read may add an edge and a timeout for each event */
 
-         num_gpio = i;
+         xAlertRoom(&start, &count, 2*LG_GPIO_MAX_ALERTS_PER_READ);
 
-         pthread_mutex_unlock(&lgAlertMutex);
+         gpiobasecount = count;
 
-         if (num_gpio > 0)
-         {
-            retval = ppoll(pfd, num_gpio, &tspec, NULL);
+         /* GPIO changed */
 
-            nowLT = xMonotonicTimestamp();
+         bytes = read(p->fd, &eIn, sizeof(eIn));
 
-            for (i=0; i<num_gpio; i++)
-            {
-               gpiobasecount = count;
+         if (bytes > 0)
+         {
+            e = 0;
 
-               p = pAlertRec[i];
+            while (bytes >= sizeof(eIn[0]))
+            {
+               /* debounce and watchdog */
+               xDebWatEvt(p, eIn[e].timestamp_ns, &count, &eIn[e]);
 
-               if ((retval > 0) && (pfd[i].revents))
-               {
-                  /* GPIO changed during ppoll */
-
-                  bytes = read(pfd[i].fd, &eIn, sizeof(eIn));
-
-                  if (bytes > 0)
-                  {
-                     e = 0;
-
-                     while (bytes >= sizeof(eIn[0]))
-                     {
-                        /* debounce and watchdog */
-                        xDebWatEvt(p, eIn[e].timestamp_ns, &count, &eIn[e]);
-
-                        bytes -= sizeof(eIn[0]);
-
-                        e++;
-                     }
-
-                     if (e)
-                     {
-                        p->last_rpt_ts = eIn[e-1].timestamp_ns;
-
-                        if (eIn[e-1].timestamp_ns > lastGT)
-                        {
-                           lastGT = eIn[e-1].timestamp_ns;
-                           lastLT = nowLT;
-                        }
-                     }
-
-                     if (bytes)
-                     {
-                        if (p->active)
-                           LG_DBG(LG_DEBUG_ALWAYS, "bytes left=%d (%s)",
-                              bytes, strerror(errno));
-                     }
-                  }
-                  else
-                  {
-                     if (p->active)
-                        LG_DBG(LG_DEBUG_ALWAYS, "read error %d (%s)",
-                           errno, strerror(errno));
-                  }
-               }
+               bytes -= sizeof(eIn[0]);
 
-               if (gpiobasecount < count)
-               {
-                  if (p->state->alertFunc)
-                  {
-                     (p->state->alertFunc)(count-gpiobasecount,
-                        &aBuf[gpiobasecount], p->state->userdata);
-                  }
-               }
+               e++;
             }
 
-            nowGT = lastGT + (nowLT - lastLT);
+            if (e)
+            {
+               xEdgeStats(p, eIn, e);
 
-            // LG_DBG(LG_DEBUG_ALWAYS, "ts=%"PRIu64"", nowGT/100000);
+               p->last_rpt_ts = eIn[e-1].timestamp_ns;
 
-            if (lastGT)
-            {
-               for (i=0; i<num_gpio; i++)
+               if (eIn[e-1].timestamp_ns > lastGT)
                {
-                  gpiobasecount = count;
-
-                  p = pAlertRec[i];
-
-                  // The 50 microsecond leeway is to make sure the
-                  // kernel has supplied current data for all GPIO
-                  // before timing out debounce and watchdogs.
-                  xDebWatEvt(p, nowGT-50000, &count, NULL);
-
-                  if (gpiobasecount < count)
-                  {
-                     if (p->state->alertFunc)
-                     {
-                        (p->state->alertFunc)(count-gpiobasecount,
-                           &aBuf[gpiobasecount], p->state->userdata);
-                     }
-                  }
+                  lastGT = eIn[e-1].timestamp_ns;
+                  lastLT = nowLT;
                }
             }
 
-            if (count > 1)
+            if (bytes)
             {
-               /*
-               LG_DBG(LG_DEBUG_ALWAYS, "nowGT=%"PRIu64" count=%d",
-                  nowGT/100000, count);
-               */
-               // printbuf(count, "pre qsort");
-               qsort(aBuf, count, sizeof(aBuf[0]), tscomp);
-               //lgcheck(count, "check post qsort");
-               // printbuf(count, "post qsort");
+               if (p->active)
+                  LG_DBG(LG_DEBUG_ALWAYS, "bytes left=%d (%s)",
+                     bytes, strerror(errno));
             }
+         }
+         else
+         {
+            if (p->active && (errno != EAGAIN))
+               LG_DBG(LG_DEBUG_ALWAYS, "read error %d (%s)",
+                  errno, strerror(errno));
+         }
+
+         if (gpiobasecount < count)
+         {
+            if (p->state->alertFunc)
+            {
+               (p->state->alertFunc)(count-gpiobasecount,
+                  &aBuf[gpiobasecount], p->state->userdata);
+            }
+         }
+      }
+
+      pthread_mutex_lock(&lgAlertMutex);
+
+      /* delete inactive records, they are no longer in the epoll set */
+
+      p = alertRec;
+
+      while (p != NULL)
+      {
+         if (!p->active)
+         {
+            if (p->prev) p->prev->next = p->next;
+            else alertRec = p->next;
+
+            if (p->next) p->next->prev = p->prev;
+
+            t = p; p = p->next; free(t);
+         }
+         else p = p->next;
+      }
+
+      recs = alertRec;
+
+      pthread_mutex_unlock(&lgAlertMutex);
+
+      /*
+      Only this thread unlinks records so the list from recs may
+      be walked without the lock.  Records added since are picked
+      up on the next wake.
+      */
+
+      if (recs == NULL) /* no alerts */
+      {
+         emit(aBuf+start, count-start, -1); /* empty the buffer */
+         start = 0;
+         count = 0;
+         lastGT = 0;
+
+         xAlertArm(nfyFlushDue);
+
+         continue;
+      }
+
+      nowGT = lastGT + (nowLT - lastLT);
+
+      // LG_DBG(LG_DEBUG_ALWAYS, "ts=%"PRIu64"", nowGT/100000);
+
+      dueGT = 0;
+
+      for (p=recs; p!=NULL; p=p->next)
+      {
+         if (!p->active) continue;
+
+         if (lastGT)
+         {
+            xAlertRoom(&start, &count, 2);
 
-            /* emit any due alerts */
+            gpiobasecount = count;
 
-            // printbuf(count, "pre emit");
-            // delay 500 microseconds before reporting a GPIO
-            // to make sure the events are sorted in time order.
-            sent = emit(count, nowGT-500000);
+            // The 50 microsecond leeway is to make sure the
+            // kernel has supplied current data for all GPIO
+            // before timing out debounce and watchdogs.
+            xDebWatEvt(p, nowGT-50000, &count, NULL);
 
-            if (sent)
+            if (gpiobasecount < count)
             {
-               if (sent != count)
+               if (p->state->alertFunc)
                {
-                  /* shuffle entries down */
-                  memmove(aBuf, aBuf+sent, sizeof(aBuf[0])*(count-sent));
+                  (p->state->alertFunc)(count-gpiobasecount,
+                     &aBuf[gpiobasecount], p->state->userdata);
                }
-               count -= sent;
             }
-            //printbuf(count, "post emit");
-         }
-         else /* no active alerts */
-         {
-            emit(count, -1); /* empty the buffer */
-            count = 0;
-            lastGT = 0;
 
-            xWaitForSignal(&lgAlertCond, &lgAlertCondMutex);
+            xAlertDue(p, &dueGT);
          }
       }
-      else /* no alerts */
-      {
-         pthread_mutex_unlock(&lgAlertMutex);
 
-         emit(count, -1); /* empty the buffer */
+      /* merge the new alerts into time order */
+
+      xAlertMerge(&start, &count);
+
+      /* emit any due alerts */
+
+      // printbuf(count, "pre emit");
+      // delay 500 microseconds before reporting a GPIO
+      // to make sure the events are sorted in time order.
+      sent = emit(aBuf+start, count-start, nowGT-500000);
+
+      start += sent;
+
+      if (start == count)
+      {
+         start = 0;
          count = 0;
-         lastGT = 0;
+      }
+      //printbuf(count, "post emit");
+
+      /* sleep until something is due */
 
-         xWaitForSignal(&lgAlertCond, &lgAlertCondMutex);
+      if (count)
+      {
+         if ((dueGT == 0) || ((aBuf[start].report.timestamp + 500000) < dueGT))
+            dueGT = aBuf[start].report.timestamp + 500000;
       }
+
+      due = nfyFlushDue;
+
+      if (dueGT)
+      {
+         dueGT = dueGT - lastGT + lastLT; /* kernel to monotonic time */
+         if ((due == 0) || (dueGT < due)) due = dueGT;
+      }
+
+      xAlertArm(due);
    }
 
    pthAlertRunning = LG_THREAD_NONE;
@@ -630,8 +952,40 @@ void *lgPthAlert(void)
 
 void lgPthAlertStart(void)
 {
+   struct epoll_event ev;
+
    if (!pthAlertRunning)
    {
+      if (alertEpollFd < 0)
+      {
+         alertEpollFd = epoll_create1(EPOLL_CLOEXEC);
+         alertTimerFd = timerfd_create(
+            CLOCK_MONOTONIC, TFD_NONBLOCK|TFD_CLOEXEC);
+         alertWakeFd = eventfd(0, EFD_NONBLOCK|EFD_CLOEXEC);
+
+         if ((alertEpollFd < 0) || (alertTimerFd < 0) || (alertWakeFd < 0))
+         {
+            LG_DBG(LG_DEBUG_ALWAYS, "can't create alert fds (%s)",
+               strerror(errno));
+
+            if (alertEpollFd >= 0) close(alertEpollFd);
+            if (alertTimerFd >= 0) close(alertTimerFd);
+            if (alertWakeFd >= 0) close(alertWakeFd);
+
+            alertEpollFd = alertTimerFd = alertWakeFd = -1;
+
+            return;
+         }
+
+         ev.events = EPOLLIN;
+
+         ev.data.ptr = &alertTimerFd;
+         epoll_ctl(alertEpollFd, EPOLL_CTL_ADD, alertTimerFd, &ev);
+
+         ev.data.ptr = &alertWakeFd;
+         epoll_ctl(alertEpollFd, EPOLL_CTL_ADD, alertWakeFd, &ev);
+      }
+
       if (pthread_create(&pthAlert, NULL, (void*)lgPthAlert, NULL) == 0)
       {
          pthread_detach(pthAlert);
@@ -640,18 +994,95 @@ void lgPthAlertStart(void)
    }
 }
 
+static void xStopAlertRec(lgAlertRec_p p)
+{
+   /* called with the alert lock held */
+
+   if (p->active)
+   {
+      p->active = 0;
+      epoll_ctl(alertEpollFd, EPOLL_CTL_DEL, p->fd, NULL);
+   }
+}
+
 void lgPthAlertStop(lgChipObj_p chip)
 {
    lgAlertRec_p evt;
 
    /* stop any alert reads on chip */
-   
+
+   pthread_mutex_lock(&lgAlertMutex);
+
    for (evt=alertRec; evt!=NULL; evt=evt->next)
    {
-      if (chip->handle == evt->chip->handle) evt->active =0;
+      if (chip->handle == evt->chip->handle) xStopAlertRec(evt);
    }
 
-   xSendUnwaitSignal(&lgAlertCond, &lgAlertCondMutex);
+   pthread_mutex_unlock(&lgAlertMutex);
+
+   xAlertWake();
+}
+
+void lgGpioStopAlertRec(lgAlertRec_p p)
+{
+   pthread_mutex_lock(&lgAlertMutex);
+
+   xStopAlertRec(p);
+
+   pthread_mutex_unlock(&lgAlertMutex);
+
+   xAlertWake();
+}
+
+void lgGpioSetAlertTiming(
+   lgAlertRec_p p, int64_t debounce_nanos, int64_t watchdog_nanos)
+{
+   pthread_mutex_lock(&lgAlertMutex);
+
+   p->debounce_nanos = debounce_nanos;
+   p->watchdog_nanos = watchdog_nanos;
+
+   /* restart the watchdog from the last report, if there was one */
+
+   if (p->last_rpt_ts) p->watchdogd = 0;
+
+   /* an edge still pending (debounced 0) is timed by the new debounce */
+
+   pthread_mutex_unlock(&lgAlertMutex);
+
+   /* the alert thread must recompute when it is next due */
+
+   xAlertWake();
+}
+
+void lgGpioGetAlertStats(lgChipObj_p chip, int gpio, lgEdgeStats_p stats)
+{
+   lgAlertRec_p p;
+   uint32_t seq;
+
+   pthread_mutex_lock(&lgAlertMutex);
+
+   for (p=alertRec; p!=NULL; p=p->next)
+   {
+      if (p->active && (p->chip == chip) && (p->gpio == gpio)) break;
+   }
+
+   if (p)
+   {
+      /* the lock only keeps p alive, the alert thread doesn't wait */
+
+      do
+      {
+         seq = __atomic_load_n(&p->stats_seq, __ATOMIC_ACQUIRE);
+         *stats = p->stats;
+         __atomic_thread_fence(__ATOMIC_ACQUIRE);
+      }
+      while ((seq & 1) ||
+             (seq != __atomic_load_n(&p->stats_seq, __ATOMIC_RELAXED)));
+   }
+   else memset(stats, 0, sizeof(lgEdgeStats_t));
+
+   pthread_mutex_unlock(&lgAlertMutex);
 }
 
 lgAlertRec_p lgGpioGetAlertRec(lgChipObj_p chip, int gpio)
@@ -667,6 +1098,7 @@ lgAlertRec_p lgGpioCreateAlertRec(
    lgChipObj_p chip, int gpio, lgLineInf_p state, int nfyHandle)
 {
    lgAlertRec_p p;
+   struct epoll_event ev;
 
    p = malloc(sizeof(lgAlertRec_t));
 
@@ -680,19 +1112,39 @@ lgAlertRec_p lgGpioCreateAlertRec(
       p->debounced = 1;
       p->watchdogd = 1;
       p->last_rpt_lv = -1; /* impossible level */
-      p->debounce_nanos = state->debounce_us * 1e3;
+      if (state->debounce_kernel) p->debounce_nanos = 0;
+      else p->debounce_nanos = state->debounce_us * 1e3;
       p->watchdog_nanos = state->watchdog_us * 1e3;
       p->eFlags = state->eFlags;
+      p->fd = state->fd;
+      memset(&p->stats, 0, sizeof(p->stats));
+      p->stats_seq = 0;
+      p->last_rise_ts = 0;
+      p->last_seqno = 0;
+
+      ev.events = EPOLLIN|EPOLLPRI;
+      ev.data.ptr = p;
+
       pthread_mutex_lock(&lgAlertMutex);
 
+      if (epoll_ctl(alertEpollFd, EPOLL_CTL_ADD, p->fd, &ev) < 0)
+      {
+         pthread_mutex_unlock(&lgAlertMutex);
+
+         LG_DBG(LG_DEBUG_ALWAYS, "can't watch fd %d (%s)",
+            p->fd, strerror(errno));
+
+         free(p);
+
+         return NULL;
+      }
+
       p->prev = NULL;
       p->next = alertRec;
       if (alertRec) alertRec->prev = p;
       alertRec = p;
 
       pthread_mutex_unlock(&lgAlertMutex);
-
-      xSendUnwaitSignal(&lgAlertCond, &lgAlertCondMutex);
    }
    return p;
 }
@@ -46,6 +46,11 @@ typedef struct lgAlertRec_s
    int eFlags;
    int gpio;
    int nfyHandle;
+   int fd; /* line fd in the alert thread epoll set */
+   lgEdgeStats_t stats; /* written by the alert thread only */
+   uint32_t stats_seq;  /* odd while stats is being written */
+   uint64_t last_rise_ts;
+   uint32_t last_seqno;
    lgLineInf_p state;
    int active;
    lgChipObj_p chip;
@@ -58,6 +63,13 @@ lgAlertRec_p lgGpioGetAlertRec(lgChipObj_p chip, int gpio);
 lgAlertRec_p lgGpioCreateAlertRec(
    lgChipObj_p chip, int gpio, lgLineInf_p state, int nfyHandle);
 
+void lgGpioStopAlertRec(lgAlertRec_p p);
+
+void lgGpioSetAlertTiming(
+   lgAlertRec_p p, int64_t debounce_nanos, int64_t watchdog_nanos);
+
+void lgGpioGetAlertStats(lgChipObj_p chip, int gpio, lgEdgeStats_p stats);
+
 void *lgPthAlert(void);
 void lgPthAlertStart(void);
 void lgPthAlertStop(lgChipObj_p chip);
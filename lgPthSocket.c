@@ -99,8 +99,22 @@ static void *xSocketThreadHandler(void *fdC)
 
       if (cmdP->cmd == LG_CMD_NOIB)
       {
-        /* Enable the Nagle algorithm. */
-         opt = 0;
+         /*
+         A client may pass the notification latency in microseconds.
+         0 sends each report at once, more than 0 coalesces reports
+         for at most that long.  In both cases the daemon decides
+         when to write so the Nagle algorithm is disabled.  Without
+         a latency the Nagle algorithm is enabled.
+         */
+
+         if (cmdP->size >= 4)
+         {
+            arg[1] = arg[0];
+            cmdP->size = 8;
+            opt = 1;
+         }
+         else opt = 0;
+
          setsockopt(
             sock, IPPROTO_TCP, TCP_NODELAY, (char*)&opt, sizeof(int));
 
@@ -140,6 +154,8 @@ static int xAddrAllowed(struct sockaddr *saddr)
    int i;
    uint32_t addr;
 
+   if (saddr->sa_family == AF_UNIX) return 1;
+
    if (!gNumSockNetAddr) return 1;
 
    // FIXME: add IPv6 whitelisting support
@@ -158,6 +174,7 @@ static int xAddrAllowed(struct sockaddr *saddr)
 
 void *pthSocketThread(void *x)
 {
+   int fdL = *(int*)x;
    int fdC=0, c, *sock;
    struct sockaddr_storage client;
    pthread_attr_t attr;
@@ -174,18 +191,18 @@ void *pthSocketThread(void *x)
       PARAM_ERROR((void*)LG_INIT_FAILED,
          "pthread_attr_setdetachstate failed (%m)");
 
-   /* gFdSock opened in initialisation so that we can treat
-      failure to bind as fatal. */
+   /* The listening socket (gFdSock or gFdUnixSock) is opened in
+      initialisation so that we can treat failure to bind as fatal. */
 
-   listen(gFdSock, 100);
-
-   c = sizeof(client);
+   listen(fdL, 100);
 
    while (fdC >= 0)
    {
       pthread_t thr;
 
-      fdC = accept(gFdSock, (struct sockaddr *)&client, (socklen_t*)&c);
+      c = sizeof(client);
+
+      fdC = accept(fdL, (struct sockaddr *)&client, (socklen_t*)&c);
 
       lgNotifyCloseOrphans(-1, fdC);
 
@@ -199,20 +216,24 @@ void *pthSocketThread(void *x)
          {
             *sock = fdC;
 
-            /* Enable tcp_keepalive */
-            int optval = 1;
-            socklen_t optlen = sizeof(optval);
-
-            if (setsockopt(fdC, SOL_SOCKET, SO_KEEPALIVE, &optval, optlen) < 0)
+            if (client.ss_family != AF_UNIX)
             {
-              LG_DBG(LG_DEBUG_ALWAYS,
-                 "setsockopt() fail, closing socket %d", fdC);
-              close(fdC);
+               /* Enable tcp_keepalive */
+               int optval = 1;
+               socklen_t optlen = sizeof(optval);
+
+               if (setsockopt(
+                  fdC, SOL_SOCKET, SO_KEEPALIVE, &optval, optlen) < 0)
+               {
+                 LG_DBG(LG_DEBUG_ALWAYS,
+                    "setsockopt() fail, closing socket %d", fdC);
+                 close(fdC);
+               }
+
+               LG_DBG(LG_DEBUG_INTERNAL,
+                  "SO_KEEPALIVE enabled on socket %d\n", fdC);
             }
 
-            LG_DBG(LG_DEBUG_INTERNAL,
-               "SO_KEEPALIVE enabled on socket %d\n", fdC);
-
             if (pthread_create
                (&thr, &attr, xSocketThreadHandler, (void*) sock) < 0)
                PARAM_ERROR((void*)LG_INIT_FAILED,
@@ -26,161 +26,290 @@ For more information, please refer to <http://unlicense.org/>
 */
 
 #include <stdlib.h>
+#include <string.h>
 
 #include "lgDbg.h"
 #include "lgHdl.h"
 #include "lgPthTx.h"
 
+/*
+Each active tx record is held in a min-heap keyed on the absolute
+time of its next edge.  The tx thread only visits the records which
+are due so the cost of an edge does not depend on the number of
+GPIO being transmitted.  Each edge's next time is derived from its
+scheduled time, not the time it was output, so lateness does not
+accumulate.
+
+The queued PWM settings and waves of a record are held in rings
+of LG_TX_BUF entries, see LG_TX_SLOT.
+*/
+
+#define TX_MAX_SLEEP 20000000 // run at least fifty times a second
+
 int lgMinTxDelay = 10;
 
 static pthread_t pthTx;
 static pthread_mutex_t lgTxMutex = PTHREAD_MUTEX_INITIALIZER;
 static volatile lgTxRec_p txRec = NULL;
 static int pthTxRunning = LG_THREAD_NONE;
-static struct timespec pthTxReq;
-static int pthTxDelayMicros = 0;
+static uint64_t pthTxWake = 0; /* when the tx thread next runs */
 
-void *lgPthTx(void)
+static lgTxRec_p *txHeap = NULL;
+static int txHeapSize = 0;
+static int txHeapAlloc = 0;
+
+static uint64_t xNow(void)
+{
+   struct timespec ts;
+
+   clock_gettime(CLOCK_MONOTONIC, &ts);
+
+   return (ts.tv_sec * 1000000000ULL) + ts.tv_nsec;
+}
+
+static void xHeapSet(int pos, lgTxRec_p p)
+{
+   txHeap[pos] = p;
+   p->heap_pos = pos;
+}
+
+static void xHeapUp(int pos)
+{
+   lgTxRec_p p = txHeap[pos];
+   int parent;
+
+   while (pos)
+   {
+      parent = (pos - 1) / 2;
+
+      if (txHeap[parent]->deadline <= p->deadline) break;
+
+      xHeapSet(pos, txHeap[parent]);
+      pos = parent;
+   }
+
+   xHeapSet(pos, p);
+}
+
+static void xHeapDown(int pos)
+{
+   lgTxRec_p p = txHeap[pos];
+   int child;
+
+   while ((child = (2 * pos) + 1) < txHeapSize)
+   {
+      if (((child + 1) < txHeapSize) &&
+          (txHeap[child+1]->deadline < txHeap[child]->deadline)) child++;
+
+      if (p->deadline <= txHeap[child]->deadline) break;
+
+      xHeapSet(pos, txHeap[child]);
+      pos = child;
+   }
+
+   xHeapSet(pos, p);
+}
+
+static int xHeapAdd(lgTxRec_p p)
+{
+   lgTxRec_p *heap;
+   int alloc;
+
+   if (txHeapSize == txHeapAlloc)
+   {
+      alloc = txHeapAlloc ? (2 * txHeapAlloc) : 32;
+
+      heap = realloc(txHeap, alloc * sizeof(lgTxRec_p));
+
+      if (heap == NULL) return LG_NO_MEMORY;
+
+      txHeap = heap;
+      txHeapAlloc = alloc;
+   }
+
+   xHeapSet(txHeapSize++, p);
+   xHeapUp(txHeapSize - 1);
+
+   return LG_OKAY;
+}
+
+static void xHeapRemoveTop(void)
 {
-   lgTxRec_p p, t;
+   if (--txHeapSize)
+   {
+      xHeapSet(0, txHeap[txHeapSize]);
+      xHeapDown(0);
+   }
+}
+
+static int xTxAdd(lgTxRec_p p)
+{
+   /* called with the tx lock held */
+
+   memset(&p->stats, 0, sizeof(p->stats));
+
+   if (xHeapAdd(p) != LG_OKAY) return LG_NO_MEMORY;
+
+   p->prev = NULL;
+   p->next = txRec;
+   if (txRec) txRec->prev = p;
+   txRec = p;
+
+   return LG_OKAY;
+}
+
+static void xTxDelete(lgTxRec_p p)
+{
+   /* p has already been removed from the heap */
+
    int i;
 
-   clock_gettime(CLOCK_MONOTONIC, &pthTxReq); // get current time
+   if (p->prev) p->prev->next = p->next;
+   else txRec = p->next;
 
-   while (1)
+   if (p->next) p->next->prev = p->prev;
+
+   if (p->type == LG_TX_WAVE)
    {
-      lgPthTxLock();
+      /* free the malloc'd pulses */
+      for (i=0; i<p->entries; i++)
+      {
+         free(p->pulses[LG_TX_SLOT(p, i)]);
+         p->pulses[LG_TX_SLOT(p, i)] = NULL;
+      }
+   }
 
-      // update times
+   free(p);
+}
+
+static void xTxPwmEdge(lgTxRec_p p)
+{
+   if (p->next_level || (p->micros_on[p->head] == 0))
+   {
+       /* start of cycle */
 
-      for (p=txRec; p!=NULL; p=p->next)
-         p->next_micros -= pthTxDelayMicros;
+      if ((p->cycles[p->head] <= 0) && (p->entries > 1))
+      {
+         p->head = LG_TX_SLOT(p, 1);
+         --p->entries;
+      }
 
-      // output changed edges and calculate next delay
+      if (p->cycles[p->head] == 0) /* 0 is a result of countdown */
+      {
+         xWrite(p->chip, p->gpio, 0);
+         p->active = 0;
+      }
+      else if (p->micros_on[p->head])
+      {
+         xWrite(p->chip, p->gpio, 1);
+         p->deadline += p->micros_on[p->head] * 1000ULL;
+         if (p->micros_off[p->head]) p->next_level = 0;
+      }
+      else
+      {
+         xWrite(p->chip, p->gpio, 0);
+         p->deadline += p->micros_off[p->head] * 1000ULL;
+         p->next_level = 1;
+      }
 
-      pthTxDelayMicros = 20000; // run at least fifty times a second
+      if (--p->cycles[p->head] < 0) p->cycles[p->head] = -1;
+   }
+   else /* middle of cycle */
+   {
+      xWrite(p->chip, p->gpio, 0);
+      p->deadline += p->micros_off[p->head] * 1000ULL;
+      p->next_level = 1;
+   }
+}
 
-      p = txRec;
-      
-      while (p != NULL)
+static void xTxWaveEdge(lgTxRec_p p)
+{
+   lgPulse_p pulse;
+
+   if (p->pulse_pos >= p->num_pulses[p->head])
+   {
+      if (p->entries > 1)
       {
+         /* the finished wave is no longer needed */
+         free(p->pulses[p->head]);
+         p->pulses[p->head] = NULL;
+
+         p->head = LG_TX_SLOT(p, 1);
+         --p->entries;
+         p->pulse_pos = 0;
+      }
+   }
+
+   if (p->pulse_pos < p->num_pulses[p->head])
+   {
+      pulse = &p->pulses[p->head][p->pulse_pos];
+      xGroupWrite(p->chip, p->gpio, pulse->bits, pulse->mask);
+      p->deadline += pulse->delay * 1000ULL;
+      (p->pulse_pos)++;
+   }
+   else p->active = 0;
+}
+
+void *lgPthTx(void)
+{
+   lgTxRec_p p;
+   uint64_t now, late;
+   struct timespec req;
+
+   lgPthTxLock();
+
+   pthTxWake = xNow();
+
+   lgPthTxUnlock();
+
+   while (1)
+   {
+      lgPthTxLock();
+
+      now = xNow();
+
+      // output the due edges, earliest first
+
+      while (txHeapSize && (txHeap[0]->deadline <= now))
+      {
+         p = txHeap[0];
+
          if (p->active)
          {
-            if (p->next_micros <= 0)
-            {
-               if (p->type == LG_TX_PWM)
-               {
-                  if (p->next_level || (p->micros_on[0] == 0))
-                  {
-                      /* start of cycle */
-
-                     if ((p->cycles[0] <= 0) && (p->entries > 1))
-                     {
-                        for (i=0; i<p->entries; i++)
-                        {
-                           p->micros_on[i] = p->micros_on[i+1];
-                           p->micros_off[i] = p->micros_off[i+1];
-                           p->cycles[i] = p->cycles[i+1];
-                        }
-                        --p->entries;
-                     }
-                  
-                     if (p->cycles[0] == 0) /* 0 is a result of countdown */
-                     {
-                        xWrite(p->chip, p->gpio, 0);
-                        p->active = 0;
-                     }
-                     else if (p->micros_on[0])
-                     {
-                        xWrite(p->chip, p->gpio, 1);
-                        p->next_micros += p->micros_on[0];
-                        if (p->micros_off[0]) p->next_level = 0;
-                     }
-                     else
-                     {
-                        xWrite(p->chip, p->gpio, 0);
-                        p->next_micros += p->micros_off[0];
-                        p->next_level = 1;
-                     }
-
-                     if (--p->cycles[0] < 0) p->cycles[0] = -1;
-                  }
-                  else /* middle of cycle */
-                  {
-                     xWrite(p->chip, p->gpio, 0);
-                     p->next_micros += p->micros_off[0];
-                     p->next_level = 1;
-                  }
-               }
-               else if (p->type == LG_TX_WAVE)
-               {
-                  if (p->pulse_pos >= p->num_pulses[0])
-                  {
-                     if (p->entries > 1)
-                     {
-                        for (i=0; i<p->entries; i++)
-                        {
-                           p->pulses[i] = p->pulses[i+1];
-                           p->num_pulses[i] = p->num_pulses[i+1];
-                        }
-                        --p->entries;
-                        p->pulse_pos = 0;
-                     }
-                  }
-
-                  if (p->pulse_pos < p->num_pulses[0])
-                  {
-                     xGroupWrite(p->chip, p->gpio,
-                        p->pulses[0][p->pulse_pos].bits,
-                        p->pulses[0][p->pulse_pos].mask);
-                     p->next_micros += p->pulses[0][p->pulse_pos].delay;
-                     (p->pulse_pos)++;
-                  }
-                  else p->active = 0;
-               }
-            }
-
-            if (p->next_micros < pthTxDelayMicros)
-               pthTxDelayMicros = p->next_micros;
+            late = now - p->deadline;
+
+            p->stats.edges++;
+            p->stats.lateSum += late;
+            p->stats.lateLast = late;
+            if (late > p->stats.lateMax) p->stats.lateMax = late;
+
+            if (p->type == LG_TX_PWM) xTxPwmEdge(p);
+            else xTxWaveEdge(p);
          }
+
+         if (p->active) xHeapDown(0);
          else
          {
             /* delete inactive record */
-            
-            if (p->prev) p->prev->next = p->next;
-            else txRec = p->next;
-
-            if (p->next) p->next->prev = p->prev;
-
-            if (p->type == LG_TX_WAVE)
-            {
-               /* free the malloc'd pulses */
-               for (i=0; i<p->entries; i++)
-               {
-                  free(p->pulses[i]);
-                  p->pulses[i] = NULL;
-               }
-            }
-
-            t = p; p = p->prev; free(t);
-         }
 
-         if (p) p = p->next;
+            xHeapRemoveTop();
+            xTxDelete(p);
+         }
       }
 
-      pthTxReq.tv_nsec += (pthTxDelayMicros * 1000);
-      if (pthTxReq.tv_nsec >= 1000000000)
-      {
-         pthTxReq.tv_sec += 1;
-         pthTxReq.tv_nsec -= 1000000000;
-      }
+      // sleep until the next edge
 
-      lgPthTxUnlock();
+      pthTxWake = now + TX_MAX_SLEEP;
 
-      // sleep until next edge
+      if (txHeapSize && (txHeap[0]->deadline < pthTxWake))
+         pthTxWake = txHeap[0]->deadline;
 
-      while (clock_nanosleep(
-         CLOCK_MONOTONIC, TIMER_ABSTIME, &pthTxReq, NULL));
+      req.tv_sec = pthTxWake / 1000000000;
+      req.tv_nsec = pthTxWake % 1000000000;
+
+      lgPthTxUnlock();
+
+      while (clock_nanosleep(CLOCK_MONOTONIC, TIMER_ABSTIME, &req, NULL));
    }
 
    pthTxRunning = LG_THREAD_NONE;
@@ -243,7 +372,7 @@ lgTxRec_p lgGpioCreateTxRec(
    int cycles)
 {
    lgTxRec_p p;
-   int usec, ct, cyc, frac, left;
+   int usec, ct, frac;
 
    p = malloc(sizeof(lgTxRec_t));
 
@@ -252,6 +381,7 @@ lgTxRec_p lgGpioCreateTxRec(
       p->type = LG_TX_PWM;
       p->chip = chip;
       p->gpio = gpio;
+      p->head = 0;
       p->entries = 1;
       p->micros_on[0] = micros_on;
       p->micros_off[0] = micros_off;
@@ -262,17 +392,18 @@ lgTxRec_p lgGpioCreateTxRec(
 
       lgPthTxLock();
 
-      usec = pthTxReq.tv_nsec / 1000;
+      /* start on a cycle boundary after the next tx thread run */
+
+      usec = (pthTxWake % 1000000000) / 1000;
       ct = micros_on + micros_off;
-      cyc = usec / ct;
-      frac = usec - (ct *cyc);
-      left = ct - frac + pthTxDelayMicros + micros_offset;
-      p->next_micros = left;
-      
-      p->prev = NULL;
-      p->next = txRec;
-      if (txRec) txRec->prev = p;
-      txRec = p;
+      frac = usec % ct;
+      p->deadline = pthTxWake + ((ct - frac + micros_offset) * 1000ULL);
+
+      if (xTxAdd(p) != LG_OKAY)
+      {
+         free(p);
+         p = NULL;
+      }
 
       lgPthTxUnlock();
    }
@@ -295,6 +426,7 @@ lgTxRec_p lgGroupCreateWaveRec(
       p->type = LG_TX_WAVE;
       p->chip = chip;
       p->gpio = gpio;
+      p->head = 0;
       p->entries = 1;
       p->active = 1;
 
@@ -304,16 +436,16 @@ lgTxRec_p lgGroupCreateWaveRec(
 
       lgPthTxLock();
 
-      p->next_micros = pthTxDelayMicros;
-      
-      p->prev = NULL;
-      p->next = txRec;
-      if (txRec) txRec->prev = p;
-      txRec = p;
+      p->deadline = pthTxWake;
+
+      if (xTxAdd(p) != LG_OKAY)
+      {
+         free(p);
+         p = NULL;
+      }
 
       lgPthTxUnlock();
    }
 
    return p;
 }
-
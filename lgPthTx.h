@@ -35,16 +35,22 @@ For more information, please refer to <http://unlicense.org/>
 
 #define LG_TX_BUF 10
 
+/* the slot of the i'th queued entry in the LG_TX_BUF rings */
+#define LG_TX_SLOT(p, i) (((p)->head + (i)) % LG_TX_BUF)
+
 typedef struct lgTxRec_s
 {
    int active;
    struct lgTxRec_s *prev;
    struct lgTxRec_s *next;
-   int next_micros;
+   uint64_t deadline; /* CLOCK_MONOTONIC nanoseconds of next edge */
+   int heap_pos;      /* index in the tx thread deadline heap */
    lgChipObj_p chip;
    int gpio;
-   int entries; /* number of entries in LG_TX_BUF arrays */
+   int head;    /* slot of the current entry in LG_TX_BUF rings */
+   int entries; /* number of entries in LG_TX_BUF rings */
    int type;    /* PWM or WAVE */
+   lgTxStats_t stats;
    union
    {
       struct
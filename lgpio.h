@@ -108,9 +108,12 @@ lgTxServo                    Starts Servo pulses on a GPIO
 lgTxWave                     Starts a wave on a group of GPIO
 lgTxBusy                     See if tx is active on a GPIO or group
 lgTxRoom                     See if more room for tx on a GPIO or group
+lgTxJitter                   Get the tx timing statistics of a GPIO or group
 
 lgGpioSetDebounce            Sets the debounce time for a GPIO
 lgGpioSetWatchdog            Sets the watchdog time for a GPIO
+lgGpioSetEventBuffer         Sets the kernel event buffer size for a GPIO
+lgGpioGetEdgeStats           Gets the edge counts and timings of a GPIO
 
 lgGpioSetAlertsFunc          Starts a GPIO callback
 lgGpioSetSamplesFunc         Starts a GPIO callback for all GPIO
@@ -149,9 +152,11 @@ lgI2cZip                     Performs multiple I2C transactions
 NOTIFICATIONS
 
 lgNotifyOpen                 Request a notification
+lgNotifyOpenRing             Request a shared memory notification
 lgNotifyClose                Close a notification
 lgNotifyPause                Pause notifications
 lgNotifyResume               Start notifications
+lgNotifyStats                Get the delivery statistics of a notification
 
 SERIAL
 
@@ -236,6 +241,12 @@ extern "C" {
 
 #define MAX_EMITS (PIPE_BUF / sizeof(lgGpioReport_t))
 
+/* lgNotifyOpenRing */
+
+#define LG_NOTIFY_RING_MAGIC 0x474e5252 /* "RRNG" */
+#define LG_MIN_NOTIFY_RING   64
+#define LG_MAX_NOTIFY_RING   1048576
+
 #define STACK_SIZE (256*1024)
 
 #define LG_USER_LEN 16
@@ -314,6 +325,8 @@ extern "C" {
 #define LG_MAX_MICS_DEBOUNCE   5000000 /* 5 seconds */
 #define LG_MAX_MICS_WATCHDOG 300000000 /* 5 minutes */
 
+#define LG_MAX_EVENT_BUFFER 1024 /* kernel limit */
+
 /* Script constants
 */
 
@@ -366,14 +379,6 @@ typedef struct lgChipInfo_s
    char label[LG_GPIO_LABEL_LEN]; /* functional name */
 } lgChipInfo_t, *lgChipInfo_p;
 
-typedef struct
-{
-   uint16_t state;
-   int      fd;
-   int      pipe_number;
-   int      max_emits;
-} lgNotify_t;
-
 typedef void (*callbk_t) ();
 typedef void (*destructor_t) (void*);
 
@@ -386,6 +391,40 @@ typedef struct
    uint8_t flags; /* none defined, ignore report if non-zero */
 } lgGpioReport_t;
 
+typedef struct
+{
+   uint32_t magic;   /* LG_NOTIFY_RING_MAGIC */
+   uint32_t records; /* number of reports, a power of 2 */
+   uint64_t head;    /* number of reports ever written */
+   uint64_t reserve; /* head plus the reports being written */
+   uint8_t  pad[40];
+   lgGpioReport_t report[];
+} lgNotifyRing_t;
+
+typedef struct lgNotifyStats_s
+{
+   uint64_t reports;     /* reports delivered */
+   uint64_t dropped;     /* reports lost as the reader was too slow */
+   uint64_t writes;      /* complete writes */
+   uint64_t shortWrites; /* writes which were cut short */
+   uint64_t fullWrites;  /* writes refused as the pipe or socket was full */
+} lgNotifyStats_t, *lgNotifyStats_p;
+
+typedef struct
+{
+   uint16_t state;
+   int      fd;
+   int      pipe_number;
+   int      max_emits;
+   int      latency_micros; /* coalesce reports for at most this long */
+   int      pending;
+   uint64_t pending_ts;
+   lgGpioReport_t *pend;    /* reports held while coalescing */
+   lgNotifyRing_t *ring;    /* shared memory reports */
+   int      ring_bytes;
+   lgNotifyStats_t stats;
+} lgNotify_t;
+
 typedef struct lgGpioAlert_s
 {
    lgGpioReport_t report;
@@ -407,6 +446,26 @@ typedef struct lgPulse_s
    int64_t delay;
 } lgPulse_t, *lgPulse_p;
 
+typedef struct lgTxStats_s
+{
+   uint64_t edges;    /* edges output */
+   uint64_t lateSum;  /* total lateness of the edges, nanoseconds */
+   uint64_t lateMax;  /* greatest lateness of an edge, nanoseconds */
+   uint64_t lateLast; /* lateness of the last edge, nanoseconds */
+} lgTxStats_t, *lgTxStats_p;
+
+typedef struct lgEdgeStats_s
+{
+   uint64_t rising;    /* rising edges seen */
+   uint64_t falling;   /* falling edges seen */
+   uint64_t lost;      /* edges discarded by the kernel */
+   uint64_t period;    /* last rising edge to rising edge, nanoseconds */
+   uint64_t high;      /* last rising edge to falling edge, nanoseconds */
+   uint64_t periodAvg; /* rolling average of period, nanoseconds */
+   uint64_t highAvg;   /* rolling average of high, nanoseconds */
+   uint64_t timestamp; /* of the last edge, nanoseconds */
+} lgEdgeStats_t, *lgEdgeStats_p;
+
 typedef struct
 {
    uint16_t addr;  /* slave address       */
@@ -693,6 +752,10 @@ falling edge, or both edges.
 The alerts will be sent to a previously opened notification. If
 you don't want them sent to a notification set nfyHandle to -1.
 
+The kernel queues the edges of the GPIO until they are read.  The
+size of the queue may be set by [*lgGpioSetEventBuffer*] before
+the GPIO is claimed.
+
 The alerts will also be sent to any callback registered for the
 GPIO by [*lgGpioSetAlertsFunc*].
 
@@ -1253,6 +1316,37 @@ while (lgTxRoom(h, 17, LG_TX_WAVE) > 0))
 ...
 D*/
 
+/*F*/
+int lgTxJitter(int handle, int gpio, int kind, lgTxStats_p txStats);
+/*D
+This returns the timing statistics of the transmission of the
+specified kind on the GPIO or group.
+
+. .
+ handle: >= 0 (as returned by [*lgGpiochipOpen*])
+   gpio: the gpio or group to be checked
+   kind: LG_TX_PWM or LG_TX_WAVE
+txStats: a pointer to a lgTxStats_t object to receive the statistics
+. .
+
+If OK returns 0.
+
+On failure returns a negative error code.
+
+Each edge is scheduled for an absolute time.  The lateness of an
+edge is the time between when it was due and when it was output.
+The statistics cover the current transmission and are zero if
+nothing is being transmitted.
+
+...
+lgTxStats_t st;
+
+if (lgTxJitter(h, 15, LG_TX_PWM, &st) == 0 && st.edges)
+   printf("mean %"PRIu64" max %"PRIu64" ns\n",
+      st.lateSum / st.edges, st.lateMax);
+...
+D*/
+
 /*F*/
 int lgGpioSetDebounce(int handle, int gpio, int debounce_us);
 /*D
@@ -1284,6 +1378,10 @@ is set 10 alerts will be generated per second.
 Note that level changes will be timestamped debounce microseconds
 after the actual level change.
 
+The debounce is done by the kernel if it is able so that bounces
+are not passed to the library.  Otherwise the library debounces
+the alerts.
+
 ...
 lgGpioSetDebounce(h, 16, 1000); // set a millisecond of debounce
 ...
@@ -1320,6 +1418,78 @@ lgSetWatchdogTime(h, 17, 200000); // alert if nothing for 0.2 seconds
 ...
 D*/
 
+/*F*/
+int lgGpioSetEventBuffer(int handle, int gpio, int eventBuffer);
+/*D
+This sets the number of edges the kernel queues for a GPIO.
+
+. .
+     handle: >= 0 (as returned by [*lgGpiochipOpen*])
+       gpio: the GPIO to be configured
+eventBuffer: 0-1024, the number of edges, 0 for the kernel default
+. .
+
+If OK returns 0.
+
+On failure returns a negative error code.
+
+This only affects alerts and takes effect when the GPIO is next
+claimed by [*lgGpioClaimAlert*].
+
+The kernel queues the edges of a GPIO until they are read and
+discards new edges once its queue is full.  The default queue of
+16 edges may overflow if bursts of edges arrive while the library
+is delayed.  The kernel rounds the size up to a power of 2.
+
+...
+lgGpioSetEventBuffer(h, 17, 1024);
+lgGpioClaimAlert(h, 0, LG_BOTH_EDGES, 17, -1);
+...
+D*/
+
+/*F*/
+int lgGpioGetEdgeStats(int handle, int gpio, lgEdgeStats_p edgeStats);
+/*D
+This returns the edge counts and timings of a GPIO claimed for
+alerts.
+
+. .
+   handle: >= 0 (as returned by [*lgGpiochipOpen*])
+     gpio: the GPIO to be checked
+edgeStats: a pointer to a lgEdgeStats_t object to receive the statistics
+. .
+
+If OK returns 0.
+
+On failure returns a negative error code.
+
+The statistics are kept by the alert thread for every edge read
+from the kernel, so a frequency or duty cycle may be measured
+without passing each edge to a callback or notification.  They
+are reset when the GPIO is claimed and are zero if the GPIO is
+not claimed for alerts.
+
+The period is measured between rising edges and the high time
+from a rising edge to the following falling edge, so both edges
+should be monitored.  The averages weight each new measurement
+by 1/16.
+
+Debounce is normally done by the kernel (see [*lgGpioSetDebounce*])
+and the edges it filters never reach the statistics, so a debounced
+GPIO reports fewer edges.  Set a debounce of 0 to count every edge.
+Debounce done by the library, where the kernel does not support it,
+does not affect the statistics.  Edges discarded by the kernel,
+because its event buffer was full, are counted as lost.
+
+...
+lgEdgeStats_t st;
+
+if (lgGpioGetEdgeStats(h, 17, &st) == 0 && st.periodAvg)
+   printf("%.1f Hz, %.1f%% duty\n",
+      1e9 / st.periodAvg, 100.0 * st.highAvg / st.periodAvg);
+...
+D*/
+
 /*F*/
 int lgGpioSetAlertsFunc(
    int handle, int gpio, lgGpioAlertsFunc_t cbf, void *userdata);
@@ -1478,6 +1648,7 @@ void lgNotifyCloseOrphans(int slot, int fd);
 int lgNotifyOpenWithSize(int pipeSize);
 
 int  lgNotifyOpenInBand(int fd);
+int  lgNotifyOpenInBandWithLatency(int fd, int latencyMicros);
 
 /*F*/
 int lgNotifyOpen(void);
@@ -1528,6 +1699,61 @@ else
 D*/
 
 
+/*F*/
+int lgNotifyOpenRing(int records);
+/*D
+This function requests a free notification whose alerts are
+written to a shared memory ring.
+
+. .
+records: the number of alerts held by the ring, a power of 2
+         from 64 to 1048576.
+. .
+
+If OK returns a handle (>= 0).
+
+On failure returns a negative error code.
+
+A ring suits high alert rates on the local machine.  The alerts are
+stored in memory shared with the readers rather than being copied
+through a pipe so any number of alerts may be read without a system
+call.
+
+The ring for handle x is the file .lgd-nfyx.ring in the library
+working directory (see [*lguGetWorkDir*]).  It should be mapped
+read only.  It starts with the following header and is followed
+by records entries of the same structure as pipe notifications.
+
+. .
+typedef struct
+{
+   uint32_t magic;   // LG_NOTIFY_RING_MAGIC
+   uint32_t records; // number of reports, a power of 2
+   uint64_t head;    // number of reports ever written
+   uint64_t reserve; // head plus the reports being written
+   uint8_t  pad[40];
+   lgGpioReport_t report[];
+} lgNotifyRing_t;
+. .
+
+Report n is stored at report[n % records].  reserve is updated
+before and head after the reports they cover are written.  A reader
+keeps its own count of the reports it has read.  If head moves more
+than records ahead of that count the older reports have been
+overwritten.  As a report may be overwritten while it is being read
+the reader should check reserve after copying reports.  Those
+numbered below reserve - records may have been overwritten and
+should be discarded.
+
+After each block of alerts a byte is written to the pipe
+.lgd-nfyx so a reader may wait for alerts by reading the pipe.
+
+...
+h = lgNotifyOpenRing(4096);
+...
+D*/
+
+
 /*F*/
 int lgNotifyResume(int handle);
 /*D
@@ -1618,6 +1844,36 @@ lgNotifyClose(h);
 D*/
 
 
+/*F*/
+int lgNotifyStats(int handle, lgNotifyStats_p nfyStats);
+/*D
+This function returns the delivery statistics of a notification.
+
+. .
+  handle: >= 0 (as returned by [*lgNotifyOpen*])
+nfyStats: a pointer to a lgNotifyStats_t object to receive the
+          statistics
+. .
+
+If OK returns 0.
+
+On failure returns a negative error code.
+
+Reports are dropped if the reader does not keep up and the pipe or
+socket fills.  A non-zero dropped count means alerts have been lost.
+
+For a shared memory notification only reports is counted.  Its
+reader detects overwritten reports from the ring head.
+
+...
+lgNotifyStats_t st;
+
+if (lgNotifyStats(h, &st) == 0 && st.dropped)
+   printf("%"PRIu64" alerts lost\n", st.dropped);
+...
+D*/
+
+
 /* I2C API
 */
 
@@ -2542,6 +2798,9 @@ A directory path which.
 double::
 A floating point number.
 
+edgeStats::
+A pointer to a lgEdgeStats_t object.
+
 eFlags::
 
 The type of GPIO edge to generate an alert.  See [*lgGpioClaimAlert*].
@@ -2555,6 +2814,10 @@ LG_BOTH_EDGES
 error::
 An error code.  All error codes are negative.
 
+eventBuffer:: 0-1024
+The number of edges the kernel queues for a GPIO.  See
+[*lgGpioSetEventBuffer*].
+
 f::
 A function.
 
@@ -2658,6 +2921,23 @@ typedef struct lgChipInfo_s
 } lgChipInfo_t, *lgChipInfo_p;
 . .
 
+lgEdgeStats_p::
+A pointer to a lgEdgeStats_t object.
+
+. .
+typedef struct lgEdgeStats_s
+{
+   uint64_t rising;    // rising edges seen
+   uint64_t falling;   // falling edges seen
+   uint64_t lost;      // edges discarded by the kernel
+   uint64_t period;    // last rising edge to rising edge, nanoseconds
+   uint64_t high;      // last rising edge to falling edge, nanoseconds
+   uint64_t periodAvg; // rolling average of period, nanoseconds
+   uint64_t highAvg;   // rolling average of high, nanoseconds
+   uint64_t timestamp; // of the last edge, nanoseconds
+} lgEdgeStats_t, *lgEdgeStats_p;
+. .
+
 lgGpioAlert_t::
 
 . .
@@ -2722,6 +3002,20 @@ typedef struct lgLine_s
 } lgLineInfo_t, *lgLineInfo_p;
 . .
 
+lgNotifyStats_p::
+A pointer to a lgNotifyStats_t object.
+
+. .
+typedef struct lgNotifyStats_s
+{
+   uint64_t reports;     // reports delivered
+   uint64_t dropped;     // reports lost as the reader was too slow
+   uint64_t writes;      // complete writes
+   uint64_t shortWrites; // writes which were cut short
+   uint64_t fullWrites;  // writes refused as the pipe or socket was full
+} lgNotifyStats_t, *lgNotifyStats_p;
+. .
+
 lgPulse_p::
 A pointer to a lgPulse_t object.
 
@@ -2739,12 +3033,28 @@ lgThreadFunc_t::
 typedef void *(lgThreadFunc_t) (void *);
 . .
 
+lgTxStats_p::
+A pointer to a lgTxStats_t object.
+
+. .
+typedef struct lgTxStats_s
+{
+   uint64_t edges;    // edges output
+   uint64_t lateSum;  // total lateness of the edges, nanoseconds
+   uint64_t lateMax;  // greatest lateness of an edge, nanoseconds
+   uint64_t lateLast; // lateness of the last edge, nanoseconds
+} lgTxStats_t, *lgTxStats_p;
+. .
+
 lineInfo::
 A pointer to a lgLineInfo_t object.
 
 nfyHandle:: >= 0
 This associates a notification with a GPIO alert.
 
+nfyStats::
+A pointer to a lgNotifyStats_t object.
+
 *pth::
 A thread identifier, returned by [*lgGpioStartThread*].
 
@@ -2829,6 +3139,9 @@ An pointer to a buffer of data to transmit.
 txCount::
 The size of an output buffer.
 
+txStats::
+A pointer to a lgTxStats_t object.
+
 uint64_t::
 A 64-bit unsigned value.
 
@@ -2977,6 +3290,8 @@ PARAMS*/
 #define LG_BAD_PWM_DUTY        -103 // bad PWM dutycycle
 #define LG_GPIO_NOT_AN_OUTPUT  -104 // GPIO not set as an output
 #define LG_INVALID_GROUP_ALERT -105 // can not set a group to alert
+#define LG_BAD_RING_SIZE       -106 // bad notification ring size
+#define LG_BAD_EVENT_BUFFER    -107 // bad kernel event buffer size
 
 /*DEF_E*/
 
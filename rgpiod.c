@@ -39,6 +39,7 @@ For more information, please refer to <http://unlicense.org/>
 #include <signal.h>
 #include <ctype.h>
 #include <sys/socket.h>
+#include <sys/un.h>
 #include <netdb.h>
 
 #include "lgpio.h"
@@ -52,12 +53,15 @@ int      gPermits = 0;
 int      gNumSockNetAddr = 0;
 uint32_t gSockNetAddr[MAX_CONNECT_ADDRESSES];
 int      gFdSock = -1;
+int      gFdUnixSock = -1;
 
 /* locals */
 
 static int      CfgIfFlags = LG_DEFAULT_IF_FLAGS;
 static int      CfgSocketPort = LG_DEFAULT_SOCKET_PORT;
+static char     *CfgUnixPath = NULL;
 static pthread_t pthSocket;
+static pthread_t pthUnixSocket;
 
 /* prototypes */
 
@@ -67,7 +71,6 @@ void *pthSocketThread(void *x);
 
 static int xOpenSocket(void)
 {
-   int i;
    int opt=1;
    struct sockaddr_in server;
    struct sockaddr_in6 server6;
@@ -138,7 +141,45 @@ static int xOpenSocket(void)
          PARAM_ERROR(LG_INIT_FAILED, "bind to port %d failed (%m)", port);
    }
 
-   if (pthread_create(&pthSocket, &pthAttr, pthSocketThread, &i))
+   if (pthread_create(&pthSocket, &pthAttr, pthSocketThread, &gFdSock))
+      PARAM_ERROR(LG_INIT_FAILED, "pthread_create socket failed (%m)");
+
+   return LG_OKAY;
+}
+
+static int xOpenUnixSocket(void)
+{
+   struct sockaddr_un server;
+   pthread_attr_t pthAttr;
+
+   LG_DBG(LG_DEBUG_STARTUP, "%s", CfgUnixPath);
+
+   if (strlen(CfgUnixPath) >= sizeof(server.sun_path))
+      PARAM_ERROR(LG_INIT_FAILED, "socket path too long (%s)", CfgUnixPath);
+
+   if (pthread_attr_init(&pthAttr))
+      PARAM_ERROR(LG_INIT_FAILED, "pthread_attr_init failed (%m)");
+
+   if (pthread_attr_setstacksize(&pthAttr, STACK_SIZE))
+      PARAM_ERROR(LG_INIT_FAILED, "pthread_attr_setstacksize failed (%m)");
+
+   gFdUnixSock = socket(AF_UNIX, SOCK_STREAM, 0);
+
+   if (gFdUnixSock == -1)
+      PARAM_ERROR(LG_INIT_FAILED, "unix socket failed (%m)");
+
+   bzero((char *)&server, sizeof(server));
+   server.sun_family = AF_UNIX;
+   strcpy(server.sun_path, CfgUnixPath);
+
+   /* remove any socket left by a previous run */
+   unlink(CfgUnixPath);
+
+   if (bind(gFdUnixSock, (struct sockaddr *)&server, sizeof(server)) < 0)
+      PARAM_ERROR(LG_INIT_FAILED, "bind to %s failed (%m)", CfgUnixPath);
+
+   if (pthread_create(
+      &pthUnixSocket, &pthAttr, pthSocketThread, &gFdUnixSock))
       PARAM_ERROR(LG_INIT_FAILED, "pthread_create socket failed (%m)");
 
    return LG_OKAY;
@@ -168,6 +209,7 @@ static void xUsage()
       "   -l,         localhost socket only (default local+remote)\n" \
       "   -n IP addr, allow address, name or dotted (default allow all)\n" \
       "   -p value,   socket port (1024-32000, default 8889)\n" \
+      "   -s path,    also listen on unix socket path (default none)\n" \
       "   -v,         display rgpiod version and exit\n" \
       "   -w dir,     set working directory (default launch directory)\n" \
       "   -x,         enable access control (default off)\n" \
@@ -223,7 +265,7 @@ static void xInitOpts(int argc, char *argv[])
    int opt, err, i;
    uint32_t addr;
 
-   while ((opt = getopt(argc, argv, "c:ln:p:vw:x")) != -1)
+   while ((opt = getopt(argc, argv, "c:ln:p:s:vw:x")) != -1)
    {
       switch (opt)
       {
@@ -249,6 +291,10 @@ static void xInitOpts(int argc, char *argv[])
             else xFatal("invalid -p option (%d)", i);
             break;
 
+         case 's':
+            CfgUnixPath = optarg;
+            break;
+
          case 'v':
             printf("rgpiod_%d.%d.%d.%d\n",
                (RGPIOD_VERSION>>24)&0xff, (RGPIOD_VERSION>>16)&0xff,
@@ -281,7 +327,8 @@ int main(int argc, char **argv)
 
    /* initialise */
 
-   if (xOpenSocket() >= 0)
+   if ((xOpenSocket() >= 0) &&
+       ((CfgUnixPath == NULL) || (xOpenUnixSocket() >= 0)))
    {
       /* set stderr non-blocking */
 
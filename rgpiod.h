@@ -97,6 +97,7 @@ extern int gPermits;
 extern int gNumSockNetAddr;
 extern uint32_t gSockNetAddr[MAX_CONNECT_ADDRESSES];
 extern int gFdSock;
+extern int gFdUnixSock;
 
 #ifdef __cplusplus
 }
@@ -140,6 +141,9 @@ extern int gFdSock;
 #define LG_CMD_GIC   31 // gpiochip get chip info
 #define LG_CMD_GIL   32 // gpiochip get line info
 #define LG_CMD_GMODE 33 // gpio get mode
+#define LG_CMD_GJIT  34 // tx jitter statistics
+#define LG_CMD_GEVB  35 // gpio set kernel event buffer size
+#define LG_CMD_GES   36 // gpio edge statistics
 
 #define LG_CMD_I2CO  40 // I2C open
 #define LG_CMD_I2CC  41 // I2C close
@@ -164,6 +168,8 @@ extern int gFdSock;
 #define LG_CMD_NC    71 // notification close
 #define LG_CMD_NR    72 // notification resume
 #define LG_CMD_NP    73 // notification pause
+#define LG_CMD_NOR   74 // notification open ring
+#define LG_CMD_NS    75 // notification statistics
 
 #define LG_CMD_PARSE 80 // script parse
 #define LG_CMD_PROC  81 // script store
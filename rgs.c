@@ -82,11 +82,14 @@ FW h bvs          File write\n\
 GBUSY h g k       GPIO or group tx busy\n\
 GC h              gpiochip close device\n\
 GDEB h g us       GPIO debounce time\n\
+GES h g           GPIO edge statistics\n\
+GEVB h g n        GPIO kernel event buffer size\n\
 GGR h g           GPIO group read\n\
 GGW h g gbits     GPIO group write (simple)\n\
 GGWX h g gbits gmask  | GPIO group write\n\
 GIC h             gpiochip information\n\
 GIL h g           gpiochip line information\n\
+GJIT h g k        GPIO or group tx jitter\n\
 GO gc             gpiochip open device\n\
 GP h g mon moff   GPIO tx pulses (simple)\n\
 GPX h g mon moff off cyc  | GPIO tx pulses\n\
@@ -135,8 +138,10 @@ MILS v            Milliseconds delay\n\
 \n\
 NC h              Notification close\n\
 NO                Notification open\n\
+NOR v             Notification open ring\n\
 NP h              Notification pause\n\
 NR h              Notification resume\n\
+NS h              Notification statistics\n\
 \n\
 P h g pf pdc      GPIO tx PWM (simple)\n\
 PARSE t           Script validate\n\
@@ -421,6 +426,47 @@ static void xShowResult(int rv, lgCmd_p cmdP, char *cmdExt)
          }
          break;
 
+      case 12: /* GJIT */
+         if (r < 0)
+         {
+            printf("%d\n", r);
+            xReport(RGS_SCRIPT_ERR, "ERROR: %s", lguErrorText(r));
+         }
+         else
+         {
+            printf("%"PRIu64" %"PRIu64" %"PRIu64" %"PRIu64"\n",
+               argQ[0], argQ[1], argQ[2], argQ[3]);
+         }
+         break;
+
+      case 13: /* NS */
+         if (r < 0)
+         {
+            printf("%d\n", r);
+            xReport(RGS_SCRIPT_ERR, "ERROR: %s", lguErrorText(r));
+         }
+         else
+         {
+            printf("%"PRIu64" %"PRIu64" %"PRIu64" %"PRIu64" %"PRIu64"\n",
+               argQ[0], argQ[1], argQ[2], argQ[3], argQ[4]);
+         }
+         break;
+
+      case 14: /* GES */
+         if (r < 0)
+         {
+            printf("%d\n", r);
+            xReport(RGS_SCRIPT_ERR, "ERROR: %s", lguErrorText(r));
+         }
+         else
+         {
+            printf("%"PRIu64" %"PRIu64" %"PRIu64" %"PRIu64" %"PRIu64
+               " %"PRIu64" %"PRIu64" %"PRIu64"\n",
+               argQ[0], argQ[1], argQ[2], argQ[3],
+               argQ[4], argQ[5], argQ[6], argQ[7]);
+         }
+         break;
+
       default:
          printf("*** command=%d, status=%d\n", cmdP->cmd, r);
          if (r < 0) xReport(RGS_SCRIPT_ERR, "ERROR: %s", lguErrorText(r));